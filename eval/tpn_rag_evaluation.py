@@ -108,11 +108,12 @@ if RAGAS_AVAILABLE:
         
         def embed_documents(self, texts: List[str]) -> List[List[float]]:
             """Embed a list of documents."""
-            return asyncio.run(self.embedding_provider.embed_texts(texts))
+            # Ragas expects plain lists; the provider returns a float32 matrix
+            return asyncio.run(self.embedding_provider.embed_texts(texts)).tolist()
         
         def embed_query(self, text: str) -> List[float]:
             """Embed a single query."""
-            return asyncio.run(self.embedding_provider.embed_query(text))
+            return asyncio.run(self.embedding_provider.embed_query(text)).tolist()
 
 
 class TPNRAGEvaluator:
@@ -14,9 +14,8 @@ from rag.core.services.rag_service import RAGService
 from rag.core.services.hybrid_rag_service import HybridRAGService
 from rag.core.services.dpt2_document_loader import DPT2DocumentLoader
 from rag.core.services.database_manager import DatabaseManager
-from rag.infrastructure.embeddings.ollama_embeddings import OllamaEmbeddingProvider
 from rag.infrastructure.vector_stores.chroma_store import ChromaVectorStore
-from rag.infrastructure.llm_providers.ollama_provider import OllamaLLMProvider
+from rag.api.dependencies import create_embedding_provider, create_vector_store, create_llm_provider
 from rag.config.settings import settings
 
 
@@ -30,18 +29,21 @@ async def initialize_tpn_system():
     
     # Initialize providers
     print("🔧 Initializing TPN specialist providers...")
-    embedding_provider = OllamaEmbeddingProvider()
-    vector_store = ChromaVectorStore()
-    llm_provider = OllamaLLMProvider()
+    embedding_provider = create_embedding_provider()
+    vector_store = create_vector_store()
+    llm_provider = create_llm_provider()
     
     # Check Ollama health
     print("🤖 Checking Ollama health...")
     if not await llm_provider.check_health():
-        print("❌ Ollama is not running. Please start Ollama service:")
-        print("   ollama serve")
-        print("   ollama pull nomic-embed-text")
-        print("   ollama pull mistral:7b")
-        return False
+        if settings.embedding_backend.lower() != "local":
+            print("❌ Ollama is not running. Please start Ollama service:")
+            print("   ollama serve")
+            print("   ollama pull nomic-embed-text")
+            print("   ollama pull mistral:7b")
+            return False
+        # Local embeddings don't need Ollama; only answer generation does
+        print("⚠️  Ollama is not running - continuing with local embeddings (ingestion/search only)")
     
     # Create TPN-specialized RAG service (ChromaDB + 2025 Advanced RAG features)
     # Vector search only - Neo4j graph database disabled for simplicity
@@ -160,9 +162,6 @@ def select_ollama_model(available_models):
 async def run_tpn_specialist_demo():
     """Run TPN Clinical Specialist interactive demo with model selection."""
     from rag.core.models.documents import RAGQuery
-    from rag.infrastructure.embeddings.ollama_embeddings import OllamaEmbeddingProvider
-    from rag.infrastructure.vector_stores.chroma_store import ChromaVectorStore
-    from rag.infrastructure.llm_providers.ollama_provider import OllamaLLMProvider
     from rag.core.services.hybrid_rag_service import HybridRAGService
     
     print("🔍 Checking available Ollama models...")
@@ -182,9 +181,9 @@ async def run_tpn_specialist_demo():
     print(f"✅ Selected model: {selected_model}")
     
     # Initialize providers with selected model
-    embedding_provider = OllamaEmbeddingProvider()
-    vector_store = ChromaVectorStore()
-    llm_provider = OllamaLLMProvider(default_model=selected_model)
+    embedding_provider = create_embedding_provider()
+    vector_store = create_vector_store()
+    llm_provider = create_llm_provider(default_model=selected_model)
     
     # Create RAG service with 2025 Advanced Features
     rag_service = HybridRAGService(
@@ -246,14 +245,137 @@ async def run_tpn_specialist_demo():
             print("Please try rephrasing your TPN question.")
 
 
+async def retry_failed_embeddings():
+    """Re-embed and insert the chunks waiting in the failed-embedding queue."""
+    rag_service = RAGService(
+        embedding_provider=create_embedding_provider(),
+        vector_store=create_vector_store(),
+        llm_provider=create_llm_provider()
+    )
+
+    pending = rag_service.failed_embeddings.count(rag_service.collection_version)
+    if pending == 0:
+        print(
+            f"✅ No failed embeddings queued for {rag_service.collection_version}"
+            " - nothing to retry"
+        )
+        return True
+
+    print(f"🔁 Retrying {pending} chunks whose embedding failed...")
+    try:
+        result = await rag_service.retry_failed_embeddings()
+    finally:
+        await rag_service.embedding_provider.aclose()
+
+    print(f"📊 Retry result: {result}")
+    if result["still_failed"]:
+        print(
+            f"⚠️  {result['still_failed']} chunks still failing"
+            " - check the embedding backend and run again"
+        )
+        return False
+    print("✅ All queued chunks embedded and inserted")
+    return True
+
+
+def resolve_snapshot_dir(argv):
+    """Snapshot directory from the command line, or data/snapshots/<collection>."""
+    if len(argv) > 2:
+        return Path(argv[2])
+    return settings.snapshots_dir / settings.chroma_collection_name
+
+
+async def export_index(directory):
+    """Export the live vector index (vectors, texts, metadata) to a portable snapshot."""
+    from rag.infrastructure.vector_stores.snapshot import export_snapshot
+
+    vector_store = create_vector_store()
+    if not isinstance(vector_store, ChromaVectorStore):
+        print("❌ export-index supports VECTOR_STORE_BACKEND=chroma only")
+        return False
+
+    # The model the index was built with, as recorded per document in the registry
+    await vector_store.get_stats()
+    models = {
+        doc["embedding_model"]
+        for doc in vector_store.registry.documents().values()
+        if doc["embedding_model"]
+    }
+    if len(models) > 1:
+        print(f"❌ Index mixes embedding models {sorted(models)} - reindex before exporting")
+        return False
+    embedding_model = models.pop() if models else create_embedding_provider().model_name
+
+    print(f"📤 Exporting {vector_store.collection_name} ({embedding_model}) to {directory}...")
+    try:
+        manifest = export_snapshot(vector_store, directory, embedding_model)
+    except Exception as e:
+        print(f"❌ Export failed: {e}")
+        return False
+    print(
+        f"✅ Exported {manifest['count']} chunks "
+        f"({manifest['dimension']}-d, {manifest['records_format']} records)"
+    )
+    return True
+
+
+async def import_index(directory):
+    """Bulk-load a snapshot into a new collection version (no re-embedding) and switch to it."""
+    from rag.infrastructure.vector_stores.snapshot import import_snapshot
+
+    vector_store = create_vector_store()
+    if not isinstance(vector_store, ChromaVectorStore):
+        print("❌ import-index supports VECTOR_STORE_BACKEND=chroma only")
+        return False
+
+    # One query embedding tells the configured model's dimension
+    embedding_provider = create_embedding_provider()
+    try:
+        dimension = len(await embedding_provider.embed_query("embedding dimension check"))
+    except Exception as e:
+        print(f"❌ Cannot verify the embedding model ({embedding_provider.model_name}): {e}")
+        return False
+    finally:
+        await embedding_provider.aclose()
+
+    try:
+        result = await import_snapshot(
+            vector_store, directory, embedding_provider.model_name, dimension
+        )
+    except Exception as e:
+        print(f"❌ Import failed: {e}")
+        return False
+    print(f"📊 Import result: {result}")
+    return True
+
+
 async def start_api_server():
     """Start the FastAPI server."""
     import uvicorn
     from rag.api.main import app
-    
+
     print("🌐 Starting FastAPI server...")
     print(f"📖 API Documentation: http://localhost:{settings.api_port}/docs")
-    
+
+    if settings.api_workers > 1:
+        if settings.chroma_mode.lower() != "http":
+            print("❌ API_WORKERS > 1 needs a shared Chroma server: set CHROMA_MODE=http and run")
+            print("   python main.py chroma-server")
+            return
+        # Each worker process imports the app and opens its own pooled Chroma HTTP client
+        print(
+            f"👥 Starting {settings.api_workers} workers against Chroma at "
+            f"{settings.chroma_host}:{settings.chroma_port}"
+        )
+        uvicorn.run(
+            "rag.api.main:app",
+            host=settings.api_host,
+            port=settings.api_port,
+            workers=settings.api_workers,
+            app_dir=str(Path(__file__).parent / "src")
+        )
+        return
+
     config = uvicorn.Config(
         app=app,
         host=settings.api_host,
@@ -264,11 +386,39 @@ async def start_api_server():
     await server.serve()
 
 
+def run_chroma_server():
+    """Serve the ChromaDB directory over HTTP (CHROMA_MODE=http clients connect here)."""
+    import shutil
+    import subprocess
+
+    chroma = shutil.which("chroma")
+    if chroma is None:
+        print("❌ The chroma CLI was not found (it is installed with the chromadb package)")
+        return False
+
+    settings.ensure_directories()
+    print(
+        f"🗄️  Starting Chroma server on {settings.chroma_host}:{settings.chroma_port} "
+        f"({settings.chromadb_dir})"
+    )
+    print("   Set CHROMA_MODE=http for the API workers and the OCR pipeline")
+    command = [
+        chroma, "run",
+        "--path", str(settings.chromadb_dir),
+        "--host", settings.chroma_host,
+        "--port", str(settings.chroma_port)
+    ]
+    try:
+        return subprocess.call(command) == 0
+    except KeyboardInterrupt:
+        return True
+
+
 async def main():
     """TPN Specialist System main entry point."""
     if len(sys.argv) > 1:
         command = sys.argv[1].lower()
-        
+
         if command == "init":
             # Initialize TPN system and load ASPEN documents
             success = await initialize_tpn_system()
@@ -277,7 +427,9 @@ async def main():
                 print("\nNext steps:")
                 print("  python main.py demo    # Run TPN specialist demo")
                 print("  python main.py serve   # Start TPN API server")
-                print("  python main.py reset   # Reset and reload with enhanced processing")
+                print(
+                    "  python main.py reset   # Reindex into a new collection version, then switch"
+                )
             sys.exit(0 if success else 1)
             
         elif command == "demo":
@@ -291,19 +443,50 @@ async def main():
             if await initialize_tpn_system():
                 await start_api_server()
             sys.exit(0)
-            
+
+        elif command == "retry-failed":
+            # Re-embed only the chunks whose embedding failed during loading
+            success = await retry_failed_embeddings()
+            sys.exit(0 if success else 1)
+
         elif command == "reset":
-            # Reset ChromaDB and reload with enhanced processing
+            # Reload into a new collection version and switch to it once it passes smoke queries
             if await initialize_tpn_system():
                 from rag.api.dependencies import get_rag_service
                 db_manager = DatabaseManager(get_rag_service())
                 result = await db_manager.reset_and_reload_enhanced(confirm=True)
                 print(f"📊 Reset result: {result}")
             sys.exit(0)
-            
+
+        elif command == "export-index":
+            # Dump the live index to a snapshot a replica can import without re-embedding
+            success = await export_index(resolve_snapshot_dir(sys.argv))
+            sys.exit(0 if success else 1)
+
+        elif command == "import-index":
+            # Bulk-load a snapshot into a new collection version and switch to it
+            success = await import_index(resolve_snapshot_dir(sys.argv))
+            sys.exit(0 if success else 1)
+
+        elif command == "chroma-server":
+            # Run a Chroma server so several API workers / processes share one index
+            success = run_chroma_server()
+            sys.exit(0 if success else 1)
+
+        elif command == "rollback":
+            # Switch the collection alias back to the previous version
+            rag_service = RAGService(
+                embedding_provider=create_embedding_provider(),
+                vector_store=create_vector_store(),
+                llm_provider=create_llm_provider()
+            )
+            result = await DatabaseManager(rag_service).rollback()
+            print(f"📊 Rollback result: {result}")
+            sys.exit(0 if result["status"] == "success" else 1)
+
         else:
             print(f"❌ Unknown command: {command}")
-    
+
     # Default: show TPN system usage
     print("🏥 TPN Nutrition Specialist System v2.0")
     print("📚 Based on 76 Medical Documents (ASPEN/TPN Clinical Guidelines)")
@@ -312,7 +495,12 @@ async def main():
     print("  python main.py init    # Initialize TPN system with ASPEN documents")
     print("  python main.py demo    # Run TPN clinical specialist demo")
     print("  python main.py serve   # Start TPN API server (FastAPI)")
-    print("  python main.py reset   # Reset ChromaDB with enhanced processing")
+    print("  python main.py reset   # Reindex into a new collection version, then switch to it")
+    print("  python main.py rollback  # Switch back to the previous collection version")
+    print("  python main.py chroma-server  # Serve ChromaDB over HTTP (CHROMA_MODE=http)")
+    print("  python main.py export-index [dir]  # Snapshot the index (vectors + texts + metadata)")
+    print("  python main.py import-index [dir]  # Load a snapshot without re-embedding")
+    print("  python main.py retry-failed  # Re-embed chunks whose embedding failed")
     print("\n🔧 For processing new TPN PDFs:")
     print("  python -m ocr_pipeline.main test-ingest")
     print("\n💡 TPN Specialist Features:")
@@ -16,6 +16,7 @@ EMBEDDINGS_DIR = DATA_DIR / "embeddings"
 CHROMADB_DIR = EMBEDDINGS_DIR / "chromadb"
 VECTORS_DIR = EMBEDDINGS_DIR / "vectors"
 METADATA_DIR = EMBEDDINGS_DIR / "metadata"
+REGISTRY_DIR = EMBEDDINGS_DIR / "registry"  # Per-collection document registries (exact stats)
 LOGS_DIR = PROJECT_ROOT / "logs"
 
 # OCR Configuration
@@ -28,11 +29,27 @@ OCR_ENDPOINT_PATH = os.getenv("OCR_ENDPOINT_PATH", "/v1/ocr")
 DEFAULT_EMBED_MODEL = os.getenv("EMBED_MODEL", "mistral-embed")
 EMBED_BASE_URL = os.getenv("EMBED_BASE_URL", "https://api.mistral.ai")
 EMBED_ENDPOINT_PATH = os.getenv("EMBED_ENDPOINT_PATH", "/v1/embeddings")
-EMBED_BATCH_SIZE = int(os.getenv("EMBED_BATCH_SIZE", "50"))
+EMBED_BATCH_SIZE = int(os.getenv("EMBED_BATCH_SIZE", "50"))  # Max chunks per request
+EMBED_BATCH_TOKEN_BUDGET = int(
+    os.getenv("EMBED_BATCH_TOKEN_BUDGET", "16000")
+)  # Max tokens per request
 EMBED_CHUNK_SIZE = int(os.getenv("EMBED_CHUNK_SIZE", "512"))
+EMBED_MAX_CONCURRENCY = int(os.getenv("OCR_EMBED_CONCURRENCY", "4"))  # Max batch requests in flight
+EMBED_MAX_RETRIES = int(
+    os.getenv("OCR_EMBED_MAX_RETRIES", "5")
+)  # Per batch, for 429 / 5xx / timeouts
 
 # ChromaDB Configuration
 CHROMA_COLLECTION_NAME = os.getenv("CHROMA_COLLECTION_NAME", "medical_docs")
+CHROMA_MODE = os.getenv(
+    "CHROMA_MODE", "embedded"
+)  # "http" shares a Chroma server with the API workers
+CHROMA_HOST = os.getenv("CHROMA_HOST", "localhost")
+CHROMA_PORT = int(os.getenv("CHROMA_PORT", "8001"))
+CHROMA_SHARDS = int(
+    os.getenv("CHROMA_SHARDS", "1")
+)  # Layout for new versions; existing ones keep theirs
+CHROMA_SHARD_KEY = os.getenv("CHROMA_SHARD_KEY", "doc_id")
 
 # Limits per docs FAQ
 MAX_FILE_MB = float(os.getenv("OCR_MAX_FILE_MB", "50"))
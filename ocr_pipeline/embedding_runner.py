@@ -3,7 +3,7 @@ Mistral Embeddings API integration for creating vector embeddings from parsed do
 
 This module handles:
 - Text chunking for optimal embedding size
-- Batch processing with the Mistral embeddings API
+- Concurrent async batch processing with the Mistral embeddings API
 - ChromaDB storage for fast vector similarity search
 - File-based embedding backup for portability
 - Image-text relationship preservation for RAG
@@ -13,10 +13,14 @@ https://docs.mistral.ai/capabilities/embeddings/text_embeddings/
 """
 
 from __future__ import annotations
+import asyncio
+import email.utils
 import json
+import random
 import time
 import hashlib
 import logging
+from contextlib import nullcontext
 from pathlib import Path
 from typing import List, Dict, Optional, Tuple, Any
 from dataclasses import dataclass, asdict
@@ -24,13 +28,23 @@ from dataclasses import dataclass, asdict
 import numpy as np
 from mistralai import Mistral
 
+from src.rag.core.models.embeddings import EMBEDDING_DTYPE, EmbeddingMatrix, EmbeddingVector
+from src.rag.core.services.batch_packing import TokenBudgetPacker
+from src.rag.infrastructure.adaptive_concurrency import (
+    AdaptiveConcurrencyLimiter,
+    is_overload_error,
+)
+
 from .config import (
     MISTRAL_API_KEY,
     DEFAULT_EMBED_MODEL,
     EMBED_BASE_URL,
     EMBED_ENDPOINT_PATH,
     EMBED_BATCH_SIZE,
+    EMBED_BATCH_TOKEN_BUDGET,
     EMBED_CHUNK_SIZE,
+    EMBED_MAX_CONCURRENCY,
+    EMBED_MAX_RETRIES,
     VECTORS_DIR,
     METADATA_DIR,
     get_logger,
@@ -60,9 +74,9 @@ class TextChunk:
 
 @dataclass
 class EmbeddingResult:
-    """Result from embedding API call."""
+    """Result from embedding API call (``embedding`` is a row of the document's vector matrix)."""
     chunk_id: str
-    embedding: List[float]
+    embedding: EmbeddingVector
     model: str
     tokens_used: int
     request_id: Optional[str] = None
@@ -79,6 +93,17 @@ class DocumentEmbeddings:
     created_at: str
     total_tokens: int
     processing_time_seconds: float
+    vectors: EmbeddingMatrix | None = None  # (len(embeddings), dim) float32, row i = embeddings[i]
+
+    def __post_init__(self):
+        if self.vectors is None and self.embeddings:
+            self.vectors = np.stack(
+                [np.asarray(result.embedding, dtype=EMBEDDING_DTYPE) for result in self.embeddings]
+            )
+        if self.vectors is not None:
+            # Results share the matrix rows instead of holding their own copies
+            for row, result in enumerate(self.embeddings):
+                result.embedding = self.vectors[row]
 
 
 logger = get_logger("embedding-runner")
@@ -125,12 +150,12 @@ def _extract_chunks_from_index(index_path: Path) -> List[TextChunk]:
         
         chunks = []
         chunk_counter = 0
-        
+
         for block in blocks:
             block_type = block.get('type', 'text')
             section = block.get('section', '')
             line_num = block.get('line')
-            
+
             # Get content based on block type
             if block_type == 'heading':
                 content = f"# {section}"
@@ -173,81 +198,204 @@ def _extract_chunks_from_index(index_path: Path) -> List[TextChunk]:
         logger.error(f"Failed to extract chunks from {index_path}: {e}")
         return []
 
-
-def _call_embeddings_api(texts: List[str], model: str = DEFAULT_EMBED_MODEL) -> Tuple[List[List[float]], int, Optional[str]]:
-    """Call Mistral embeddings API with batch of texts."""
-    if not MISTRAL_API_KEY:
-        raise ValueError("MISTRAL_API_KEY not found in environment")
-    
-    client = Mistral(api_key=MISTRAL_API_KEY)
-    
-    try:
-        logger.debug(f"Calling embeddings API with {len(texts)} texts")
         
-        response = client.embeddings.create(
-            model=model,
-            inputs=texts
-        )
-        
-        # Extract embeddings in the correct order
-        embeddings = []
-        for data in sorted(response.data, key=lambda x: x.index):
-            embeddings.append(data.embedding)
+def _call_embeddings_api(
+    texts: list[str], model: str = DEFAULT_EMBED_MODEL
+) -> tuple[EmbeddingMatrix, int, str | None]:
+    """Call Mistral embeddings API with batch of texts (synchronous, used for search queries)."""
+    with new_embeddings_client() as client:
+        try:
+            logger.debug(f"Calling embeddings API with {len(texts)} texts")
         
-        total_tokens = response.usage.total_tokens if response.usage else 0
-        request_id = getattr(response, 'id', None)
+            response = client.embeddings.create(
+                model=model,
+                inputs=texts
+            )
         
-        logger.debug(f"API call successful: {len(embeddings)} embeddings, {total_tokens} tokens")
-        return embeddings, total_tokens, request_id
+            # Extract embeddings in the correct order, as one float32 matrix
+            embeddings = np.asarray(
+                [data.embedding for data in sorted(response.data, key=lambda x: x.index)],
+                dtype=EMBEDDING_DTYPE
+            )
         
-    except Exception as e:
-        logger.error(f"Embeddings API call failed: {e}")
-        raise
+            total_tokens = response.usage.total_tokens if response.usage else 0
+            request_id = getattr(response, 'id', None)
+
+            logger.debug(
+                f"API call successful: {len(embeddings)} embeddings, {total_tokens} tokens"
+            )
+            return embeddings, total_tokens, request_id
 
+        except Exception as e:
+            logger.error(f"Embeddings API call failed: {e}")
+            raise
 
-def _process_chunks_in_batches(chunks: List[TextChunk], model: str = DEFAULT_EMBED_MODEL) -> List[EmbeddingResult]:
-    """Process chunks in batches through the embeddings API."""
-    results = []
-    total_tokens = 0
+
+def _retry_after_seconds(error: BaseException) -> float | None:
+    """Delay requested by a 429/503 ``Retry-After`` header (seconds or HTTP date), if any."""
+    response = getattr(error, "raw_response", None) or getattr(error, "response", None)
+    headers = getattr(response, "headers", None)
+    value = headers.get("retry-after") if headers is not None else None
+    if not value:
+        return None
     
-    # Process in batches
-    for i in range(0, len(chunks), EMBED_BATCH_SIZE):
-        batch_chunks = chunks[i:i + EMBED_BATCH_SIZE]
-        batch_texts = [chunk.content for chunk in batch_chunks]
-        
-        logger.info(f"Processing batch {i // EMBED_BATCH_SIZE + 1}/{(len(chunks) + EMBED_BATCH_SIZE - 1) // EMBED_BATCH_SIZE}")
-        
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = email.utils.parsedate_to_datetime(value)
+        return max(0.0, retry_at.timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+async def _call_embeddings_api_async(
+    client: Mistral,
+    texts: list[str],
+    model: str = DEFAULT_EMBED_MODEL
+) -> tuple[EmbeddingMatrix, int, str | None]:
+    """Call the Mistral embeddings API asynchronously on a shared client."""
+    response = await client.embeddings.create_async(model=model, inputs=texts)
+
+    embeddings = np.asarray(
+        [data.embedding for data in sorted(response.data, key=lambda x: x.index)],
+        dtype=EMBEDDING_DTYPE
+    )
+    total_tokens = response.usage.total_tokens if response.usage else 0
+    return embeddings, total_tokens, getattr(response, 'id', None)
+
+
+async def _embed_batch_with_retry(
+    client: Mistral,
+    limiter: AdaptiveConcurrencyLimiter,
+    texts: list[str],
+    model: str,
+    max_retries: int = EMBED_MAX_RETRIES
+) -> tuple[EmbeddingMatrix, int, str | None]:
+    """Embed one batch under the concurrency limiter, retrying overload errors.
+
+    429 responses wait for ``Retry-After`` when the API sends it; other overload
+    errors back off exponentially with jitter. The wait happens outside the
+    limiter slot so other batches keep going.
+    """
+    for attempt in range(max_retries + 1):
         try:
-            embeddings, tokens_used, request_id = _call_embeddings_api(batch_texts, model)
-            total_tokens += tokens_used
-            
-            # Create results for this batch
-            for chunk, embedding in zip(batch_chunks, embeddings):
-                result = EmbeddingResult(
-                    chunk_id=chunk.chunk_id,
-                    embedding=embedding,
-                    model=model,
-                    tokens_used=tokens_used // len(batch_chunks),  # Approximate per chunk
-                    request_id=request_id
-                )
-                results.append(result)
-            
-            # Rate limiting - be nice to the API
-            time.sleep(0.1)
-            
+            async with limiter.slot():
+                return await _call_embeddings_api_async(client, texts, model)
         except Exception as e:
-            logger.error(f"Failed to process batch {i // EMBED_BATCH_SIZE + 1}: {e}")
-            # Continue with other batches
-            continue
+            if attempt == max_retries or not is_overload_error(e):
+                raise
+            delay = _retry_after_seconds(e)
+            if delay is None:
+                delay = min(30.0, 2 ** attempt) * (0.5 + random.random())
+            logger.warning(
+                f"Embeddings API overloaded ({e}); "
+                f"retry {attempt + 1}/{max_retries} in {delay:.1f}s"
+            )
+            await asyncio.sleep(delay)
+    raise RuntimeError("unreachable")
+
+
+async def _process_chunks_in_batches_async(
+    chunks: list[TextChunk],
+    model: str,
+    client: Mistral,
+    limiter: AdaptiveConcurrencyLimiter
+) -> list[EmbeddingResult]:
+    """Embed token-budgeted batches concurrently; results come back in chunk order.
+
+    Chunks are grouped by length under EMBED_BATCH_TOKEN_BUDGET (at most
+    EMBED_BATCH_SIZE per request). Batches that still fail after retries are
+    skipped and logged, like the sequential runner did.
+    """
+    packer = TokenBudgetPacker(
+        max_tokens_per_batch=EMBED_BATCH_TOKEN_BUDGET,
+        max_items_per_batch=EMBED_BATCH_SIZE
+    )
+    batches = packer.pack([chunk.content for chunk in chunks])
+
+    async def run_batch(
+        batch_num: int, batch_indices: list[int]
+    ) -> list[tuple[int, EmbeddingResult]]:
+        batch_chunks = [chunks[idx] for idx in batch_indices]
+        logger.info(f"Processing batch {batch_num}/{len(batches)} ({len(batch_chunks)} chunks)")
+        try:
+            embeddings, tokens_used, request_id = await _embed_batch_with_retry(
+                client, limiter, [chunk.content for chunk in batch_chunks], model
+            )
+        except Exception as e:
+            logger.error(f"Failed to process batch {batch_num}: {e}")
+            return []
     
-    logger.info(f"Processed {len(results)} chunks using {total_tokens} tokens")
+        return [
+            (idx, EmbeddingResult(
+                chunk_id=chunk.chunk_id,
+                embedding=embedding,
+                model=model,
+                tokens_used=tokens_used // len(batch_chunks),  # Approximate per chunk
+                request_id=request_id
+            ))
+            for idx, chunk, embedding in zip(batch_indices, batch_chunks, embeddings, strict=True)
+        ]
+
+    batch_results = await asyncio.gather(*(
+        run_batch(batch_num, batch_indices) for batch_num, batch_indices in enumerate(batches, 1)
+    ))
+
+    # Packing reorders chunks by length; saved embeddings must follow chunk order
+    results = [result for _, result in sorted(
+        (pair for batch in batch_results for pair in batch), key=lambda pair: pair[0]
+    )]
+
+    logger.info(
+        f"Processed {len(results)} chunks using {sum(r.tokens_used for r in results)} tokens"
+    )
     return results
 
 
+def _process_chunks_in_batches(
+    chunks: list[TextChunk], model: str = DEFAULT_EMBED_MODEL
+) -> list[EmbeddingResult]:
+    """Synchronous wrapper around ``_process_chunks_in_batches_async``."""
+    async def run() -> list[EmbeddingResult]:
+        async with new_embeddings_client() as client:
+            return await _process_chunks_in_batches_async(
+                chunks, model, client, new_embedding_limiter()
+            )
+    return asyncio.run(run())
+
+
+def new_embeddings_client() -> Mistral:
+    """Mistral client for one run; shared by all of that run's requests.
+
+    Use it as an async (or sync) context manager so its HTTP connections are closed
+    when the run ends.
+    """
+    if not MISTRAL_API_KEY:
+        raise ValueError("MISTRAL_API_KEY not found in environment")
+    return Mistral(api_key=MISTRAL_API_KEY)
+
+
+def new_embedding_limiter(
+    max_concurrency: int = EMBED_MAX_CONCURRENCY,
+) -> AdaptiveConcurrencyLimiter:
+    """Limiter for in-flight embedding requests: starts at, never exceeds, ``max_concurrency``."""
+    max_concurrency = max(1, max_concurrency)
+    return AdaptiveConcurrencyLimiter(initial_limit=max_concurrency, max_limit=max_concurrency)
+
+
 def _save_embeddings_to_file(doc_embeddings: DocumentEmbeddings) -> Path:
-    """Save embeddings to file for backup and portability."""
+    """Save embeddings to file for backup and portability.
+
+    Vectors go to a ``.embeddings.npy`` sidecar written straight from the float32
+    matrix; the JSON file holds chunk and request metadata only.
+    """
     filename = f"{doc_embeddings.doc_id}.embeddings.json"
     file_path = VECTORS_DIR / filename
+    vectors_file = f"{doc_embeddings.doc_id}.embeddings.npy"
+
+    np.save(VECTORS_DIR / vectors_file, doc_embeddings.vectors, allow_pickle=False)
     
     # Convert to serializable format
     data = {
@@ -258,7 +406,16 @@ def _save_embeddings_to_file(doc_embeddings: DocumentEmbeddings) -> Path:
         "total_tokens": doc_embeddings.total_tokens,
         "processing_time_seconds": doc_embeddings.processing_time_seconds,
         "chunks": [asdict(chunk) for chunk in doc_embeddings.chunks],
-        "embeddings": [asdict(embedding) for embedding in doc_embeddings.embeddings]
+        "vectors_file": vectors_file,
+        "embeddings": [
+            {
+                "chunk_id": result.chunk_id,
+                "model": result.model,
+                "tokens_used": result.tokens_used,
+                "request_id": result.request_id,
+            }
+            for result in doc_embeddings.embeddings
+        ]
     }
     
     with open(file_path, 'w', encoding='utf-8') as f:
@@ -270,8 +427,23 @@ def _save_embeddings_to_file(doc_embeddings: DocumentEmbeddings) -> Path:
 
 def create_embeddings_for_document(index_path: Path, model: str = DEFAULT_EMBED_MODEL) -> Optional[DocumentEmbeddings]:
     """Create embeddings for a single document from its index.json file."""
+    async def run() -> DocumentEmbeddings | None:
+        async with new_embeddings_client() as client:
+            return await create_embeddings_for_document_async(
+                index_path, model, client, new_embedding_limiter()
+            )
+    return asyncio.run(run())
+
+
+async def create_embeddings_for_document_async(
+    index_path: Path,
+    model: str = DEFAULT_EMBED_MODEL,
+    client: Mistral | None = None,
+    limiter: AdaptiveConcurrencyLimiter | None = None
+) -> DocumentEmbeddings | None:
+    """Create embeddings for a document; pass one client and limiter to share across documents."""
     start_time = time.time()
-    
+
     try:
         # Extract chunks from index
         chunks = _extract_chunks_from_index(index_path)
@@ -288,8 +460,13 @@ def create_embeddings_for_document(index_path: Path, model: str = DEFAULT_EMBED_
         
         logger.info(f"Creating embeddings for {original_filename} ({len(chunks)} chunks)")
         
-        # Process chunks through embeddings API
-        embedding_results = _process_chunks_in_batches(chunks, model)
+        # Process chunks through embeddings API (a client opened here is closed here)
+        async with (
+            nullcontext(client) if client is not None else new_embeddings_client()
+        ) as run_client:
+            embedding_results = await _process_chunks_in_batches_async(
+                chunks, model, run_client, limiter or new_embedding_limiter()
+            )
         
         if not embedding_results:
             logger.error(f"No embeddings created for {original_filename}")
@@ -298,7 +475,7 @@ def create_embeddings_for_document(index_path: Path, model: str = DEFAULT_EMBED_
         # Create document embeddings object
         processing_time = time.time() - start_time
         total_tokens = sum(result.tokens_used for result in embedding_results)
-        
+
         doc_embeddings = DocumentEmbeddings(
             doc_id=doc_id,
             original_filename=original_filename,
@@ -309,13 +486,13 @@ def create_embeddings_for_document(index_path: Path, model: str = DEFAULT_EMBED_
             total_tokens=total_tokens,
             processing_time_seconds=processing_time
         )
-        
-        # Save to file
-        _save_embeddings_to_file(doc_embeddings)
-        
+
+        # Save to file (off the event loop; other documents' batches keep running)
+        await asyncio.to_thread(_save_embeddings_to_file, doc_embeddings)
+
         logger.info(f"Completed embeddings for {original_filename} in {processing_time:.1f}s")
         return doc_embeddings
-        
+
     except Exception as e:
         logger.error(f"Failed to create embeddings for {index_path}: {e}")
         return None
@@ -339,7 +516,18 @@ def load_document_embeddings(doc_id: str) -> Optional[DocumentEmbeddings]:
             data = json.load(f)
         
         chunks = [TextChunk(**chunk_data) for chunk_data in data['chunks']]
-        embeddings = [EmbeddingResult(**emb_data) for emb_data in data['embeddings']]
+
+        vectors = None
+        if data.get('vectors_file'):
+            # Memory-mapped: rows are paged in only when read (e.g. by ChromaDB on insert)
+            vectors = np.load(VECTORS_DIR / data['vectors_file'], mmap_mode='r', allow_pickle=False)
+            embeddings = [
+                EmbeddingResult(embedding=vectors[row], **emb_data)
+                for row, emb_data in enumerate(data['embeddings'])
+            ]
+        else:
+            # Legacy files carry the vectors inline
+            embeddings = [EmbeddingResult(**emb_data) for emb_data in data['embeddings']]
         
         return DocumentEmbeddings(
             doc_id=data['doc_id'],
@@ -349,7 +537,8 @@ def load_document_embeddings(doc_id: str) -> Optional[DocumentEmbeddings]:
             model=data['model'],
             created_at=data['created_at'],
             total_tokens=data['total_tokens'],
-            processing_time_seconds=data['processing_time_seconds']
+            processing_time_seconds=data['processing_time_seconds'],
+            vectors=vectors
         )
         
     except Exception as e:
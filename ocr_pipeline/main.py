@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import asyncio
 import json
 import sys
 import time
@@ -13,6 +14,7 @@ from .config import (
     PARSED_DIR,
     DEFAULT_OCR_MODEL,
     DEFAULT_EMBED_MODEL,
+    EMBED_MAX_CONCURRENCY,
     ensure_directories,
     get_logger,
     MAX_FILE_MB,
@@ -22,7 +24,14 @@ from .hashing import compute_file_sha256, derive_doc_id
 from .pdf_info import get_pdf_page_count
 from .ocr_runner import run_ocr
 from .save_utils import write_outputs, expected_artifacts_exist
-from .embedding_runner import create_embeddings_for_document, embeddings_exist_for_doc, load_document_embeddings
+from .embedding_runner import (
+    create_embeddings_for_document,
+    create_embeddings_for_document_async,
+    embeddings_exist_for_doc,
+    load_document_embeddings,
+    new_embedding_limiter,
+    new_embeddings_client,
+)
 from .search import search_documents, print_search_results, load_all_embeddings_to_chromadb
 # No manifest needed - use simple file-based skip logic
 
@@ -295,12 +304,67 @@ def test_embedding(
         raise typer.Exit(code=1)
 
 
+async def _embed_documents(index_files: list[Path], model: str, concurrency: int) -> list[dict]:
+    """Embed documents concurrently on one Mistral client; returns one result dict per document."""
+    client = new_embeddings_client()
+    limiter = new_embedding_limiter(concurrency)
+
+    async def embed_document(doc_idx: int, index_file: Path) -> dict:
+        logger.info(f"Creating embeddings for document {doc_idx}/{len(index_files)}: {index_file}")
+        started = time.time()
+        try:
+            doc_embeddings = await create_embeddings_for_document_async(
+                index_file, model, client, limiter
+            )
+            error = "No embeddings created"
+        except Exception as e:
+            doc_embeddings = None
+            error = str(e)
+            logger.error(f"Embedding creation failed for {index_file}: {e}")
+
+        duration = time.time() - started
+        if doc_embeddings:
+            typer.echo(
+                f"[{doc_idx}/{len(index_files)}] {index_file.parent.name} "
+                f"-> Completed in {duration:.1f}s "
+                f"({len(doc_embeddings.chunks)} chunks, {doc_embeddings.total_tokens} tokens)"
+            )
+            return {
+                "document": index_file.parent.name,
+                "status": "completed",
+                "chunks": len(doc_embeddings.chunks),
+                "tokens": doc_embeddings.total_tokens,
+                "seconds": round(duration, 2)
+            }
+
+        typer.echo(
+            f"[{doc_idx}/{len(index_files)}] {index_file.parent.name} "
+            f"-> Failed after {duration:.1f}s: {error}"
+        )
+        return {
+            "document": index_file.parent.name,
+            "status": "failed",
+            "error": error,
+            "seconds": round(duration, 2)
+        }
+
+    async with client:  # Closes the client's connections once every document is done
+        return await asyncio.gather(*(
+            embed_document(doc_idx, index_file) for doc_idx, index_file in enumerate(index_files, 1)
+        ))
+
+
 @app.command("create-embeddings")
 @app.command("create_embeddings")
 def create_embeddings(
     force: bool = typer.Option(False, "--force", help="Force re-creation even if embeddings exist"),
-    batch_size: int = typer.Option(10, "--batch-size", help="Number of documents to process in this run"),
+    batch_size: int = typer.Option(
+        10, "--batch-size", help="Number of documents to process in this run"
+    ),
     model: str = typer.Option(DEFAULT_EMBED_MODEL, "--model", help="Embedding model to use"),
+    concurrency: int = typer.Option(
+        EMBED_MAX_CONCURRENCY, "--concurrency", help="Max embedding requests in flight"
+    ),
 ) -> None:
     """Create embeddings for parsed documents using Mistral embeddings API."""
     ensure_directories()
@@ -312,7 +376,7 @@ def create_embeddings(
         typer.echo(f"No parsed documents found in {PARSED_DIR}.")
         typer.echo("Run 'test-ingest' first to process PDFs.")
         raise typer.Exit(code=0)
-    
+
     # Filter for documents that need embeddings
     if force:
         # Process all documents if force flag is used
@@ -323,10 +387,10 @@ def create_embeddings(
         for index_file in all_index_files:
             # Extract doc_id from filename (e.g., "document__abc123.index.json" -> "document__abc123")
             doc_id = index_file.stem.replace('.index', '')
-            
+
             if not embeddings_exist_for_doc(doc_id):
                 docs_to_process.append(index_file)
-                
+
                 if len(docs_to_process) >= batch_size:
                     break
     
@@ -335,53 +399,12 @@ def create_embeddings(
         typer.echo("Use --force to regenerate embeddings.")
         raise typer.Exit(code=0)
     
-    typer.echo(f"Creating embeddings for {len(docs_to_process)} documents using model: {model}")
+    typer.echo(f"Creating embeddings for {len(docs_to_process)} documents using model: {model} "
+               f"(up to {concurrency} requests in flight)")
     
-    # Process each document
-    batch_results = []
+    # All documents share one client and one limiter, so batches from several documents overlap
     batch_start_time = time.time()
-    
-    for doc_idx, index_file in enumerate(docs_to_process, 1):
-        typer.echo(f"\n[{doc_idx}/{len(docs_to_process)}] Processing: {index_file.parent.name}")
-        logger.info(f"Creating embeddings for document {doc_idx}/{len(docs_to_process)}: {index_file}")
-        
-        started = time.time()
-        try:
-            doc_embeddings = create_embeddings_for_document(index_file, model=model)
-            
-            if doc_embeddings:
-                duration = time.time() - started
-                typer.echo(f"  -> Completed in {duration:.1f}s ({len(doc_embeddings.chunks)} chunks, {doc_embeddings.total_tokens} tokens)")
-                
-                batch_results.append({
-                    "document": index_file.parent.name,
-                    "status": "completed",
-                    "chunks": len(doc_embeddings.chunks),
-                    "tokens": doc_embeddings.total_tokens,
-                    "seconds": round(duration, 2)
-                })
-            else:
-                duration = time.time() - started
-                typer.echo(f"  -> Failed after {duration:.1f}s: No embeddings created")
-                
-                batch_results.append({
-                    "document": index_file.parent.name,
-                    "status": "failed",
-                    "error": "No embeddings created",
-                    "seconds": round(duration, 2)
-                })
-        
-        except Exception as e:
-            duration = time.time() - started
-            typer.echo(f"  -> Failed after {duration:.1f}s: {e}")
-            logger.error(f"Embedding creation failed for {index_file}: {e}")
-            
-            batch_results.append({
-                "document": index_file.parent.name,
-                "status": "failed",
-                "error": str(e),
-                "seconds": round(duration, 2)
-            })
+    batch_results = asyncio.run(_embed_documents(docs_to_process, model, concurrency))
     
     # Print batch summary
     batch_duration = time.time() - batch_start_time
@@ -399,6 +422,9 @@ def create_embeddings(
         total_tokens = sum(r.get("tokens", 0) for r in successful)
         typer.echo(f"Total chunks embedded: {total_chunks}")
         typer.echo(f"Total tokens used: {total_tokens}")
+        if batch_duration > 0:
+            typer.echo(f"Throughput: {total_tokens / batch_duration:,.0f} tokens/sec "
+                       f"({total_chunks / batch_duration:.1f} chunks/sec)")
     
     # Print next steps
     remaining_docs = len([f for f in all_index_files if not embeddings_exist_for_doc(f.stem.replace('.index', ''))])
@@ -406,7 +432,7 @@ def create_embeddings(
         typer.echo(f"\nNext run will process {min(remaining_docs, batch_size)} more documents.")
     else:
         typer.echo(f"\n🎉 All documents have embeddings!")
-    
+
     # Exit with error code if any failures
     if failed:
         raise typer.Exit(code=1)
@@ -19,14 +19,18 @@ from typing import List, Dict, Optional, Tuple, Any
 from dataclasses import dataclass
 
 import numpy as np
-import chromadb
-from chromadb.config import Settings
 from sklearn.metrics.pairwise import cosine_similarity
 
 from .config import (
     CHROMADB_DIR,
     CHROMA_COLLECTION_NAME,
+    CHROMA_HOST,
+    CHROMA_MODE,
+    CHROMA_PORT,
+    CHROMA_SHARD_KEY,
+    CHROMA_SHARDS,
     PARSED_DIR,
+    REGISTRY_DIR,
     VECTORS_DIR,
     get_logger,
 )
@@ -36,6 +40,10 @@ from .embedding_runner import (
     _call_embeddings_api,
     DEFAULT_EMBED_MODEL,
 )
+from src.rag.infrastructure.document_registry import DocumentRegistry
+from src.rag.infrastructure.vector_stores.chroma_client import create_chroma_client, with_retries
+from src.rag.infrastructure.vector_stores.collection_alias import CollectionAlias
+from src.rag.infrastructure.vector_stores.sharding import ShardLayout, open_shards
 
 
 @dataclass
@@ -76,42 +84,49 @@ class ChromaRAGSearch:
     """ChromaDB-based RAG search engine."""
     
     def __init__(self, collection_name: str = CHROMA_COLLECTION_NAME):
-        self.collection_name = collection_name
+        # The configured name is an alias for the live collection version
+        # (see `python main.py reset`)
+        self.collection_name = CollectionAlias.for_collection(collection_name, CHROMADB_DIR).active
         self.client = None
-        self.collection = None
+        self.layout = ShardLayout(CHROMA_SHARDS, CHROMA_SHARD_KEY)
+        self.collections = []  # One per shard (see ShardLayout)
+        self.registry = DocumentRegistry(REGISTRY_DIR / f"{self.collection_name}.sqlite")
         self._initialize_client()
     
     def _initialize_client(self):
         """Initialize ChromaDB client and collection."""
         try:
-            # Initialize ChromaDB client with persistent storage (disable telemetry completely)
-            import chromadb.telemetry
-            chromadb.telemetry.telemetry = None  # Disable telemetry completely
-            
-            self.client = chromadb.PersistentClient(
-                path=str(CHROMADB_DIR),
-                settings=Settings(
-                    anonymized_telemetry=False,
-                    allow_reset=True
-                )
+            # Embedded storage or a shared Chroma server (telemetry disabled either way)
+            self.client = create_chroma_client(
+                mode=CHROMA_MODE,
+                path=CHROMADB_DIR,
+                host=CHROMA_HOST,
+                port=CHROMA_PORT
             )
             
-            # Get or create collection
-            try:
-                self.collection = self.client.get_collection(name=self.collection_name)
-                logger.info(f"Connected to existing ChromaDB collection: {self.collection_name}")
-            except Exception:
-                # Collection doesn't exist, create it
-                self.collection = self.client.create_collection(
-                    name=self.collection_name,
-                    metadata={"description": "Medical document embeddings for RAG"}
-                )
-                logger.info(f"Created new ChromaDB collection: {self.collection_name}")
+            # Get or create collection (all of its shards, with the layout the API store uses)
+            self.layout, self.collections = open_shards(
+                self.client,
+                self.collection_name,
+                self.layout,
+                description="Medical document embeddings for RAG"
+            )
+            logger.info(
+                f"Opened ChromaDB collection {self.collection_name} ({self.layout.count} shard(s))"
+            )
                 
+            # Stats are served from the registry; rebuild it once here if it drifted from the shards
+            self.registry.sync_with_collections(self.collections)
+
         except Exception as e:
             logger.error(f"Failed to initialize ChromaDB: {e}")
             raise
     
+    @property
+    def collection(self):
+        """The ChromaDB collection of an unsharded version (the first shard otherwise)."""
+        return self.collections[0]
+
     def add_document_to_collection(self, doc_embeddings: DocumentEmbeddings) -> bool:
         """Add a document's embeddings to the ChromaDB collection."""
         try:
@@ -119,15 +134,21 @@ class ChromaRAGSearch:
                 logger.warning(f"No embeddings to add for {doc_embeddings.doc_id}")
                 return False
             
-            # Prepare data for ChromaDB
+            # Embeddings cover only chunks whose batch succeeded; match them by chunk_id
+            chunks_by_id = {chunk.chunk_id: chunk for chunk in doc_embeddings.chunks}
+
+            # Prepare data for ChromaDB (vectors are passed as the float32 matrix)
             ids = []
-            embeddings = []
+            rows = []
             metadatas = []
             documents = []
             
-            for chunk, embedding in zip(doc_embeddings.chunks, doc_embeddings.embeddings):
+            for row, embedding in enumerate(doc_embeddings.embeddings):
+                chunk = chunks_by_id.get(embedding.chunk_id)
+                if chunk is None:
+                    continue
                 ids.append(chunk.chunk_id)
-                embeddings.append(embedding.embedding)
+                rows.append(row)
                 documents.append(chunk.content)
                 
                 # Create metadata for this chunk
@@ -149,21 +170,44 @@ class ChromaRAGSearch:
                 
                 metadatas.append(metadata)
             
-            # Add to collection
-            self.collection.add(
-                ids=ids,
-                embeddings=embeddings,
-                metadatas=metadatas,
-                documents=documents
-            )
+            vectors = doc_embeddings.vectors
+            embeddings = vectors if len(rows) == len(vectors) else vectors[rows]
+
+            embeddings = np.ascontiguousarray(embeddings, dtype=np.float32)
+
+            # Add to collection, each chunk to the shard the layout routes it to
+            rows_by_shard = {}
+            for row, metadata in enumerate(metadatas):
+                rows_by_shard.setdefault(self.layout.shard_of(metadata), []).append(row)
+            for shard, shard_rows in rows_by_shard.items():
+                with_retries(
+                    self.collections[shard].add,
+                    ids=[ids[row] for row in shard_rows],
+                    embeddings=(
+                        embeddings if len(shard_rows) == len(ids) else embeddings[shard_rows]
+                    ),
+                    metadatas=[metadatas[row] for row in shard_rows],
+                    documents=[documents[row] for row in shard_rows],
+                )
+
+            try:
+                self.registry.record_chunks(ids, metadatas, doc_embeddings.model)
+            except Exception as e:
+                logger.warning(
+                    f"Document registry update failed, rebuilding it from the collection: {e}"
+                )
+                try:
+                    self.registry.sync_with_collections(self.collections)
+                except Exception as e:
+                    logger.warning(f"Document registry rebuild failed: {e}")
             
             logger.info(f"Added {len(embeddings)} chunks from {doc_embeddings.original_filename} to ChromaDB")
             return True
-            
+
         except Exception as e:
             logger.error(f"Failed to add document {doc_embeddings.doc_id} to ChromaDB: {e}")
             return False
-    
+
     def search_similar(
         self, 
         query: str, 
@@ -174,29 +218,37 @@ class ChromaRAGSearch:
         """Search for similar chunks using vector similarity."""
         import time
         start_time = time.time()
-        
+
         try:
             # Get query embedding
             query_embeddings, _, _ = _call_embeddings_api([query], model=model)
-            query_embedding = query_embeddings[0]
-            
-            # Search in ChromaDB
-            search_results = self.collection.query(
-                query_embeddings=[query_embedding],
-                n_results=limit,
-                where=filter_metadata,
-                include=['documents', 'metadatas', 'distances']
-            )
+
+            # Search in ChromaDB (every shard the filter can match)
+            hits = []
+            for shard in self.layout.shards_for(filter_metadata):
+                search_results = with_retries(
+                    self.collections[shard].query,
+                    query_embeddings=query_embeddings[:1],
+                    n_results=limit,
+                    where=filter_metadata,
+                    include=['documents', 'metadatas', 'distances']
+                )
+                if search_results['ids'] and search_results['ids'][0]:
+                    hits.extend(zip(
+                        search_results['distances'][0],
+                        search_results['ids'][0],
+                        search_results['metadatas'][0],
+                        search_results['documents'][0],
+                        strict=True,
+                    ))
             
-            # Convert ChromaDB results to our SearchResult objects
+            # Convert ChromaDB results to our SearchResult objects (overall top-k by distance)
             results = []
             
-            if search_results['ids'] and search_results['ids'][0]:
-                for i, chunk_id in enumerate(search_results['ids'][0]):
-                    metadata = search_results['metadatas'][0][i]
-                    content = search_results['documents'][0][i]
-                    distance = search_results['distances'][0][i]
-                    
+            if hits:
+                for distance, chunk_id, metadata, content in sorted(hits, key=lambda hit: hit[0])[
+                    :limit
+                ]:
                     # Convert distance to similarity score (0-1, higher is better)
                     score = max(0, 1 - distance)
                     
@@ -260,32 +312,20 @@ class ChromaRAGSearch:
         return image_paths
     
     def get_collection_stats(self) -> Dict[str, Any]:
-        """Get statistics about the ChromaDB collection."""
+        """Get statistics about the ChromaDB collection (from the document registry)."""
         try:
-            count = self.collection.count()
-            
-            # Get ALL metadata to get accurate document counts
-            all_results = self.collection.get(include=['metadatas'])
+            stats = self.registry.stats()
             
             doc_counts = {}
-            chunk_types = {}
-            unique_documents = set()
-            
-            if all_results['metadatas']:
-                for metadata in all_results['metadatas']:
-                    if metadata:
-                        doc_name = metadata.get('document_name', 'unknown')
-                        chunk_type = metadata.get('chunk_type', 'text')
-                        
-                        doc_counts[doc_name] = doc_counts.get(doc_name, 0) + 1
-                        chunk_types[chunk_type] = chunk_types.get(chunk_type, 0) + 1
-                        unique_documents.add(doc_name)
+            for document in self.registry.documents().values():
+                name = document["document_name"]
+                doc_counts[name] = doc_counts.get(name, 0) + document["chunk_count"]
             
             return {
-                "total_chunks": count,
-                "total_documents": len(unique_documents),  # Accurate count
+                "total_chunks": stats["total_chunks"],
+                "total_documents": stats["total_documents"],
                 "documents": dict(sorted(doc_counts.items())),
-                "chunk_types": chunk_types,
+                "chunk_types": stats["chunk_types"],
                 "collection_name": self.collection_name
             }
             
@@ -305,13 +345,14 @@ def load_all_embeddings_to_chromadb(force: bool = False) -> Tuple[int, int]:
     if not force:
         try:
             # Get all existing data to check for duplicates
-            all_results = search_engine.collection.get(include=['metadatas'])
-            if all_results['ids']:
-                existing_chunk_ids = set(all_results['ids'])
-                # Extract document IDs from metadata
-                for metadata in all_results['metadatas']:
-                    if metadata and 'doc_id' in metadata:
-                        existing_doc_ids.add(metadata['doc_id'])
+            for collection in search_engine.collections:
+                all_results = collection.get(include=['metadatas'])
+                if all_results['ids']:
+                    existing_chunk_ids.update(all_results['ids'])
+                    # Extract document IDs from metadata
+                    for metadata in all_results['metadatas']:
+                        if metadata and 'doc_id' in metadata:
+                            existing_doc_ids.add(metadata['doc_id'])
             
             logger.info(f"Found {len(existing_chunk_ids)} existing chunks from {len(existing_doc_ids)} documents in ChromaDB")
         except Exception as e:
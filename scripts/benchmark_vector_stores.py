@@ -0,0 +1,307 @@
+#!/usr/bin/env python3
+"""
+Recall@k / latency / memory report for the vector store backends.
+
+Vectors come from the live ChromaDB collection (default) or are synthetic
+(--synthetic N). Every backend is built in a temporary directory from the same
+vectors, so the production index is never modified. Queries are stored vectors
+(the query's own chunk is excluded from its results); ground truth is an exact
+brute-force squared-L2 search. The IVF-PQ index is built once and swept over
+--nprobe values to give a recall/latency curve against the exact flat store.
+
+Usage:
+    python scripts/benchmark_vector_stores.py
+    python scripts/benchmark_vector_stores.py --synthetic 20000 --dim 768 \
+        --output data/benchmarks/vector_stores.json
+    python scripts/benchmark_vector_stores.py --synthetic 50000 --dim 384 --nprobe 1,2,4,8,16,32
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import chromadb  # noqa: E402
+from chromadb.config import Settings as ChromaSettings  # noqa: E402
+
+from src.rag.config.settings import settings  # noqa: E402
+from src.rag.core.interfaces.embeddings import VectorStore  # noqa: E402
+from src.rag.core.models.documents import DocumentChunk  # noqa: E402
+from src.rag.infrastructure.vector_stores.chroma_store import ChromaVectorStore  # noqa: E402
+from src.rag.infrastructure.vector_stores.flat_store import FlatVectorStore  # noqa: E402
+from src.rag.infrastructure.vector_stores.ivfpq_store import IVFPQVectorStore  # noqa: E402
+from src.rag.infrastructure.vector_stores.quantized_store import QuantizedVectorStore  # noqa: E402
+
+INSERT_BATCH = 1000
+
+
+def load_chroma_vectors() -> tuple[list[DocumentChunk], np.ndarray]:
+    """Read every chunk and embedding from the configured ChromaDB collection (all shards)."""
+    chunks, vectors = [], []
+    for collection in ChromaVectorStore().collections:
+        total = collection.count()
+        for offset in range(0, total, INSERT_BATCH):
+            page = collection.get(
+                limit=INSERT_BATCH, offset=offset, include=["documents", "metadatas", "embeddings"]
+            )
+            for chunk_id, content, metadata, embedding in zip(
+                page["ids"], page["documents"], page["metadatas"], page["embeddings"], strict=True
+            ):
+                chunks.append(
+                    DocumentChunk(
+                        chunk_id=chunk_id,
+                        doc_id=metadata.get("doc_id", ""),
+                        content=content or "",
+                        chunk_type=metadata.get("chunk_type", "text"),
+                        section=metadata.get("section") or None,
+                        page_num=metadata.get("page_num"),
+                    )
+                )
+                vectors.append(embedding)
+    return chunks, np.asarray(vectors, dtype=np.float32)
+
+
+def synthetic_vectors(
+    count: int, dimension: int, seed: int
+) -> tuple[list[DocumentChunk], np.ndarray]:
+    """Clustered, L2-normalized vectors that roughly mimic text embeddings."""
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(size=(max(1, count // 100), dimension)).astype(np.float32)
+    vectors = centers[rng.integers(0, len(centers), count)] + 1.5 * rng.normal(
+        size=(count, dimension)
+    ).astype(np.float32)
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    chunks = [
+        DocumentChunk(
+            chunk_id=f"synthetic_{i}", doc_id=f"doc_{i // 200}", content=f"synthetic chunk {i}"
+        )
+        for i in range(count)
+    ]
+    return chunks, vectors
+
+
+def build_stores(workdir: Path, oversample: int) -> dict[str, VectorStore]:
+    """Empty instances of every backend under test."""
+    chroma_client = chromadb.PersistentClient(
+        path=str(workdir / "chroma"),
+        settings=ChromaSettings(anonymized_telemetry=False, allow_reset=True),
+    )
+    return {
+        "chroma-hnsw": ChromaVectorStore(collection_name="benchmark", client=chroma_client),
+        "flat-exact": FlatVectorStore(collection_name="benchmark", directory=workdir / "flat"),
+        "quantized-int8": QuantizedVectorStore(
+            collection_name="benchmark",
+            quantization="int8",
+            oversample=oversample,
+            directory=workdir / "int8",
+        ),
+        "quantized-binary": QuantizedVectorStore(
+            collection_name="benchmark",
+            quantization="binary",
+            oversample=oversample,
+            directory=workdir / "binary",
+        ),
+    }
+
+
+def exact_neighbours(vectors: np.ndarray, query_rows: np.ndarray, k: int) -> list[list[int]]:
+    """Brute-force squared-L2 top-k for each query row, excluding the row itself."""
+    norms = (vectors**2).sum(axis=1)
+    truth = []
+    for row in query_rows:
+        distances = norms - 2.0 * (vectors @ vectors[row])
+        distances[row] = np.inf
+        top = np.argpartition(distances, k)[:k]
+        truth.append(top[np.argsort(distances[top])].tolist())
+    return truth
+
+
+async def ingest(store: VectorStore, chunks: list[DocumentChunk], vectors: np.ndarray) -> float:
+    """Insert all vectors in batches; returns elapsed seconds."""
+    start = time.perf_counter()
+    for offset in range(0, len(chunks), INSERT_BATCH):
+        await store.add_chunks(
+            chunks[offset : offset + INSERT_BATCH],
+            vectors[offset : offset + INSERT_BATCH],
+            doc_name="benchmark",
+        )
+    return time.perf_counter() - start
+
+
+async def measure_queries(
+    store: VectorStore,
+    chunks: list[DocumentChunk],
+    vectors: np.ndarray,
+    query_rows: np.ndarray,
+    truth: list[list[int]],
+    k: int,
+) -> dict[str, Any]:
+    """Time one search per query, then all queries in one batched call; compute recall@k."""
+    row_by_id = {chunk.chunk_id: row for row, chunk in enumerate(chunks)}
+    latencies, recalls = [], []
+    for row, expected in zip(query_rows, truth, strict=True):
+        start = time.perf_counter()
+        results = await store.search_similar(vectors[row], limit=k + 1)
+        latencies.append((time.perf_counter() - start) * 1000)
+
+        found = [row_by_id[r["chunk_id"]] for r in results if row_by_id[r["chunk_id"]] != row][:k]
+        recalls.append(len(set(found) & set(expected)) / k)
+
+    start = time.perf_counter()
+    await store.search_similar_many(vectors[query_rows], limit=k + 1)
+    batch_ms_per_query = (time.perf_counter() - start) * 1000 / len(query_rows)
+
+    stats = await store.get_stats()
+    return {
+        "recall_at_k": round(float(np.mean(recalls)), 4),
+        "latency_p50_ms": round(float(np.percentile(latencies, 50)), 2),
+        "latency_p95_ms": round(float(np.percentile(latencies, 95)), 2),
+        "batch_ms_per_query": round(batch_ms_per_query, 3),
+        "in_memory_bytes_per_chunk": stats.get("in_memory_bytes_per_chunk"),
+        "on_disk_bytes_per_chunk": stats.get("on_disk_bytes_per_chunk"),
+    }
+
+
+async def measure(
+    store: VectorStore,
+    chunks: list[DocumentChunk],
+    vectors: np.ndarray,
+    query_rows: np.ndarray,
+    truth: list[list[int]],
+    k: int,
+) -> dict[str, Any]:
+    """Ingest all vectors, then measure queries."""
+    ingest_seconds = await ingest(store, chunks, vectors)
+    return {
+        **await measure_queries(store, chunks, vectors, query_rows, truth, k),
+        "ingest_seconds": round(ingest_seconds, 2),
+    }
+
+
+async def measure_ivfpq_curve(
+    workdir: Path,
+    chunks: list[DocumentChunk],
+    vectors: np.ndarray,
+    query_rows: np.ndarray,
+    truth: list[list[int]],
+    k: int,
+    nprobes: list[int],
+    oversample: int,
+) -> dict[str, dict[str, Any]]:
+    """Build one IVF-PQ index, then measure recall/latency at each nprobe."""
+    store = IVFPQVectorStore(
+        collection_name="benchmark",
+        rescore_oversample=oversample,
+        train_size=min(settings.ivfpq_train_size, len(chunks)),
+        directory=workdir / "ivfpq",
+    )
+    ingest_seconds = await ingest(store, chunks, vectors)
+    curve = {}
+    for nprobe in nprobes:
+        store.nprobe = nprobe
+        print(f"  ⏱️  ivfpq nprobe={nprobe}...")
+        row = await measure_queries(store, chunks, vectors, query_rows, truth, k)
+        curve[f"ivfpq-nprobe{nprobe}"] = {**row, "ingest_seconds": round(ingest_seconds, 2)}
+    return curve
+
+
+async def main() -> int:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument(
+        "--synthetic", type=int, default=0, help="Use N synthetic vectors instead of ChromaDB"
+    )
+    parser.add_argument("--dim", type=int, default=768, help="Dimension of synthetic vectors")
+    parser.add_argument("--queries", type=int, default=200, help="Number of query vectors")
+    parser.add_argument("--k", type=int, default=10, help="Recall cut-off")
+    parser.add_argument(
+        "--oversample", type=int, default=10, help="Quantized rescoring oversample factor"
+    )
+    parser.add_argument(
+        "--nprobe", default="1,4,16,64", help="Comma-separated IVF-PQ nprobe values to sweep"
+    )
+    parser.add_argument(
+        "--ivfpq-oversample",
+        type=int,
+        help="IVF-PQ rescoring oversample factor (default: --oversample)",
+    )
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--output", type=Path, help="Write the report as JSON")
+    args = parser.parse_args()
+
+    if args.synthetic:
+        chunks, vectors = synthetic_vectors(args.synthetic, args.dim, args.seed)
+        source = f"synthetic ({args.synthetic} x {args.dim})"
+    else:
+        chunks, vectors = load_chroma_vectors()
+        source = f"chromadb ({len(chunks)} x {vectors.shape[1] if len(vectors) else 0})"
+    if len(chunks) <= args.k:
+        print("❌ Not enough vectors to benchmark - load documents or use --synthetic N")
+        return 1
+
+    rng = np.random.default_rng(args.seed)
+    query_rows = rng.choice(len(chunks), size=min(args.queries, len(chunks)), replace=False)
+    truth = exact_neighbours(vectors, query_rows, args.k)
+
+    print(f"📊 Benchmarking vector stores on {source}, {len(query_rows)} queries, recall@{args.k}")
+    report: dict[str, Any] = {
+        "source": source,
+        "queries": len(query_rows),
+        "k": args.k,
+        "stores": {},
+    }
+
+    with tempfile.TemporaryDirectory(prefix="vector_store_bench_") as tmp:
+        for name, store in build_stores(Path(tmp), args.oversample).items():
+            print(f"  ⏱️  {name}...")
+            report["stores"][name] = await measure(
+                store, chunks, vectors, query_rows, truth, args.k
+            )
+        nprobes = [int(value) for value in args.nprobe.split(",") if value.strip()]
+        report["stores"].update(
+            await measure_ivfpq_curve(
+                Path(tmp),
+                chunks,
+                vectors,
+                query_rows,
+                truth,
+                args.k,
+                nprobes,
+                args.ivfpq_oversample if args.ivfpq_oversample is not None else args.oversample,
+            )
+        )
+
+    float32_bytes = vectors.shape[1] * 4
+    print(
+        f"\n| store | recall@{args.k} | p50 ms | p95 ms | batched ms/query | ingest s "
+        f"| RAM bytes/chunk | disk bytes/chunk (float32 = {float32_bytes}) |"
+    )
+    print("|---|---|---|---|---|---|---|---|")
+    for name, row in report["stores"].items():
+        print(
+            f"| {name} | {row['recall_at_k']:.3f} | {row['latency_p50_ms']} "
+            f"| {row['latency_p95_ms']} | {row['batch_ms_per_query']} | {row['ingest_seconds']} "
+            f"| {row['in_memory_bytes_per_chunk'] or 'n/a'} "
+            f"| {row['on_disk_bytes_per_chunk'] or 'n/a'} |"
+        )
+
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(json.dumps(report, indent=2))
+        print(f"\n💾 Report written to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -4,43 +4,100 @@ FastAPI dependency injection.
 import asyncio
 from functools import lru_cache
 from typing import Optional
+from ..core.interfaces.embeddings import EmbeddingProvider, LLMProvider
 from ..core.services.rag_service import RAGService
 from ..infrastructure.embeddings.ollama_embeddings import OllamaEmbeddingProvider
+from ..infrastructure.embeddings.local_embeddings import LocalEmbeddingProvider
+from ..infrastructure.embeddings.cached_embeddings import CachedEmbeddingProvider
+from ..infrastructure.embeddings.query_cache import QueryCachedEmbeddingProvider
+from ..core.interfaces.embeddings import VectorStore
 from ..infrastructure.vector_stores.chroma_store import ChromaVectorStore
+from ..infrastructure.vector_stores.quantized_store import QuantizedVectorStore
+from ..infrastructure.vector_stores.flat_store import FlatVectorStore
+from ..infrastructure.vector_stores.ivfpq_store import IVFPQVectorStore
 from ..infrastructure.llm_providers.ollama_provider import OllamaLLMProvider
+from ..infrastructure.llm_providers.coalescing_provider import CoalescingLLMProvider
 from ..config.settings import settings
 
 # Global instances (singleton pattern for performance)
 _rag_service: Optional[RAGService] = None
-_embedding_provider: Optional[OllamaEmbeddingProvider] = None
-_vector_store: Optional[ChromaVectorStore] = None
-_llm_provider: Optional[OllamaLLMProvider] = None
+_embedding_provider: EmbeddingProvider | None = None
+_vector_store: VectorStore | None = None
+_llm_provider: LLMProvider | None = None
+
+
+def create_embedding_provider() -> EmbeddingProvider:
+    """Build the configured embedding stack: the backend behind the persistent and query caches."""
+    backend = settings.embedding_backend.lower()
+    if backend == "ollama":
+        provider: EmbeddingProvider = OllamaEmbeddingProvider()
+    elif backend == "local":
+        provider = LocalEmbeddingProvider()
+    else:
+        raise ValueError(
+            f"Unknown EMBEDDING_BACKEND '{settings.embedding_backend}' "
+            "(expected 'ollama' or 'local')"
+        )
+
+    if settings.embedding_cache_enabled:
+        provider = CachedEmbeddingProvider(provider)
+    if settings.query_embedding_cache_size > 0:
+        # Outermost: repeated queries within a request never reach SQLite or the backend
+        provider = QueryCachedEmbeddingProvider(provider)
+    return provider
 
 
 @lru_cache()
-def get_embedding_provider() -> OllamaEmbeddingProvider:
+def get_embedding_provider() -> EmbeddingProvider:
     """Get or create embedding provider instance."""
     global _embedding_provider
     if _embedding_provider is None:
-        _embedding_provider = OllamaEmbeddingProvider()
+        _embedding_provider = create_embedding_provider()
     return _embedding_provider
 
 
+def create_vector_store() -> VectorStore:
+    """Build the configured vector store backend."""
+    backend = settings.vector_store_backend.lower()
+    if backend == "chroma":
+        return ChromaVectorStore()
+    if backend == "quantized":
+        return QuantizedVectorStore()
+    if backend == "flat":
+        return FlatVectorStore()
+    if backend == "ivfpq":
+        return IVFPQVectorStore()
+    raise ValueError(
+        f"Unknown VECTOR_STORE_BACKEND '{settings.vector_store_backend}' "
+        "(expected 'chroma', 'quantized', 'flat' or 'ivfpq')"
+    )
+
+
 @lru_cache()
-def get_vector_store() -> ChromaVectorStore:
+def get_vector_store() -> VectorStore:
     """Get or create vector store instance."""
     global _vector_store
     if _vector_store is None:
-        _vector_store = ChromaVectorStore()
+        _vector_store = create_vector_store()
     return _vector_store
 
 
+def create_llm_provider(default_model: str | None = None) -> LLMProvider:
+    """Build the Ollama LLM provider, behind single-flight coalescing when enabled."""
+    provider: LLMProvider = (
+        OllamaLLMProvider(default_model=default_model) if default_model else OllamaLLMProvider()
+    )
+    if settings.llm_coalescing_enabled:
+        provider = CoalescingLLMProvider(provider)
+    return provider
+
+
 @lru_cache()
-def get_llm_provider() -> OllamaLLMProvider:
+def get_llm_provider() -> LLMProvider:
     """Get or create LLM provider instance."""
     global _llm_provider
     if _llm_provider is None:
-        _llm_provider = OllamaLLMProvider()
+        _llm_provider = create_llm_provider()
     return _llm_provider
 
 
@@ -5,7 +5,7 @@ from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
 from .routes.rag_routes import router as rag_router
-from .dependencies import check_services_health
+from .dependencies import check_services_health, get_embedding_provider, get_llm_provider
 from .schemas.requests import HealthResponse
 from ..config.settings import settings
 
@@ -19,10 +19,18 @@ async def lifespan(app: FastAPI):
     print(f"📊 Data directory: {settings.data_dir}")
     print(f"🔍 ChromaDB directory: {settings.chromadb_dir}")
     
+    # Open pooled HTTP clients once; every request reuses their keep-alive connections
+    embedding_provider = get_embedding_provider()
+    llm_provider = get_llm_provider()
+    await embedding_provider.open()
+    await llm_provider.open()
+
     yield
     
     # Shutdown
     print("🛑 RAG API shutting down...")
+    await llm_provider.aclose()
+    await embedding_provider.aclose()
 
 
 def create_app() -> FastAPI:
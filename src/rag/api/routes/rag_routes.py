@@ -62,7 +62,13 @@ async def get_collection_stats(
             total_chunks=stats.get("total_chunks", 0),
             total_documents=stats.get("total_documents", 0),
             collection_name=stats.get("collection_name", "unknown"),
-            embedding_model=rag_service.embedding_provider.model_name
+            embedding_model=rag_service.embedding_provider.model_name,
+            chunk_types=stats.get("chunk_types", {}),
+            vector_store_stats={
+                key: value for key, value in stats.items()
+                if key not in ("total_chunks", "total_documents", "collection_name", "chunk_types")
+            },
+            embedding_stats=rag_service.embedding_provider.stats()
         )
         
     except Exception as e:
@@ -37,3 +37,12 @@ class StatsResponse(BaseModel):
     total_documents: int
     collection_name: str
     embedding_model: str
+    chunk_types: dict[str, int] = Field(
+        default_factory=dict, description="Chunk count per chunk type"
+    )
+    vector_store_stats: dict[str, Any] = Field(
+        default_factory=dict, description="Vector store cache and thread pool statistics"
+    )
+    embedding_stats: dict[str, Any] = Field(
+        default_factory=dict, description="Embedding cache and concurrency statistics"
+    )
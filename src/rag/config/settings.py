@@ -33,27 +33,121 @@ class Settings(BaseSettings):
     
     # Ollama Configuration
     ollama_base_url: str = Field(default="http://localhost:11434", alias="OLLAMA_BASE_URL")
+    # Comma-separated Ollama hosts to balance across (overrides OLLAMA_BASE_URL when set)
+    ollama_base_urls: str = Field(default="", alias="OLLAMA_BASE_URLS")
+    # Passive health tracking: eject a host after this many consecutive failures...
+    ollama_eject_after_failures: int = Field(default=3, alias="OLLAMA_EJECT_AFTER_FAILURES")
+    # ...or when its latency is this many times the fastest host's; re-admit after the ejection time
+    ollama_slow_host_factor: float = Field(default=3.0, alias="OLLAMA_SLOW_HOST_FACTOR")
+    ollama_ejection_seconds: float = Field(default=30.0, alias="OLLAMA_EJECTION_SECONDS")
     # Embedding model (auto-detected if not specified)
     # Supported: nomic-embed-text (768d), mxbai-embed-large (1024d), all-minilm (384d), bge-large (1024d)
     ollama_embed_model: Optional[str] = Field(default=None, alias="OLLAMA_EMBED_MODEL")
     ollama_llm_model: str = Field(default="mistral:7b", alias="OLLAMA_LLM_MODEL")
-    
+    # Texts per /api/embed request (1 = legacy one-request-per-text /api/embeddings)
+    ollama_embed_batch_size: int = Field(default=32, alias="OLLAMA_EMBED_BATCH_SIZE")
+
+    # Embedding backend: "ollama" (HTTP) or "local" (in-process sentence-transformers on CPU)
+    embedding_backend: str = Field(default="ollama", alias="EMBEDDING_BACKEND")
+    local_embed_model: str = Field(
+        default="sentence-transformers/all-MiniLM-L6-v2", alias="LOCAL_EMBED_MODEL"
+    )
+    local_embed_batch_size: int = Field(default=32, alias="LOCAL_EMBED_BATCH_SIZE")
+    # ONNX Runtime with an int8-quantized export (falls back to PyTorch if it can't be loaded)
+    local_embed_onnx: bool = Field(default=False, alias="LOCAL_EMBED_ONNX")
+    local_embed_onnx_file: str = Field(
+        default="onnx/model_quint8_avx2.onnx", alias="LOCAL_EMBED_ONNX_FILE"
+    )
+
     # ChromaDB Configuration
     chroma_collection_name: str = Field(default="medical_docs", alias="CHROMA_COLLECTION_NAME")
+    # "embedded" (PersistentClient, one process) or "http" (Chroma server shared by several workers)
+    chroma_mode: str = Field(default="embedded", alias="CHROMA_MODE")
+    chroma_host: str = Field(default="localhost", alias="CHROMA_HOST")
+    chroma_port: int = Field(default=8001, alias="CHROMA_PORT")
+    chroma_ssl: bool = Field(default=False, alias="CHROMA_SSL")
+    chroma_http_max_connections: int = Field(default=16, alias="CHROMA_HTTP_MAX_CONNECTIONS")
+    # Retries for connection errors and 429/502/503/504 from the Chroma server
+    chroma_max_retries: int = Field(default=3, alias="CHROMA_MAX_RETRIES")
+    # Threads running blocking ChromaDB calls; reads (query/get) and writes (add/delete)
+    # get separate pools
+    # so searches are not queued behind a bulk load
+    chroma_read_threads: int = Field(default=4, alias="CHROMA_READ_THREADS")
+    chroma_write_threads: int = Field(default=1, alias="CHROMA_WRITE_THREADS")
+    # Shards per collection version (1 = unsharded), routed by CRC32 of "doc_id" or "document_type";
+    # existing versions keep their layout, `python main.py reset` builds the new one
+    chroma_shards: int = Field(default=1, alias="CHROMA_SHARDS")
+    chroma_shard_key: str = Field(default="doc_id", alias="CHROMA_SHARD_KEY")
+    # Reindexing builds a new collection version behind the alias; previous versions are
+    # kept for rollback
+    chroma_versions_to_keep: int = Field(default=1, alias="CHROMA_VERSIONS_TO_KEEP")
+    # A rebuilt version is only promoted with at least this fraction of the live version's chunks
+    reindex_min_chunk_ratio: float = Field(default=0.9, alias="REINDEX_MIN_CHUNK_RATIO")
+    # Rows per page / insert batch for `export-index` and `import-index`
+    # (capped at ChromaDB's max batch size)
+    snapshot_batch_size: int = Field(default=5000, alias="SNAPSHOT_BATCH_SIZE")
+
+    # Vector store backend: "chroma", "quantized" (int8/binary codes + float32 rescoring),
+    # "flat" (exact, memory-mapped) or "ivfpq" (inverted lists + product quantization)
+    vector_store_backend: str = Field(default="chroma", alias="VECTOR_STORE_BACKEND")
+    vector_quantization: str = Field(default="int8", alias="VECTOR_QUANTIZATION")
+    # Candidates rescored with float32 per requested result
+    quantized_rescore_oversample: int = Field(default=10, alias="QUANTIZED_RESCORE_OVERSAMPLE")
+    # IVF-PQ: coarse lists (0 = ~4*sqrt(training vectors)), lists scanned per query,
+    # PQ subquantizers (0 = dimension / 8), chunks stored before training (exact search until then),
+    # shortlist rescored with float32 per requested result (0 = PQ distances only)
+    ivfpq_nlist: int = Field(default=0, alias="IVFPQ_NLIST")
+    ivfpq_nprobe: int = Field(default=8, alias="IVFPQ_NPROBE")
+    ivfpq_subquantizers: int = Field(default=0, alias="IVFPQ_M")
+    ivfpq_train_size: int = Field(default=10000, alias="IVFPQ_TRAIN_SIZE")
+    ivfpq_rescore_oversample: int = Field(default=4, alias="IVFPQ_RESCORE_OVERSAMPLE")
     
     # RAG Configuration
     # Reduced to 10 for Simple RAG (less noise, more focused)
     default_search_limit: int = Field(default=10, alias="DEFAULT_SEARCH_LIMIT")
     chunk_size: int = Field(default=512, alias="CHUNK_SIZE")
     chunk_overlap: int = Field(default=50, alias="CHUNK_OVERLAP")
-    
+    # Enhanced search: strategy groups (original, enhanced, entity_focused, semantic_expansion)
+    # in flight at once per request, and the time each may take before its results are dropped
+    strategy_search_concurrency: int = Field(default=4, alias="STRATEGY_SEARCH_CONCURRENCY")
+    strategy_search_timeout_seconds: float = Field(
+        default=10.0, alias="STRATEGY_SEARCH_TIMEOUT_SECONDS"
+    )
+
     # Performance
     max_concurrent_requests: int = Field(default=10, alias="MAX_CONCURRENT_REQUESTS")
+    # Upper bound for the adaptive (AIMD) embedding concurrency limiter
+    embed_max_concurrency: int = Field(default=32, alias="EMBED_MAX_CONCURRENCY")
+    # Ingestion batches are packed by token count (tiktoken cl100k_base) under this budget
+    embed_batch_token_budget: int = Field(default=8192, alias="EMBED_BATCH_TOKEN_BUDGET")
+    embed_batch_max_items: int = Field(default=64, alias="EMBED_BATCH_MAX_ITEMS")
+    # Streaming ingestion: concurrent embedding batches and bounded queue size between stages
+    ingest_embed_workers: int = Field(default=2, alias="INGEST_EMBED_WORKERS")
+    ingest_queue_size: int = Field(default=4, alias="INGEST_QUEUE_SIZE")
+    # TTL of in-memory query embeddings
     cache_ttl_seconds: int = Field(default=3600, alias="CACHE_TTL_SECONDS")
+    # Max query embeddings kept in memory (0 disables the query cache)
+    query_embedding_cache_size: int = Field(default=1024, alias="QUERY_EMBEDDING_CACHE_SIZE")
+    # Chunk texts kept in memory for hydrating content-less search results (0 disables)
+    chunk_text_cache_size: int = Field(default=4096, alias="CHUNK_TEXT_CACHE_SIZE")
+    # Persistent (model, dimension, sha256) -> vector cache in front of the embedding provider
+    embedding_cache_enabled: bool = Field(default=True, alias="EMBEDDING_CACHE_ENABLED")
+    # Concurrent identical LLM prompts (model, prompt, temperature, seed, max_tokens) share one call
+    llm_coalescing_enabled: bool = Field(default=True, alias="LLM_COALESCING_ENABLED")
+
+    # Pooled HTTP clients (one per provider, opened/closed by the API lifespan)
+    http_max_connections: int = Field(default=100, alias="HTTP_MAX_CONNECTIONS")
+    http_max_keepalive_connections: int = Field(default=20, alias="HTTP_MAX_KEEPALIVE_CONNECTIONS")
+    http_keepalive_expiry_seconds: float = Field(
+        default=30.0, alias="HTTP_KEEPALIVE_EXPIRY_SECONDS"
+    )
+    http_connect_timeout_seconds: float = Field(default=10.0, alias="HTTP_CONNECT_TIMEOUT_SECONDS")
     
     # API Server
     api_host: str = Field(default="0.0.0.0", alias="API_HOST")
     api_port: int = Field(default=8000, alias="API_PORT")
+    # Worker processes for `serve`; more than one requires CHROMA_MODE=http
+    api_workers: int = Field(default=1, alias="API_WORKERS")
     
     class Config:
         env_file = ".env"
@@ -89,12 +183,32 @@ class Settings(BaseSettings):
     def metadata_dir(self) -> Path:
         """Get metadata directory."""
         return self.embeddings_dir / "metadata"
-    
+
+    @property
+    def embedding_cache_path(self) -> Path:
+        """Get persistent embedding cache database path."""
+        return self.embeddings_dir / "embedding_cache.sqlite"
+
+    @property
+    def failed_embeddings_path(self) -> Path:
+        """Get dead-letter queue database path for chunks that failed to embed."""
+        return self.embeddings_dir / "failed_embeddings.sqlite"
+
+    @property
+    def document_registry_dir(self) -> Path:
+        """Get directory of the per-collection document registries (exact stats)."""
+        return self.embeddings_dir / "registry"
+
+    @property
+    def snapshots_dir(self) -> Path:
+        """Get default directory of exported index snapshots."""
+        return self.data_dir / "snapshots"
+
     @property
     def logs_dir(self) -> Path:
         """Get logs directory."""
         return self.project_root / "logs"
-        
+
     def ensure_directories(self) -> None:
         """Create necessary directories."""
         self.data_dir.mkdir(parents=True, exist_ok=True)
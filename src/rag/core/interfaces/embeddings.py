@@ -2,21 +2,23 @@
 Abstract interfaces for embedding providers.
 """
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any, Optional
+from collections.abc import Sequence
+from typing import Any
 from ..models.documents import DocumentChunk
+from ..models.embeddings import EmbeddingMatrix, EmbeddingVector, EmbeddingsLike
 
 
 class EmbeddingProvider(ABC):
     """Abstract interface for embedding providers."""
     
     @abstractmethod
-    async def embed_texts(self, texts: List[str]) -> List[List[float]]:
-        """Generate embeddings for a list of texts."""
+    async def embed_texts(self, texts: list[str]) -> EmbeddingMatrix:
+        """Generate an (n, dimension) float32 matrix; rows of texts that failed to embed are NaN."""
         pass
     
     @abstractmethod
-    async def embed_query(self, query: str) -> List[float]:
-        """Generate embedding for a single query."""
+    async def embed_query(self, query: str) -> EmbeddingVector:
+        """Generate a (dimension,) float32 embedding for a single query."""
         pass
     
     @property
@@ -31,40 +33,90 @@ class EmbeddingProvider(ABC):
         """Return the embedding dimension."""
         pass
 
+    def stats(self) -> dict[str, Any]:
+        """Return provider statistics (cache counters etc.), empty by default."""
+        return {}
+
+    async def open(self) -> None:  # noqa: B027
+        """Acquire long-lived resources (connection pools); no-op by default."""
+        pass
+
+    async def aclose(self) -> None:  # noqa: B027
+        """Release long-lived resources; no-op by default."""
+        pass
+
 
 class VectorStore(ABC):
     """Abstract interface for vector storage systems."""
     
+    # Stores that set this honour include_content=False and implement get_chunk_texts
+    supports_projection: bool = False
+
     @abstractmethod
     async def add_chunks(
         self,
-        chunks: List[DocumentChunk],
-        embeddings: List[List[float]],
-        doc_name: str
+        chunks: list[DocumentChunk],
+        embeddings: EmbeddingsLike,
+        doc_name: str,
+        embedding_model: str | None = None
     ) -> None:
-        """Add document chunks with their embeddings."""
+        """Add document chunks with their embeddings (float32 matrix or list of lists).
+
+        ``embedding_model`` is recorded by stores that keep a document registry.
+        """
         pass
     
     @abstractmethod
     async def search_similar(
         self,
-        query_embedding: List[float],
+        query_embedding: EmbeddingVector | Sequence[float],
         limit: int = 5,
-        filters: Optional[Dict[str, Any]] = None
-    ) -> List[Dict[str, Any]]:
+        filters: dict[str, Any] | None = None
+    ) -> list[dict[str, Any]]:
         """Search for similar chunks."""
         pass
     
+    async def search_similar_many(
+        self,
+        query_embeddings: EmbeddingMatrix | Sequence[Sequence[float]],
+        limit: int = 5,
+        filters: dict[str, Any] | None = None,
+        include_content: bool = True
+    ) -> list[list[dict[str, Any]]]:
+        """Search for several query vectors at once; one result list per query, in order.
+
+        Stores that can answer a batch in one pass override this; the default runs
+        ``search_similar`` per query. With ``include_content=False`` a store may leave
+        ``content`` as None (ids, scores and metadata only); fetch the text of the
+        results that survive ranking with ``get_chunk_texts``.
+        """
+        return [
+            await self.search_similar(query_embedding, limit=limit, filters=filters)
+            for query_embedding in query_embeddings
+        ]
+
+    async def get_chunk_texts(self, chunk_ids: Sequence[str]) -> dict[str, str]:
+        """Content of the given chunks by chunk id (missing ids are left out).
+
+        Only available on stores with ``supports_projection``.
+        """
+        raise NotImplementedError(f"{type(self).__name__} does not support content hydration")
+
     @abstractmethod
     async def delete_document(self, doc_id: str) -> None:
         """Delete all chunks for a document."""
         pass
     
     @abstractmethod
-    async def get_stats(self) -> Dict[str, Any]:
+    async def get_stats(self) -> dict[str, Any]:
         """Get collection statistics."""
         pass
 
+    @abstractmethod
+    def reset_collection(self) -> None:
+        """Delete everything in the collection (for development only)."""
+        pass
+
 
 class LLMProvider(ABC):
     """Abstract interface for LLM providers."""
@@ -73,7 +125,7 @@ class LLMProvider(ABC):
     async def generate(
         self,
         prompt: str,
-        model: Optional[str] = None,
+        model: str | None = None,
         temperature: float = 0.1,
         max_tokens: int = 500
     ) -> str:
@@ -82,6 +134,14 @@ class LLMProvider(ABC):
     
     @property
     @abstractmethod
-    def available_models(self) -> List[str]:
+    def available_models(self) -> list[str]:
         """Return list of available models."""
         pass
+
+    async def open(self) -> None:  # noqa: B027
+        """Acquire long-lived resources (connection pools); no-op by default."""
+        pass
+
+    async def aclose(self) -> None:  # noqa: B027
+        """Release long-lived resources; no-op by default."""
+        pass
@@ -6,6 +6,8 @@ from typing import List, Optional, Dict, Any
 from datetime import datetime
 from pydantic import BaseModel, Field
 
+from .embeddings import EmbeddingMatrix, as_embedding_matrix
+
 
 class DocumentChunk(BaseModel):
     """A chunk of document content with metadata."""
@@ -60,7 +62,10 @@ class SearchResponse(BaseModel):
     total_results: int = Field(ge=0)
     search_time_ms: float = Field(ge=0)
     model_used: Optional[str] = Field(default=None)
-    
+    extracted_entities: list[str] = Field(
+        default_factory=list
+    )  # Entity names from ER extraction (enhanced search)
+
     class Config:
         frozen = True
 
@@ -98,11 +103,12 @@ class DocumentEmbeddings:
     
     doc_id: str
     chunks: List[DocumentChunk] = field(default_factory=list)
-    embeddings: List[List[float]] = field(default_factory=list)
+    embeddings: EmbeddingMatrix = field(default_factory=lambda: as_embedding_matrix([]))
     total_tokens: int = 0
     created_at: datetime = field(default_factory=datetime.now)
     model_used: str = "unknown"
     
     def __post_init__(self):
+        self.embeddings = as_embedding_matrix(self.embeddings)
         if len(self.chunks) != len(self.embeddings):
             raise ValueError("Number of chunks must match number of embeddings")
@@ -0,0 +1,65 @@
+"""
+Embedding array types: embeddings travel as contiguous float32 NumPy arrays.
+
+``embed_texts`` returns an ``(n, dimension)`` matrix whose failed rows are NaN,
+``embed_query`` a ``(dimension,)`` vector. Vector stores accept these arrays as-is
+and still accept plain lists from older callers.
+"""
+
+from collections.abc import Sequence
+from typing import Any
+
+import numpy as np
+
+EMBEDDING_DTYPE = np.float32
+
+EmbeddingVector = np.ndarray  # (dimension,) float32
+EmbeddingMatrix = np.ndarray  # (n, dimension) float32, C-contiguous; NaN rows = failed
+
+EmbeddingsLike = np.ndarray | Sequence[np.ndarray | Sequence[float] | None]
+
+
+def as_embedding_matrix(
+    embeddings: EmbeddingsLike, dimension: int | None = None
+) -> EmbeddingMatrix:
+    """Convert embeddings to a contiguous float32 matrix without copying when already one.
+
+    Lists may contain None (or empty) entries for failed texts; those become NaN rows.
+    """
+    if isinstance(embeddings, np.ndarray):
+        matrix = np.ascontiguousarray(embeddings, dtype=EMBEDDING_DTYPE)
+        return matrix.reshape(1, -1) if matrix.ndim == 1 else matrix
+
+    rows = list(embeddings)
+    if dimension is None:
+        dimension = next((len(row) for row in rows if row is not None and len(row) > 0), 0)
+
+    if all(row is not None and len(row) == dimension for row in rows):
+        return np.asarray(rows, dtype=EMBEDDING_DTYPE).reshape(len(rows), dimension)
+
+    matrix = np.full((len(rows), dimension), np.nan, dtype=EMBEDDING_DTYPE)
+    for i, row in enumerate(rows):
+        if row is not None and len(row) == dimension and dimension > 0:
+            matrix[i] = row
+    return matrix
+
+
+def as_query_vector(embedding: Any) -> EmbeddingVector:
+    """Convert a single embedding to a 1-D float32 vector (no copy if already one)."""
+    return np.ascontiguousarray(embedding, dtype=EMBEDDING_DTYPE).reshape(-1)
+
+
+def failed_rows(embeddings: EmbeddingMatrix) -> np.ndarray:
+    """Boolean mask of rows that hold no usable embedding (NaN or all zeros)."""
+    if embeddings.ndim != 2 or embeddings.shape[1] == 0:
+        return np.ones(len(embeddings), dtype=bool)
+    mask: np.ndarray = np.isnan(embeddings).any(axis=1) | ~embeddings.any(axis=1)
+    return mask
+
+
+def is_valid_embedding(embedding: Any) -> bool:
+    """Whether a single embedding is usable (non-empty, finite, not all zeros)."""
+    if embedding is None:
+        return False
+    vector = np.asarray(embedding, dtype=EMBEDDING_DTYPE)
+    return vector.size > 0 and bool(np.isfinite(vector).all()) and bool(vector.any())
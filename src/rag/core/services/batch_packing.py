@@ -0,0 +1,84 @@
+"""
+Token-budget batch packing for embedding workloads.
+
+Shared by RAGService ingestion (Ollama) and the OCR pipeline's Mistral embedding
+runner, so this module only depends on tiktoken.
+"""
+
+from collections.abc import Sequence
+from functools import lru_cache
+from typing import Any
+
+try:
+    import tiktoken
+
+    TIKTOKEN_AVAILABLE = True
+except ImportError:
+    print("⚠️  tiktoken not available, estimating token counts from text length")
+    TIKTOKEN_AVAILABLE = False
+    tiktoken = None  # type: ignore[assignment]
+
+
+@lru_cache(maxsize=1)
+def get_token_encoder() -> Any | None:
+    """Return the shared cl100k_base encoder, or None if tiktoken can't load it."""
+    if not TIKTOKEN_AVAILABLE:
+        return None
+    try:
+        return tiktoken.get_encoding("cl100k_base")
+    except Exception:
+        return None
+
+
+class TokenBudgetPacker:
+    """Group texts into batches that stay under a per-request token budget.
+
+    Texts are sorted by token count before grouping, so one huge table chunk no
+    longer shares a request with dozens of tiny ones. ``pack`` returns batches of
+    original indices; callers map results back through them (the OCR runner
+    re-sorts by index, RAG ingestion inserts in packed order since chunk ids and
+    metadata, not insertion order, identify chunks in the vector store).
+    """
+
+    def __init__(
+        self,
+        max_tokens_per_batch: int = 8192,
+        max_items_per_batch: int = 64,
+        encoder: Any | None = None,
+    ):
+        if max_tokens_per_batch < 1 or max_items_per_batch < 1:
+            raise ValueError("Batch token budget and item limit must be positive")
+        self.max_tokens_per_batch = max_tokens_per_batch
+        self.max_items_per_batch = max_items_per_batch
+        self.encoder = encoder or get_token_encoder()
+
+    def count_tokens(self, text: str) -> int:
+        """Token count of a text (roughly 4 characters per token without tiktoken)."""
+        if self.encoder is not None:
+            return len(self.encoder.encode(text, disallowed_special=()))
+        return len(text) // 4 + 1
+
+    def pack(self, texts: Sequence[str]) -> list[list[int]]:
+        """Return index batches, shortest texts first; an oversized text gets its own batch."""
+        token_counts = [self.count_tokens(text) for text in texts]
+        order = sorted(range(len(texts)), key=lambda i: token_counts[i])
+
+        batches: list[list[int]] = []
+        current: list[int] = []
+        current_tokens = 0
+
+        for idx in order:
+            tokens = token_counts[idx]
+            if current and (
+                current_tokens + tokens > self.max_tokens_per_batch
+                or len(current) >= self.max_items_per_batch
+            ):
+                batches.append(current)
+                current = []
+                current_tokens = 0
+            current.append(idx)
+            current_tokens += tokens
+
+        if current:
+            batches.append(current)
+        return batches
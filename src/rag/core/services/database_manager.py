@@ -1,16 +1,19 @@
 """
 Database management service for ChromaDB reset and enhanced reloading.
 """
-import asyncio
-from typing import Dict, Any, Optional
-from pathlib import Path
+from typing import Any
 
-from ..models.documents import RAGQuery
-from .rag_service import RAGService
-from .document_loader import DocumentLoader
-from .medical_reasoning_workflow import TPNReasoningWorkflow
-from ...infrastructure.vector_stores.chroma_store import ChromaVectorStore
 from ...config.settings import settings
+from ..models.documents import RAGQuery, SearchQuery
+from .rag_service import RAGService
+
+# Each must return results from a rebuilt collection version before it is served
+SMOKE_QUERIES = [
+    "What is the normal sodium range for neonates?",
+    "What is the TPN dosage for premature infants?",
+    "How should refeeding syndrome be managed?",
+    "What are the contraindications for parenteral nutrition in neonates?",
+]
 
 
 class DatabaseManager:
@@ -22,27 +25,45 @@ class DatabaseManager:
         self.document_loader = DPT2DocumentLoader(rag_service)  # Use DPT2 loader (no re-chunking)
         self.medical_workflow = None  # Disabled - not needed for evaluation
     
-    async def reset_and_reload_enhanced(self, confirm: bool = False) -> Dict[str, Any]:
-        """Reset ChromaDB and reload with enhanced chunking strategies."""
+    async def reset_and_reload_enhanced(self, confirm: bool = False) -> dict[str, Any]:
+        """Reload with enhanced chunking into a new collection version, then switch to it."""
         
         if not confirm:
             return {
                 "status": "confirmation_required",
-                "message": "This will delete all existing embeddings and reload with enhanced processing",
-                "action_required": "Call with confirm=True to proceed"
+                "message": (
+                    "This will re-embed all documents into a new collection version "
+                    "and switch to it"
+                ),
+                "action_required": "Call with confirm=True to proceed",
             }
         
-        print("🚨 RESETTING CHROMADB AND RELOADING WITH ENHANCED PROCESSING")
+        print("🚨 REBUILDING CHROMADB WITH ENHANCED PROCESSING")
         print("=" * 70)
         
         try:
-            # Step 1: Reset ChromaDB collection
-            print("🗑️  Step 1: Resetting ChromaDB collection...")
-            await self._reset_chromadb_collection()
-            
-            # Step 2: Load documents with enhanced processing
-            print("🚀 Step 2: Loading documents with enhanced chunking...")
-            load_results = await self.document_loader.load_all_documents()
+            vector_store = self.rag_service.vector_store
+            if hasattr(vector_store, "create_version"):
+                # Steps 1-2: Build and validate a new version while the live one keeps serving
+                print("🏗️  Step 1: Building a new collection version...")
+                load_results, switch_results = await self._rebuild_into_new_version(vector_store)
+                if switch_results["status"] != "promoted":
+                    return {
+                        "status": "error",
+                        "message": (
+                            f"New collection version failed validation: {switch_results['reason']}"
+                        ),
+                        "loading_results": load_results,
+                        "switch_results": switch_results,
+                    }
+            else:
+                # Stores without versions can only be emptied and reloaded in place
+                print("🗑️  Step 1: Resetting vector store collection...")
+                await self._reset_chromadb_collection()
+
+                print("🚀 Step 2: Loading documents with enhanced chunking...")
+                load_results = await self.document_loader.load_all_documents()
+                switch_results = {"status": "reset_in_place"}
             
             # Step 3: Verify the new system
             print("✅ Step 3: Verifying enhanced system...")
@@ -56,6 +77,7 @@ class DatabaseManager:
                 "status": "success",
                 "reset_completed": True,
                 "loading_results": load_results,
+                "switch_results": switch_results,
                 "verification_results": verification_results,
                 "test_results": test_results,
                 "enhanced_features": [
@@ -81,28 +103,129 @@ class DatabaseManager:
             }
             print(f"❌ Error during reset and reload: {e}")
             return error_result
-    
-    async def _reset_chromadb_collection(self) -> None:
-        """Reset the ChromaDB collection."""
+
+    async def rollback(self) -> dict[str, Any]:
+        """Switch back to the previously active collection version."""
+        vector_store = self.rag_service.vector_store
+        if not hasattr(vector_store, "rollback"):
+            return {
+                "status": "error",
+                "message": f"{type(vector_store).__name__} has no collection versions",
+            }
+        try:
+            active = vector_store.rollback()
+            return {"status": "success", "active_version": active}
+        except Exception as e:
+            print(f"❌ Rollback failed: {e}")
+            return {"status": "error", "message": str(e)}
+
+    async def _rebuild_into_new_version(
+        self, vector_store: Any
+    ) -> tuple[dict[str, Any], dict[str, Any]]:
+        """Load every document into a new collection version, smoke-test it, then switch to it.
+
+        Searches keep hitting the live version until the switch. Documents added to the
+        live version while the rebuild runs are not copied over.
+        """
+        live_stats = await vector_store.get_stats()
+        version = vector_store.create_version()
+        print(
+            f"📦 Building {version.collection_name} "
+            f"(serving {vector_store.collection_name} meanwhile)"
+        )
+
+        version_service = RAGService(
+            embedding_provider=self.rag_service.embedding_provider,
+            vector_store=version,
+            llm_provider=self.rag_service.llm_provider,
+            failed_embeddings=self.rag_service.failed_embeddings
+        )
+        try:
+            from .dpt2_document_loader import DPT2DocumentLoader
+            print("🚀 Step 2: Loading documents with enhanced chunking...")
+            load_results = await DPT2DocumentLoader(version_service).load_all_documents()
+
+            print("🔎 Smoke-testing the new version...")
+            validation = await self._validate_version(version_service, live_stats["total_chunks"])
+        except Exception:
+            vector_store.discard_version(version)
+            self.rag_service.failed_embeddings.remove_collections([version.collection_name])
+            raise
+
+        if not validation["passed"]:
+            print(
+                f"❌ {version.collection_name} failed validation ({validation['reason']}) "
+                f"- still serving {vector_store.collection_name}"
+            )
+            vector_store.discard_version(version)
+            self.rag_service.failed_embeddings.remove_collections([version.collection_name])
+            return load_results, {
+                "status": "discarded",
+                "version": version.collection_name,
+                **validation,
+            }
+
+        replaced = vector_store.promote(version)
+        removed = vector_store.garbage_collect()
+        self.rag_service.failed_embeddings.remove_collections(removed)
+        return load_results, {
+            "status": "promoted",
+            "version": vector_store.collection_name,
+            "replaced": replaced,
+            "garbage_collected": removed,
+            **validation
+        }
+
+    async def _validate_version(
+        self, version_service: RAGService, live_chunks: int
+    ) -> dict[str, Any]:
+        """Chunk count against the live version plus one vector search per smoke query."""
+        stats = await version_service.vector_store.get_stats()
+        min_chunks = max(1, int(live_chunks * settings.reindex_min_chunk_ratio))
+        if stats["total_chunks"] < min_chunks:
+            return {
+                "passed": False,
+                "reason": f"{stats['total_chunks']} chunks, expected at least {min_chunks}",
+                "total_chunks": stats["total_chunks"]
+            }
         
+        # Plain vector search: validating a version must not depend on the ER-extraction LLM
+        query_embeddings = await version_service.embedding_provider.embed_texts(list(SMOKE_QUERIES))
+        results = await version_service.vector_store.search_similar_many(
+            query_embeddings, limit=3, include_content=False
+        )
+        empty = [q for q, hits in zip(SMOKE_QUERIES, results, strict=True) if not hits]
+        if empty:
+            return {
+                "passed": False,
+                "reason": f"no results for: {'; '.join(empty)}",
+                "total_chunks": stats["total_chunks"],
+            }
+        return {
+            "passed": True,
+            "total_chunks": stats["total_chunks"],
+            "smoke_queries": len(SMOKE_QUERIES),
+        }
+
+    async def _reset_chromadb_collection(self) -> None:
+        """Empty the vector store in place (stores without collection versions)."""
+
         try:
             # Access the vector store directly
             vector_store = self.rag_service.vector_store
-            
-            if isinstance(vector_store, ChromaVectorStore):
-                # Reset the collection
-                vector_store.reset_collection()
-                print("✅ ChromaDB collection reset successfully")
-            else:
-                raise RuntimeError("Vector store is not ChromaVectorStore - cannot reset")
-                
+
+            # Reset the collection
+            vector_store.reset_collection()
+            self.rag_service.failed_embeddings.clear()  # Everything is re-embedded on reload
+            print("✅ Vector store collection reset successfully")
+
         except Exception as e:
-            print(f"❌ Failed to reset ChromaDB: {e}")
+            print(f"❌ Failed to reset vector store: {e}")
             raise
-    
-    async def _verify_enhanced_system(self) -> Dict[str, Any]:
+
+    async def _verify_enhanced_system(self) -> dict[str, Any]:
         """Verify the enhanced system is working correctly."""
-        
+
         verification_results = {
             "chromadb_stats": {},
             "embedding_test": False,
@@ -110,12 +233,12 @@ class DatabaseManager:
             "prompt_templates": False,
             "workflow_test": False
         }
-        
+
         try:
             # Check ChromaDB stats
             stats = await self.rag_service.get_collection_stats()
             verification_results["chromadb_stats"] = stats
-            
+
             if stats["total_chunks"] > 0:
                 print(f"✅ ChromaDB loaded: {stats['total_chunks']} chunks from {stats['total_documents']} documents")
             else:
@@ -125,14 +248,14 @@ class DatabaseManager:
             test_text = "What is the normal sodium range for neonates?"
             try:
                 embedding = await self.rag_service.embedding_provider.embed_query(test_text)
-                if embedding and len(embedding) > 0:
+                if len(embedding) > 0:
                     verification_results["embedding_test"] = True
                     print("✅ Embedding system working")
                 else:
                     raise RuntimeError("Empty embedding generated")
             except Exception as e:
                 print(f"❌ Embedding test failed: {e}")
-            
+
             # Test search system
             from ..models.documents import SearchQuery
             try:
@@ -146,19 +269,19 @@ class DatabaseManager:
                     raise RuntimeError("No search results returned")
             except Exception as e:
                 print(f"❌ Search test failed: {e}")
-            
+
             # Test prompt templates
             try:
                 from .medical_prompt_templates import MedicalPromptEngine, QuestionType
                 prompt_engine = MedicalPromptEngine()
-                
+
                 # Test different question types
                 test_questions = [
                     ("What is the TPN dosage for premature infants?", QuestionType.DOSAGE_CALCULATION),
                     ("What are normal electrolyte ranges?", QuestionType.REFERENCE_VALUES),
                     ("How should refeeding syndrome be managed?", QuestionType.PROTOCOL_QUESTION)
                 ]
-                
+
                 all_templates_work = True
                 for question, qtype in test_questions:
                     try:
@@ -171,16 +294,16 @@ class DatabaseManager:
                             all_templates_work = False
                     except Exception:
                         all_templates_work = False
-                
+
                 if all_templates_work:
                     verification_results["prompt_templates"] = True
                     print("✅ Medical prompt templates working")
                 else:
                     print("⚠️  Some prompt templates may have issues")
-                    
+
             except Exception as e:
                 print(f"❌ Prompt template test failed: {e}")
-            
+
             # Test workflow system
             try:
                 workflow = self.medical_workflow
@@ -191,31 +314,31 @@ class DatabaseManager:
                     print("⚠️  Workflow system not properly initialized")
             except Exception as e:
                 print(f"❌ Workflow test failed: {e}")
-            
+
         except Exception as e:
             print(f"❌ System verification failed: {e}")
-            
+
         return verification_results
-    
-    async def _run_system_tests(self) -> Dict[str, Any]:
+
+    async def _run_system_tests(self) -> dict[str, Any]:
         """Run comprehensive system tests."""
-        
+
         test_results = {
             "basic_rag_test": {"passed": False, "response": ""},
             "medical_workflow_test": {"passed": False, "response": ""},
             "conflict_detection_test": {"passed": False, "conflicts": []},
             "prompt_quality_test": {"passed": False, "score": 0.0}
         }
-        
+
         # Test 1: Basic RAG functionality
         try:
             print("🧪 Testing basic RAG functionality...")
-            
+
             basic_query = RAGQuery(
                 question="What is the normal potassium range for adults?",
                 search_limit=3
             )
-            
+
             response = await self.rag_service.ask(basic_query)
             
             if (response.answer and 
@@ -226,14 +349,14 @@ class DatabaseManager:
                 print("✅ Basic RAG test passed")
             else:
                 print("❌ Basic RAG test failed - insufficient response")
-                
+
         except Exception as e:
             print(f"❌ Basic RAG test error: {e}")
-        
+
         # Test 2: Medical workflow
         try:
             print("🧪 Testing medical reasoning workflow...")
-            
+
             workflow_response = await self.medical_workflow.process_medical_question(
                 "What are the contraindications for parenteral nutrition in neonates?"
             )
@@ -246,7 +369,7 @@ class DatabaseManager:
                 print("✅ Medical workflow test passed")
             else:
                 print("❌ Medical workflow test failed")
-                
+
         except Exception as e:
             print(f"❌ Medical workflow test error: {e}")
         
@@ -260,45 +383,45 @@ class DatabaseManager:
             
         except Exception as e:
             print(f"❌ Conflict detection test error: {e}")
-        
+
         # Test 4: Prompt quality assessment
         try:
             print("🧪 Testing prompt quality...")
             
             from .medical_prompt_templates import MedicalPromptEngine, QuestionType
             prompt_engine = MedicalPromptEngine()
-            
+
             test_prompt = prompt_engine.generate_medical_prompt(
                 question="Calculate TPN protein requirements for a 2kg neonate",
                 sources=[],
                 question_type=QuestionType.DOSAGE_CALCULATION
             )
-            
+
             # Simple quality checks
             quality_score = 0.0
             if "calculate" in test_prompt.lower(): quality_score += 0.25
             if "clinical" in test_prompt.lower(): quality_score += 0.25
             if "sources" in test_prompt.lower(): quality_score += 0.25
             if len(test_prompt) > 500: quality_score += 0.25
-            
+
             test_results["prompt_quality_test"]["score"] = quality_score
             if quality_score >= 0.75:
                 test_results["prompt_quality_test"]["passed"] = True
                 print(f"✅ Prompt quality test passed (score: {quality_score:.2f})")
             else:
                 print(f"⚠️  Prompt quality needs improvement (score: {quality_score:.2f})")
-                
+
         except Exception as e:
             print(f"❌ Prompt quality test error: {e}")
-        
+
         return test_results
-    
-    async def get_enhanced_system_status(self) -> Dict[str, Any]:
+
+    async def get_enhanced_system_status(self) -> dict[str, Any]:
         """Get comprehensive status of the enhanced system."""
-        
+
         try:
             stats = await self.rag_service.get_collection_stats()
-            
+
             # Sample some chunks to analyze enhancement features
             search_query = SearchQuery(
                 query="sample query for analysis",
@@ -317,7 +440,7 @@ class DatabaseManager:
                 strategy = result.chunk.metadata.get("chunk_strategy", "unknown")
                 content_type = result.chunk.metadata.get("content_type", "general")
                 doc_type = result.chunk.metadata.get("document_type", "unknown")
-                
+
                 chunk_analysis["strategies_used"].add(strategy)
                 chunk_analysis["content_types"].add(content_type)
                 chunk_analysis["document_types"].add(doc_type)
@@ -326,7 +449,7 @@ class DatabaseManager:
             chunk_analysis["strategies_used"] = list(chunk_analysis["strategies_used"])
             chunk_analysis["content_types"] = list(chunk_analysis["content_types"])
             chunk_analysis["document_types"] = list(chunk_analysis["document_types"])
-            
+
             status = {
                 "system_status": "enhanced",
                 "database_stats": stats,
@@ -341,15 +464,15 @@ class DatabaseManager:
                 "embedding_model": self.rag_service.embedding_provider.model_name,
                 "llm_models": await self._get_available_models()
             }
-            
+
             return status
-            
+
         except Exception as e:
             return {
                 "system_status": "error",
                 "error": str(e)
             }
-    
+
     async def _get_available_models(self) -> list:
         """Get available LLM models."""
         try:
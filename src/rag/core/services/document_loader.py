@@ -7,9 +7,9 @@ import re
 from pathlib import Path
 from typing import List, Dict, Any, Optional
 from langchain_text_splitters import RecursiveCharacterTextSplitter, MarkdownTextSplitter
-import tiktoken  # For token counting
 
 from ..models.documents import DocumentChunk
+from .batch_packing import get_token_encoder  # For token counting
 from ...config.settings import settings
 
 
@@ -37,10 +37,7 @@ class DocumentLoader:
         )
         
         # Initialize token counter for medical content
-        try:
-            self.tokenizer = tiktoken.get_encoding("cl100k_base")
-        except Exception:
-            self.tokenizer = None  # Fallback to len() if tiktoken fails
+        self.tokenizer = get_token_encoder()  # None -> fallback to len() if tiktoken fails
     
     async def load_all_documents(self) -> Dict[str, Any]:
         """Load all parsed documents into the vector store."""
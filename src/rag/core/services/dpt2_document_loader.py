@@ -7,13 +7,15 @@ This loader:
 - Maintains chunk UUIDs, types, page numbers, and bounding boxes
 - Passes chunks directly to embeddings without modification
 """
+import functools
 import json
 import re
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import Any
 
-from ..models.documents import DocumentChunk
 from ...config.settings import settings
+from ..models.documents import DocumentChunk
+from .ingestion_pipeline import IngestionPipeline
 
 
 class DPT2DocumentLoader:
@@ -27,7 +29,7 @@ class DPT2DocumentLoader:
         if not self.dpt2_dir.exists():
             raise ValueError(f"DPT2 output directory not found: {self.dpt2_dir}")
     
-    async def load_all_documents(self) -> Dict[str, Any]:
+    async def load_all_documents(self) -> dict[str, Any]:
         """Load all DPT2 JSON documents into the vector store."""
         print("Loading DPT2 pre-chunked documents into vector store...")
         
@@ -40,44 +42,48 @@ class DPT2DocumentLoader:
         
         print(f"Found {len(json_files)} DPT2 documents")
         
+        # Documents stream through chunk -> embed -> insert stages instead of one at a time
+        sources = [
+            (
+                json_file.stem.replace("_response", ""),
+                functools.partial(self._load_document_chunks, json_file),
+            )
+            for json_file in json_files
+        ]
+        report = await IngestionPipeline(self.rag_service).run(sources)
+        IngestionPipeline.print_report(report)
+
         loaded_count = 0
         failed_count = 0
-        total_chunks = 0
-        
-        for i, json_file in enumerate(json_files, 1):
-            try:
-                print(f"Processing document {i}/{len(json_files)}: {json_file.stem}")
-                
-                # Load document chunks (as-is, no re-chunking)
-                chunks = await self._load_document_chunks(json_file)
-                
-                if chunks:
-                    doc_name = json_file.stem.replace("_response", "")
-                    print(f"Adding {len(chunks)} pre-chunked pieces to ChromaDB...")
-                    await self.rag_service.add_document_chunks(chunks, doc_name)
-                    loaded_count += 1
-                    total_chunks += len(chunks)
-                    print(f"Loaded {len(chunks)} chunks from {doc_name}")
-                    print(f"Progress: {i}/{len(json_files)} docs, {total_chunks} total chunks")
-                else:
-                    print(f"No chunks found in {json_file.name}")
-                    
-            except Exception as e:
+        for doc_name, progress in report["documents"].items():
+            if progress["error"]:
                 failed_count += 1
-                print(f"Failed to load {json_file.name}: {e}")
-                import traceback
-                print(f"Error details: {traceback.format_exc()}")
+                print(f"Failed to load {doc_name}: {progress['error']}")
+            elif progress["added"] or progress["queued_for_retry"]:
+                loaded_count += 1
+            else:
+                print(f"No chunks found for {doc_name}")
         
         result = {
             "loaded": loaded_count,
             "failed": failed_count,
-            "total_chunks": total_chunks
+            "total_chunks": report["added"],
+            "queued_for_retry": report["queued_for_retry"],
+            "pipeline": {
+                "wall_s": report["wall_s"],
+                "bottleneck": report["bottleneck"],
+                "stages": report["stages"],
+            },
         }
         
+        provider_stats = self.rag_service.embedding_provider.stats()
+        if "embedding_cache" in provider_stats:
+            result["embedding_cache"] = provider_stats["embedding_cache"]
+
         print(f"Loading complete: {result}")
         return result
-    
-    async def _load_document_chunks(self, json_file: Path) -> List[DocumentChunk]:
+
+    async def _load_document_chunks(self, json_file: Path) -> list[DocumentChunk]:
         """Load chunks from DPT2 JSON file WITHOUT re-chunking."""
         try:
             with open(json_file, 'r', encoding='utf-8') as f:
@@ -102,7 +108,7 @@ class DPT2DocumentLoader:
         
         # Convert DPT2 chunks to DocumentChunk objects
         document_chunks = []
-        
+
         for i, chunk in enumerate(chunks):
             # Extract chunk data
             chunk_id = chunk.get('id', f"chunk_{i}")
@@ -141,7 +147,7 @@ class DPT2DocumentLoader:
                 section=self._extract_section(cleaned_content),
                 metadata=chunk_metadata
             )
-            
+
             document_chunks.append(doc_chunk)
         
         print(f"  Created {len(document_chunks)} DocumentChunks (filtered from {len(chunks)})")
@@ -153,9 +159,9 @@ class DPT2DocumentLoader:
             type_counts[ctype] = type_counts.get(ctype, 0) + 1
         
         print(f"  Chunk types: {type_counts}")
-        
-        return document_chunks
     
+        return document_chunks
+
     def _clean_chunk_content(self, markdown: str) -> str:
         """Clean chunk markdown for better embedding."""
         # Remove anchor tags
@@ -168,9 +174,9 @@ class DPT2DocumentLoader:
         content = re.sub(r'<::', '', content)
         content = re.sub(r'::>', '', content)
         content = re.sub(r': figure::', '', content)
-        
-        return content.strip()
     
+        return content.strip()
+
     def _extract_section(self, content: str) -> str:
         """Extract section/heading from chunk content."""
         lines = content.split('\n')[:5]
@@ -189,31 +195,32 @@ class DPT2DocumentLoader:
             line = line.strip()
             if len(line) > 20 and not line.startswith('<'):
                 return line[:100]
-        
-        return "Medical Content"
     
-    async def load_single_document(self, filename: str) -> Optional[Dict[str, Any]]:
+        return "Medical Content"
+
+    async def load_single_document(self, filename: str) -> dict[str, Any] | None:
         """Load a single DPT2 document by filename."""
         # Find the JSON file
         json_file = self.dpt2_dir / f"{filename}_response.json"
-        
+
         if not json_file.exists():
             # Try without _response suffix
             json_file = self.dpt2_dir / f"{filename}.json"
-            
+
         if not json_file.exists():
             print(f"Document not found: {filename}")
             return None
-        
+
         try:
             chunks = await self._load_document_chunks(json_file)
-            
+
             if chunks:
                 doc_name = filename.replace("_response", "")
-                await self.rag_service.add_document_chunks(chunks, doc_name)
+                added = await self.rag_service.add_document_chunks(chunks, doc_name)
                 return {
                     "document": doc_name,
-                    "chunks_loaded": len(chunks),
+                    "chunks_loaded": added["added"],
+                    "queued_for_retry": added["queued_for_retry"],
                     "status": "success"
                 }
             else:
@@ -231,12 +238,12 @@ class DPT2DocumentLoader:
                 "error": str(e)
             }
     
-    def get_available_documents(self) -> List[str]:
+    def get_available_documents(self) -> list[str]:
         """Get list of available DPT2 documents."""
         json_files = list(self.dpt2_dir.glob("*_response.json"))
         return [f.stem.replace("_response", "") for f in json_files]
     
-    def get_document_info(self, filename: str) -> Optional[Dict[str, Any]]:
+    def get_document_info(self, filename: str) -> dict[str, Any] | None:
         """Get metadata about a specific document."""
         json_file = self.dpt2_dir / f"{filename}_response.json"
         
@@ -264,6 +271,7 @@ class DPT2DocumentLoader:
                 "page_count": metadata.get('page_count', 0),
                 "total_chunks": len(chunks),
                 "chunk_types": chunk_types,
+
                 "version": metadata.get('version', 'unknown'),
                 "processing_time_ms": metadata.get('duration_ms', 0),
             }
@@ -271,4 +279,3 @@ class DPT2DocumentLoader:
         except Exception as e:
             print(f"Failed to get document info: {e}")
             return None
-
@@ -328,17 +328,20 @@ class HybridRAGService(RAGService):
         # STEP 3: Search with all queries (Vector + BM25 for each)
         all_ranked_lists = []  # For RRF fusion
         
+        # 3A: Vector Search (semantic) - get more candidates; all variants in one batched search
         for i, q in enumerate(queries_to_search, 1):
             print(f"  🔎 Query variant {i}/{len(queries_to_search)}: {q[:60]}...")
-            
-            # 3A: Vector Search (semantic) - get more candidates
-            sub_query = SearchQuery(
+        sub_queries = [
+            SearchQuery(
                 query=q,
                 limit=50,  # Get 50 for both vector and BM25 to work with
                 filters=query.filters
             )
-            vector_results = await super().search(sub_query)
-            
+            for q in queries_to_search
+        ]
+        variant_results = await super().search_many(sub_queries)
+
+        for q, vector_results in zip(queries_to_search, variant_results, strict=True):
             # 3B: BM25 Search (keyword) - rerank the SAME chunks from vector search
             bm25_results = []
             if self.advanced_2025 and self.advanced_2025.config.enable_bm25_hybrid:
@@ -418,8 +421,11 @@ class HybridRAGService(RAGService):
         )
         
         # STEP 5: Neo4j Graph Search (if enabled - disabled by default)
-        if self.neo4j_enabled and hasattr(self, '_last_extracted_entities'):
-            entities = self._last_extracted_entities
+        if self.neo4j_enabled:
+            # Entities extracted for each query variant, the original query's first
+            entities = list(dict.fromkeys(
+                entity for response in variant_results for entity in response.extracted_entities
+            ))
             
             if entities:
                 print(f"🔍 Graph search for entities: {entities[:3]}")
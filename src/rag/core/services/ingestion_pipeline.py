@@ -0,0 +1,207 @@
+"""
+Streaming chunk -> embed -> insert pipeline for document ingestion.
+"""
+
+import asyncio
+import time
+from collections.abc import Awaitable, Callable, Sequence
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+from ...config.settings import settings
+from ..models.documents import DocumentChunk
+from ..models.embeddings import EmbeddingMatrix
+
+if TYPE_CHECKING:
+    from .rag_service import RAGService
+
+# A document to ingest: its name and a coroutine factory that produces its chunks
+DocumentSource = tuple[str, Callable[[], Awaitable[list[DocumentChunk]]]]
+
+_DONE = object()  # Queue sentinel
+
+
+@dataclass
+class StageStats:
+    """Work and wait time of one pipeline stage."""
+
+    items: int = 0
+    chunks: int = 0
+    busy_seconds: float = 0.0
+    blocked_seconds: float = 0.0  # Waiting for room in the next stage's queue (backpressure)
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "items": self.items,
+            "chunks": self.chunks,
+            "busy_s": round(self.busy_seconds, 2),
+            "blocked_s": round(self.blocked_seconds, 2),
+            "chunks_per_s": (
+                round(self.chunks / self.busy_seconds, 1) if self.busy_seconds > 0 else None
+            ),
+        }
+
+
+@dataclass
+class DocumentProgress:
+    """Per-document outcome."""
+
+    added: int = 0
+    queued_for_retry: int = 0
+    error: str | None = None
+
+
+@dataclass
+class _Batch:
+    doc_name: str
+    chunks: list[DocumentChunk]
+    embeddings: EmbeddingMatrix | None = None
+
+
+class IngestionPipeline:
+    """Overlaps chunk loading, embedding and vector-store insertion.
+
+    Stages are connected by bounded queues, so a slow stage applies backpressure
+    instead of letting work pile up in memory. Several embedding workers keep the
+    embedding backend busy while a single writer inserts into the vector store.
+    Chunks that fail to embed or insert go to the RAG service's failed-embedding
+    queue, exactly like ``RAGService.add_document_chunks``.
+    """
+
+    def __init__(
+        self,
+        rag_service: "RAGService",
+        embed_workers: int | None = None,
+        queue_size: int | None = None,
+    ) -> None:
+        self.rag_service = rag_service
+        self.embed_workers = max(1, embed_workers or settings.ingest_embed_workers)
+        self.queue_size = max(1, queue_size or settings.ingest_queue_size)
+
+    async def run(self, sources: Sequence[DocumentSource]) -> dict[str, Any]:
+        """Ingest all documents; returns per-document results and per-stage throughput."""
+        embed_queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        insert_queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        stats = {"chunk": StageStats(), "embed": StageStats(), "insert": StageStats()}
+        documents: dict[str, DocumentProgress] = {}
+        started = time.perf_counter()
+
+        async def put(queue: asyncio.Queue, item: Any, stage: StageStats) -> None:
+            wait_started = time.perf_counter()
+            await queue.put(item)
+            stage.blocked_seconds += time.perf_counter() - wait_started
+
+        async def chunk_stage() -> None:
+            try:
+                for doc_name, load_chunks in sources:
+                    progress = documents.setdefault(doc_name, DocumentProgress())
+                    work_started = time.perf_counter()
+                    try:
+                        chunks = await load_chunks()
+                    except Exception as e:
+                        progress.error = str(e)
+                        print(f"❌ Failed to load {doc_name}: {e}")
+                        continue
+                    batches = self.rag_service.batch_packer.pack(
+                        [chunk.content for chunk in chunks]
+                    )
+                    stats["chunk"].busy_seconds += time.perf_counter() - work_started
+                    stats["chunk"].items += 1
+                    stats["chunk"].chunks += len(chunks)
+
+                    for batch_indices in batches:
+                        await put(
+                            embed_queue,
+                            _Batch(doc_name, [chunks[idx] for idx in batch_indices]),
+                            stats["chunk"],
+                        )
+            finally:
+                for _ in range(self.embed_workers):
+                    await embed_queue.put(_DONE)
+
+        async def embed_stage() -> None:
+            while True:
+                batch = await embed_queue.get()
+                if batch is _DONE:
+                    return
+                work_started = time.perf_counter()
+                ok_chunks, ok_embeddings, failed = await self.rag_service._embed_batch(
+                    batch.chunks, batch.doc_name
+                )
+                stats["embed"].busy_seconds += time.perf_counter() - work_started
+                stats["embed"].items += 1
+                stats["embed"].chunks += len(batch.chunks)
+                documents[batch.doc_name].queued_for_retry += failed
+
+                if ok_chunks:
+                    await put(
+                        insert_queue,
+                        _Batch(batch.doc_name, ok_chunks, ok_embeddings),
+                        stats["embed"],
+                    )
+
+        async def insert_stage() -> None:
+            while True:
+                batch = await insert_queue.get()
+                if batch is _DONE:
+                    return
+                work_started = time.perf_counter()
+                added, failed = await self.rag_service._insert_batch(
+                    batch.chunks, batch.embeddings, batch.doc_name
+                )
+                stats["insert"].busy_seconds += time.perf_counter() - work_started
+                stats["insert"].items += 1
+                stats["insert"].chunks += len(batch.chunks)
+                documents[batch.doc_name].added += added
+                documents[batch.doc_name].queued_for_retry += failed
+
+        async def embed_stages() -> None:
+            try:
+                await asyncio.gather(*(embed_stage() for _ in range(self.embed_workers)))
+            finally:
+                await insert_queue.put(_DONE)
+
+        tasks = [
+            asyncio.create_task(stage()) for stage in (chunk_stage, embed_stages, insert_stage)
+        ]
+        try:
+            await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()  # Don't leave the other stages blocked on a queue
+            raise
+
+        wall_seconds = time.perf_counter() - started
+        stage_stats = {name: stage.as_dict() for name, stage in stats.items()}
+        # Embedding busy time is summed over workers; normalize before comparing stages
+        effective_busy = {
+            "chunk": stats["chunk"].busy_seconds,
+            "embed": stats["embed"].busy_seconds / self.embed_workers,
+            "insert": stats["insert"].busy_seconds,
+        }
+        return {
+            "documents": {
+                name: {"added": p.added, "queued_for_retry": p.queued_for_retry, "error": p.error}
+                for name, p in documents.items()
+            },
+            "added": sum(p.added for p in documents.values()),
+            "queued_for_retry": sum(p.queued_for_retry for p in documents.values()),
+            "wall_s": round(wall_seconds, 2),
+            "stages": stage_stats,
+            "bottleneck": (
+                max(effective_busy, key=effective_busy.__getitem__) if wall_seconds > 0 else None
+            ),
+        }
+
+    @staticmethod
+    def print_report(report: dict[str, Any]) -> None:
+        """Print per-stage throughput so the slowest stage is visible."""
+        print(
+            f"📈 Ingestion pipeline: {report['added']} chunks in {report['wall_s']}s "
+            f"(bottleneck: {report['bottleneck']})"
+        )
+        for name, stage in report["stages"].items():
+            print(
+                f"   {name:<7} {stage['chunks']:>6} chunks  busy {stage['busy_s']:>7}s  "
+                f"blocked {stage['blocked_s']:>7}s  {stage['chunks_per_s'] or '-'} chunks/s"
+            )
@@ -5,6 +5,7 @@ Modern LangChain/LangGraph integration for maximum accuracy.
 import time
 import asyncio
 import json
+from collections.abc import Awaitable, Callable
 from typing import List, Optional, Dict, Any, Tuple
 from langchain_core.prompts import ChatPromptTemplate, FewShotChatMessagePromptTemplate
 from langchain_core.output_parsers import StrOutputParser, JsonOutputParser
@@ -16,6 +17,11 @@ from ..models.documents import (
     RAGQuery, RAGResponse
 )
 from ..interfaces.embeddings import EmbeddingProvider, VectorStore, LLMProvider
+from ..models.embeddings import EmbeddingMatrix, as_embedding_matrix, failed_rows
+from .batch_packing import TokenBudgetPacker
+from .ingestion_pipeline import IngestionPipeline
+from ...infrastructure.dead_letter_queue import FailedEmbeddingQueue
+from ...config.settings import settings
 
 
 class TPNAnswer(LangChainBaseModel):
@@ -32,11 +38,17 @@ class RAGService:
         self,
         embedding_provider: EmbeddingProvider,
         vector_store: VectorStore,
-        llm_provider: LLMProvider
+        llm_provider: LLMProvider,
+        failed_embeddings: FailedEmbeddingQueue | None = None
     ):
         self.embedding_provider = embedding_provider
         self.vector_store = vector_store
         self.llm_provider = llm_provider
+        self.failed_embeddings = failed_embeddings or FailedEmbeddingQueue()
+        self.batch_packer = TokenBudgetPacker(
+            max_tokens_per_batch=settings.embed_batch_token_budget,
+            max_items_per_batch=settings.embed_batch_max_items
+        )
         
         # Initialize enhanced search capabilities
         self.er_graph = self._build_er_extraction_graph()
@@ -99,69 +111,164 @@ class RAGService:
             search_time_ms=search_time_ms,
             model_used=self.embedding_provider.model_name
         )
-    
+
+    async def search_many(self, queries: list[SearchQuery]) -> list[SearchResponse]:
+        """Search several queries; enhanced searches share one batched vector store call."""
+        enhanced = [
+            i for i, query in enumerate(queries) if query.filters.get("enhanced_search", True)
+        ]
+        responses: list[SearchResponse | None] = [None] * len(queries)
+
+        if enhanced:
+            for i, response in zip(
+                enhanced,
+                await self.enhanced_tpn_search_many([queries[i] for i in enhanced]),
+                strict=True,
+            ):
+                responses[i] = response
+        return [
+            response if response is not None else await self.basic_search(query)
+            for query, response in zip(queries, responses, strict=True)
+        ]
+
     async def enhanced_tpn_search(self, query: SearchQuery) -> SearchResponse:
         """Enhanced multi-strategy search with ER extraction."""
+        return (await self.enhanced_tpn_search_many([query]))[0]
+
+    async def enhanced_tpn_search_many(self, queries: list[SearchQuery]) -> list[SearchResponse]:
+        """Enhanced multi-strategy search for several queries.
+
+        Strategies that only need the query text (original, semantic expansion) start
+        right away and overlap ER extraction; the ER-derived ones (enhanced,
+        entity-focused) follow as soon as extraction finishes. Each strategy runs as
+        one batched search over all queries, concurrently with the others under a
+        per-request cap and bounded by a timeout; results are merged in strategy
+        order whatever order they complete in.
+        """
+        if not queries:
+            return []
         
         start_time = time.time()
         
-        print(f"🔍 Enhanced TPN Search: {query.query}")
-        
-        # Step 1: Extract entities and relationships
-        er_data = await self.extract_query_er(query.query)
+        for query in queries:
+            print(f"🔍 Enhanced TPN Search: {query.query}")
+
+        limit = max(query.limit for query in queries)
+        semaphore = asyncio.Semaphore(max(1, settings.strategy_search_concurrency))
+
+        # Strategies 1 and 4: independent of ER extraction
+        base_plans = [self._plan_base_searches(query.query) for query in queries]
+        base_search = self._run_strategies_concurrently(
+            [search for plan in base_plans for search in plan],
+            limit,
+            [query.limit for query, plan in zip(queries, base_plans, strict=True) for _ in plan],
+            semaphore
+        )
+
+        async def er_searches() -> (
+            tuple[list[dict[str, Any]], list[list[tuple[str, str]]], list[list[SearchResult]]]
+        ):
+            # Step 1: Extract entities and relationships
+            er_data = await asyncio.gather(
+                *(self.extract_query_er(query.query) for query in queries)
+            )
         
-        # FIX BUG #1: Store extracted entities for HybridRAGService to use
-        if er_data and er_data.get("entities"):
-            # Convert entity dict to list of entity names for graph search
-            entity_list = []
-            for entity_type, entity_values in er_data["entities"].items():
-                if isinstance(entity_values, dict):
-                    entity_list.extend([v for v in entity_values.values() if v])
-                elif isinstance(entity_values, list):
-                    entity_list.extend(entity_values)
-            
-            self._last_extracted_entities = entity_list
-            print(f"📊 Extracted entities: {entity_list[:5]}")
-        else:
-            self._last_extracted_entities = []
+            # Strategies 2 and 3: derived from the extracted entities
+            plans = [
+                self._plan_er_searches(query.query, er)
+                for query, er in zip(queries, er_data, strict=True)
+            ]
+            results = await self._run_strategies_concurrently(
+                [search for plan in plans for search in plan],
+                limit,
+                [query.limit for query, plan in zip(queries, plans, strict=True) for _ in plan],
+                semaphore
+            )
+            return er_data, plans, results
         
-        # Step 2: Multi-strategy search
-        all_results = []
+        # Step 2: Multi-strategy search, overlapping ER extraction
+        base_results, (er_data, er_plans, er_results) = await asyncio.gather(
+            base_search, er_searches()
+        )
+
+        search_time_ms = (time.time() - start_time) * 1000
+
+        # Step 3: Merge in strategy order (original, enhanced, entity-focused, semantic expansion),
+        # then deduplicate and rank results per query
+        responses = []
+        base_offset = er_offset = 0
+        for query, query_er, base_plan, er_plan in zip(
+            queries, er_data, base_plans, er_plans, strict=True
+        ):
+            base = base_results[base_offset:base_offset + len(base_plan)]
+            er = er_results[er_offset:er_offset + len(er_plan)]
+            base_offset += len(base_plan)
+            er_offset += len(er_plan)
+            all_results = [
+                result
+                for results in [base[0], *er, *base[1:]]
+                for result in results[:query.limit]
+            ]
+            final_results = self._deduplicate_and_rank(all_results, query.limit)
+
+            print(
+                f"✅ Enhanced search complete: {len(final_results)} results "
+                f"in {search_time_ms:.1f}ms"
+            )
+
+            responses.append(SearchResponse(
+                query=query,
+                results=final_results,
+                total_results=len(all_results),
+                search_time_ms=search_time_ms,
+                model_used=f"enhanced_tpn_search_{self.embedding_provider.model_name}",
+                extracted_entities=self._entity_names(query_er)
+            ))
+        return responses
+
+    @staticmethod
+    def _entity_names(er_data: dict[str, Any]) -> list[str]:
+        """Entity names from ER extraction (for HybridRAGService's graph search)."""
+        if not er_data or not er_data.get("entities"):
+            return []
+
+        # Convert entity dict to list of entity names for graph search
+        entity_list = []
+        for _entity_type, entity_values in er_data["entities"].items():
+            if isinstance(entity_values, dict):
+                entity_list.extend([v for v in entity_values.values() if v])
+            elif isinstance(entity_values, list):
+                entity_list.extend(entity_values)
+
+        print(f"📊 Extracted entities: {entity_list[:5]}")
+        return entity_list
+
+    def _plan_base_searches(self, query: str) -> list[tuple[str, str]]:
+        """Strategies without ER extraction: the original query first, then semantic expansions."""
         
         # Strategy 1: Original query search
-        original_results = await self._search_with_strategy(query.query, "original", query.limit)
-        all_results.extend(original_results)
+        searches = [(query, "original")]
+
+        # Strategy 4: Semantic expansion
+        searches.extend(
+            (expanded, "semantic_expansion") for expanded in self._semantic_expansion_queries(query)
+        )
+        return searches
         
+    def _plan_er_searches(self, query: str, er_data: dict[str, Any]) -> list[tuple[str, str]]:
+        """Strategies derived from ER extraction."""
+        searches = []
+
         # Strategy 2: Enhanced query search
-        if er_data.get("enhanced_query") and er_data["enhanced_query"] != query.query:
-            enhanced_results = await self._search_with_strategy(er_data["enhanced_query"], "enhanced", query.limit)
-            all_results.extend(enhanced_results)
+        if er_data.get("enhanced_query") and er_data["enhanced_query"] != query:
+            searches.append((er_data["enhanced_query"], "enhanced"))
         
         # Strategy 3: Entity-focused searches
         for search_term in er_data.get("search_terms", [])[:2]:  # Limit to top 2
-            if search_term != query.query:
-                entity_results = await self._search_with_strategy(search_term, "entity_focused", query.limit)
-                all_results.extend(entity_results)
+            if search_term != query:
+                searches.append((search_term, "entity_focused"))
+        return searches
         
-        # Strategy 4: Semantic expansion
-        semantic_results = await self._semantic_expansion_search(query.query, query.limit)
-        all_results.extend(semantic_results)
-        
-        # Step 3: Deduplicate and rank results
-        final_results = self._deduplicate_and_rank(all_results, query.limit)
-        
-        search_time_ms = (time.time() - start_time) * 1000
-        
-        print(f"✅ Enhanced search complete: {len(final_results)} results in {search_time_ms:.1f}ms")
-        
-        return SearchResponse(
-            query=query,
-            results=final_results,
-            total_results=len(all_results),
-            search_time_ms=search_time_ms,
-            model_used=f"enhanced_tpn_search_{self.embedding_provider.model_name}"
-        )
-    
     async def ask(self, rag_query: RAGQuery) -> RAGResponse:
         """Answer a question using modern LangChain RAG pipeline.
         
@@ -204,7 +311,7 @@ class RAGService:
         # Convert LangChain messages to string for Ollama
         # (Ollama doesn't support chat format directly via our wrapper)
         prompt_str = self._format_messages_for_ollama(formatted_messages)
-        
+
         # Step 4: Generate answer with LLM
         generation_start = time.time()
         answer = await self.llm_provider.generate(
@@ -230,7 +337,7 @@ class RAGService:
     def _format_messages_for_ollama(self, messages: List[Any]) -> str:
         """Convert LangChain messages to string format for Ollama."""
         formatted_parts = []
-        
+
         for msg in messages:
             role = msg.__class__.__name__.replace("Message", "").upper()
             if role == "SYSTEM":
@@ -241,10 +348,10 @@ class RAGService:
                 formatted_parts.append(f"ASSISTANT:\n{msg.content}\n")
             else:
                 formatted_parts.append(f"{msg.content}\n")
-        
+
         formatted_parts.append("\nASSISTANT:")
         return "\n".join(formatted_parts)
-    
+
     def _get_few_shot_examples(self) -> List[Dict[str, str]]:
         """Get few-shot examples for TPN clinical Q&A."""
         return [
@@ -259,7 +366,7 @@ class RAGService:
                 "answer": "According to the guidelines, potassium levels should be monitored daily in TPN patients, particularly during the initiation phase."
             }
         ]
-    
+
     def _build_tpn_prompt_template(self) -> ChatPromptTemplate:
         """Build modern LangChain prompt template with few-shot examples."""
         
@@ -268,7 +375,7 @@ class RAGService:
             ("human", "Context from TPN guidelines:\n{context}\n\nQuestion: {question}"),
             ("ai", "{answer}")
         ])
-        
+
         # Few-shot prompt
         few_shot_prompt = FewShotChatMessagePromptTemplate(
             example_prompt=example_prompt,
@@ -296,28 +403,28 @@ QUESTION: {question}
 
 Provide a clear, evidence-based answer using the guidelines above.""")
         ])
-        
-        return final_prompt
     
+        return final_prompt
+
     def _build_context_with_metadata(self, results: List[SearchResult]) -> str:
         """Build enriched context with source metadata for better attribution."""
         context_parts = []
-        
+
         for i, result in enumerate(results, 1):
             # Extract metadata
             doc_name = result.document_name[:60]
             section = result.chunk.section or "General"
             page = f", Page {result.chunk.page_num}" if result.chunk.page_num else ""
-            
+
             # Format with metadata
             context_parts.append(
                 f"[Source {i}: {doc_name}{page}]\n"
                 f"Section: {section}\n"
                 f"{result.content}"
             )
-        
-        return "\n\n".join(context_parts)
     
+        return "\n\n".join(context_parts)
+
     def _build_rag_prompt(self, question: str, context: str) -> str:
         """Build RAG prompt for answer generation (legacy fallback)."""
         return f"""Answer the following question using only the provided context. Be precise and helpful.
@@ -334,42 +441,147 @@ INSTRUCTIONS:
 - Use specific details from the context when available
 
 ANSWER:"""
-    
+
+    @property
+    def collection_version(self) -> str:
+        """Collection version the vector store writes to; tags failed-embedding queue rows."""
+        return getattr(self.vector_store, "collection_name", "") or ""
+
     async def get_collection_stats(self) -> Dict[str, Any]:
         """Get statistics about the document collection."""
         return await self.vector_store.get_stats()
-    
+
     async def add_document_chunks(
         self,
         chunks: List[DocumentChunk],
         doc_name: str
-    ) -> None:
-        """Add new document chunks to the vector store with batch processing."""
+    ) -> dict[str, int]:
+        """Add new document chunks to the vector store with token-budget batching.
+
+        Embedding and insertion overlap through the ingestion pipeline. Chunks whose
+        embedding fails are not inserted; they go to the failed-embedding queue for
+        ``retry_failed_embeddings``. Returns added / queued counts.
+        """
         if not chunks:
-            return
+            return {"added": 0, "queued_for_retry": 0}
+
+        print(f"🔄 Processing {len(chunks)} chunks in token-budgeted batches "
+              f"(≤{self.batch_packer.max_tokens_per_batch} tokens each)...")
+
+        report = await IngestionPipeline(self).run([(doc_name, self._as_source(chunks))])
+        added, queued = report["added"], report["queued_for_retry"]
+
+        if queued:
+            print(
+                f"⚠️  Added {added}/{len(chunks)} chunks; {queued} failed to embed and were queued "
+                f"(run `python main.py retry-failed`)"
+            )
+        else:
+            print(f"✅ Successfully processed all {len(chunks)} chunks")
+        return {"added": added, "queued_for_retry": queued}
+
+    async def retry_failed_embeddings(self, limit: int | None = None) -> dict[str, int]:
+        """Re-embed and insert queued chunks that failed to reach the live collection version."""
+        pending = await asyncio.to_thread(
+            self.failed_embeddings.pending, limit, self.collection_version
+        )
+        if not pending:
+            return {"retried": 0, "added": 0, "still_failed": 0}
+
+        by_document: dict[str, list[DocumentChunk]] = {}
+        for chunk, doc_name in pending:
+            by_document.setdefault(doc_name, []).append(chunk)
+
+        report = await IngestionPipeline(self).run(
+            [
+                (doc_name, self._as_source(doc_chunks))
+                for doc_name, doc_chunks in by_document.items()
+            ]
+        )
+        return {
+            "retried": len(pending),
+            "added": report["added"],
+            "still_failed": report["queued_for_retry"],
+        }
+
+    @staticmethod
+    def _as_source(chunks: list[DocumentChunk]) -> Callable[[], Awaitable[list[DocumentChunk]]]:
+        """Wrap already-loaded chunks as an ingestion pipeline source."""
+        async def load() -> list[DocumentChunk]:
+            return chunks
+        return load
+
+    async def _embed_batch(
+        self,
+        chunks: list[DocumentChunk],
+        doc_name: str
+    ) -> tuple[list[DocumentChunk], EmbeddingMatrix, int]:
+        """Embed one batch; returns the embedded chunks, their vectors and how many were queued."""
+        try:
+            embeddings = as_embedding_matrix(
+                await self.embedding_provider.embed_texts([chunk.content for chunk in chunks])
+            )
+        except Exception as e:
+            print(f"    ❌ Embedding batch failed: {e}")
+            await asyncio.to_thread(
+                self.failed_embeddings.record, chunks, doc_name, str(e), self.collection_version
+            )
+            return [], as_embedding_matrix([]), len(chunks)
         
-        # Process in batches to avoid memory issues
-        batch_size = 50  # Process 50 chunks at a time
+        # NaN / all-zero rows are failures, never stored
+        failed = failed_rows(embeddings)
+        if not failed.any():
+            return list(chunks), embeddings, 0
+
+        ok_chunks = [
+            chunk for chunk, is_failed in zip(chunks, failed, strict=True) if not is_failed
+        ]
+        failed_chunks = [
+            chunk for chunk, is_failed in zip(chunks, failed, strict=True) if is_failed
+        ]
+        ok_embeddings = embeddings[~failed]
+
+        if failed_chunks:
+            await asyncio.to_thread(
+                self.failed_embeddings.record,
+                failed_chunks, doc_name, "embedding failed after retries", self.collection_version
+            )
+        return ok_chunks, ok_embeddings, len(failed_chunks)
+
+    async def _insert_batch(
+        self,
+        chunks: list[DocumentChunk],
+        embeddings: EmbeddingMatrix,
+        doc_name: str
+    ) -> tuple[int, int]:
+        """Insert embedded chunks; returns (added, queued) counts."""
+        try:
+            await self.vector_store.add_chunks(
+                chunks, embeddings, doc_name, embedding_model=self.embedding_provider.model_name
+            )
+        except Exception as e:
+            print(f"    ❌ Vector store insert failed: {e}")
+            await asyncio.to_thread(
+                self.failed_embeddings.record,
+                chunks,
+                doc_name,
+                f"insert failed: {e}",
+                self.collection_version,
+            )
+            return 0, len(chunks)
         
-        print(f"🔄 Processing {len(chunks)} chunks in batches of {batch_size}...")
+        await asyncio.to_thread(
+            self.failed_embeddings.remove,
+            [chunk.chunk_id for chunk in chunks],
+            self.collection_version,
+        )
+        return len(chunks), 0
         
-        for i in range(0, len(chunks), batch_size):
-            batch_chunks = chunks[i:i + batch_size]
-            batch_texts = [chunk.content for chunk in batch_chunks]
-            
-            # Generate embeddings for batch
-            print(f"  📊 Generating embeddings for batch {i//batch_size + 1}/{(len(chunks)-1)//batch_size + 1}")
-            batch_embeddings = await self.embedding_provider.embed_texts(batch_texts)
-            
-            # Add batch to vector store
-            await self.vector_store.add_chunks(batch_chunks, batch_embeddings, doc_name)
-            
-        print(f"✅ Successfully processed all {len(chunks)} chunks")
-    
     async def remove_document(self, doc_id: str) -> None:
         """Remove a document from the vector store."""
         await self.vector_store.delete_document(doc_id)
-    
+        await asyncio.to_thread(self.failed_embeddings.remove_document, doc_id)
+
     # ========== Enhanced Search and ER Extraction Methods ==========
     
     def _build_er_extraction_graph(self) -> StateGraph:
@@ -385,12 +597,12 @@ ANSWER:"""
         workflow.add_edge("extract_entities", "identify_relationships")
         workflow.add_edge("identify_relationships", "enhance_query")
         workflow.add_edge("enhance_query", END)
-        
+
         # Set entry point
         workflow.set_entry_point("extract_entities")
         
         return workflow.compile()
-    
+
     async def extract_query_er(self, query: str) -> Dict[str, Any]:
         """Extract entities and relationships from TPN query."""
         
@@ -401,7 +613,7 @@ ANSWER:"""
             "enhanced_query": "",
             "search_terms": []
         }
-        
+
         try:
             # Run ER extraction workflow
             final_state = await self.er_graph.ainvoke(initial_state)
@@ -416,12 +628,12 @@ ANSWER:"""
                 "enhanced_query": query,
                 "search_terms": [query]
             }
-    
+
     async def _extract_tpn_entities(self, state: Dict[str, Any]) -> Dict[str, Any]:
         """Extract TPN-specific entities from query."""
-        
+
         query = state["original_query"]
-        
+
         # TPN entity extraction prompt
         er_prompt = f"""Extract TPN clinical entities from this query: "{query}"
 
@@ -437,7 +649,7 @@ Identify these TPN entity types:
 Extract key entities as comma-separated lists.
 
 TPN Entity Analysis:"""
-        
+
         try:
             response = await self.llm_provider.generate(
                 prompt=er_prompt,
@@ -455,10 +667,10 @@ TPN Entity Analysis:"""
                 "procedures": [],
                 "safety_aspects": []
             }
-            
+
             # Extract key entities from response text
             response_lower = response.lower()
-            
+
             # Patient entities
             if any(term in response_lower for term in ["preterm", "premature"]):
                 entities["patient"]["age_group"] = "preterm"
@@ -468,21 +680,21 @@ TPN Entity Analysis:"""
                 entities["patient"]["age_group"] = "pediatric"
             elif any(term in response_lower for term in ["adult"]):
                 entities["patient"]["age_group"] = "adult"
-            
+
             # TPN components
             tpn_components = ["amino acid", "protein", "dextrose", "glucose", "lipid", "fat", "sodium", "potassium", "phosphorus", "magnesium"]
             entities["components"] = [comp for comp in tpn_components if comp in response_lower]
-            
+
             # Lab values
             lab_values = ["glucose", "triglyceride", "bilirubin", "alt", "ast", "bun", "creatinine", "albumin", "prealbumin"]
             entities["lab_values"] = [lab for lab in lab_values if lab in response_lower]
-            
+
             # Clinical conditions
             conditions = ["sepsis", "ifald", "refeeding", "malnutrition", "cholestasis", "liver disease"]
             entities["conditions"] = [condition for condition in conditions if condition in response_lower]
-            
+
             state["entities"] = entities
-            
+
         except Exception as e:
             print(f"⚠️ Entity extraction failed: {e}")
             state["entities"] = {}
@@ -530,7 +742,7 @@ TPN Entity Analysis:"""
         
         state["relationships"] = relationships
         return state
-    
+
     async def _enhance_query_with_er(self, state: Dict[str, Any]) -> Dict[str, Any]:
         """Enhance search query using extracted entities and relationships."""
         
@@ -544,19 +756,19 @@ TPN Entity Analysis:"""
         age_group = entities.get("patient", {}).get("age_group")
         if age_group:
             search_terms.extend([f"{age_group} TPN", f"{age_group} parenteral nutrition"])
-        
+
         # Add component-specific terms
         for component in entities.get("components", []):
             search_terms.extend([f"TPN {component}", f"{component} dosing"])
-        
+
         # Add condition-specific terms
         for condition in entities.get("conditions", []):
             search_terms.extend([f"TPN {condition}", f"{condition} contraindication"])
-        
+
         # Add lab-specific terms
         for lab in entities.get("lab_values", []):
             search_terms.extend([f"TPN {lab} monitoring", f"{lab} normal range"])
-        
+
         # Create enhanced query combining multiple search angles
         enhanced_query_parts = [
             original_query,
@@ -564,60 +776,191 @@ TPN Entity Analysis:"""
             age_group or "",
             " ".join(entities.get("conditions", []))
         ]
-        
+
         enhanced_query = " ".join(filter(None, enhanced_query_parts))
-        
+
         state["enhanced_query"] = enhanced_query
         state["search_terms"] = list(set(search_terms))  # Remove duplicates
-        
+
         return state
-    
-    async def _search_with_strategy(self, search_query: str, strategy: str, limit: int) -> List[SearchResult]:
-        """Perform search with specific query and strategy."""
-        
-        try:
-            # Generate embedding for search query
-            query_embedding = await self.embedding_provider.embed_query(search_query)
+
+    async def _run_strategies_concurrently(
+        self,
+        searches: list[tuple[str, str]],
+        limit: int,
+        keep: list[int],
+        semaphore: asyncio.Semaphore
+    ) -> list[list[SearchResult]]:
+        """Run each strategy's searches as its own batch, concurrently, in input order.
+
+        At most ``semaphore``'s value of strategies are in flight; a strategy that
+        takes longer than ``settings.strategy_search_timeout_seconds`` is cancelled
+        and contributes no results, without holding up the others.
+        """
+        indices_by_strategy: dict[str, list[int]] = {}
+        for i, (_, strategy) in enumerate(searches):
+            indices_by_strategy.setdefault(strategy, []).append(i)
+
+        async def run(strategy: str, indices: list[int]) -> list[list[SearchResult]]:
+            async with semaphore:
+                try:
+                    return await asyncio.wait_for(
+                        self._run_strategy_searches(
+                            [searches[i] for i in indices], limit, [keep[i] for i in indices]
+                        ),
+                        timeout=settings.strategy_search_timeout_seconds,
+                    )
+                except asyncio.TimeoutError:
+                    print(
+                        f"⚠️ Search strategy '{strategy}' timed out after "
+                        f"{settings.strategy_search_timeout_seconds}s"
+                    )
+                    return [[] for _ in indices]
+
+        strategy_results = await asyncio.gather(
+            *(run(strategy, indices) for strategy, indices in indices_by_strategy.items())
+        )
+
+        results: list[list[SearchResult]] = [[] for _ in searches]
+        for indices, batch in zip(indices_by_strategy.values(), strategy_results, strict=True):
+            for i, search_results in zip(indices, batch, strict=True):
+                results[i] = search_results
+        return results
+
+    async def _run_strategy_searches(
+        self,
+        searches: list[tuple[str, str]],
+        limit: int,
+        keep: list[int] | None = None
+    ) -> list[list[SearchResult]]:
+        """Run several (search text, strategy) searches with one vector store call.
+
+        Distinct texts are embedded concurrently and searched together through
+        ``search_similar_many``. Returns one result list per search, tagged with its
+        strategy; a search whose embedding or lookup fails yields an empty list.
+
+        ``keep[i]`` truncates search ``i``'s results. When the store supports it
+        (``supports_projection``) the search fetches ids, scores and metadata only,
+        and content is hydrated once for the distinct chunks that survive truncation;
+        if hydration fails the search is repeated with content included.
+        """
+        results: list[list[SearchResult]] = [[] for _ in searches]
+        texts = list(dict.fromkeys(text for text, _ in searches))  # Same text, same vector search
+        if not texts:
+            return results
+
+        embeddings = await asyncio.gather(
+            *(self.embedding_provider.embed_query(text) for text in texts),
+            return_exceptions=True
+        )
+        failed = {
+            text
+            for text, embedding in zip(texts, embeddings, strict=True)
+            if isinstance(embedding, BaseException)
+        }
+        for text, strategy in searches:
+            if text in failed:
+                print(f"⚠️ Search strategy '{strategy}' failed: {embeddings[texts.index(text)]}")
+
+        ok_texts = [text for text in texts if text not in failed]
+        if not ok_texts:
+            return results
+
+        query_matrix = as_embedding_matrix([
+            embedding
+            for text, embedding in zip(texts, embeddings, strict=True)
+            if not isinstance(embedding, BaseException)
+        ])
             
-            # Search vector store
-            raw_results = await self.vector_store.search_similar(
-                query_embedding,
+        async def search_kept(include_content: bool) -> list[list[dict[str, Any]] | None]:
+            raw_lists = await self.vector_store.search_similar_many(
+                query_matrix,
                 limit=limit,
-                filters={}
+                filters={},
+                **({} if include_content else {"include_content": False})
             )
+            raw_by_text = dict(zip(ok_texts, raw_lists, strict=True))
+            return [
+                raw_by_text[text][:keep[i] if keep else limit] if text in raw_by_text else None
+                for i, (text, _) in enumerate(searches)
+            ]
             
-            # Convert to SearchResult objects and tag with strategy
-            search_results = []
-            for result in raw_results:
-                # Include search strategy in metadata at creation time (since DocumentChunk is frozen)
-                metadata = result.get("metadata", {}).copy()
-                metadata["search_strategy"] = strategy
-                
-                chunk = DocumentChunk(
-                    chunk_id=result["chunk_id"],
-                    doc_id=result["doc_id"],
-                    content=result["content"],
-                    chunk_type=result.get("chunk_type", "text"),
-                    page_num=result.get("page_num"),
-                    section=result.get("section"),
-                    metadata=metadata
-                )
-                
-                search_result = SearchResult(
-                    chunk=chunk,
-                    score=result["score"],
-                    document_name=result.get("document_name", "Unknown")
-                )
-                search_results.append(search_result)
-            
-            return search_results
-            
+        projected = self.vector_store.supports_projection
+        try:
+            kept = await search_kept(include_content=not projected)
         except Exception as e:
-            print(f"⚠️ Search strategy '{strategy}' failed: {e}")
-            return []
+            print(
+                f"⚠️ Search strategies {sorted({strategy for _, strategy in searches})} "
+                f"failed: {e}"
+            )
+            return results
+
+        if projected:
+            missing = [
+                raw["chunk_id"]
+                for raws in kept
+                if raws
+                for raw in raws
+                if raw.get("content") is None
+            ]
+            try:
+                contents = await self.vector_store.get_chunk_texts(missing) if missing else {}
+            except Exception as e:
+                print(f"⚠️ Chunk content hydration failed, searching again with content: {e}")
+                try:
+                    kept = await search_kept(include_content=True)
+                except Exception as e:
+                    print(
+                        f"⚠️ Search strategies {sorted({strategy for _, strategy in searches})} "
+                        f"failed: {e}"
+                    )
+                    return results
+                contents = {}
+            for raws in kept:
+                if raws is None:
+                    continue
+                for raw in raws:
+                    if raw.get("content") is None:
+                        raw["content"] = contents.get(raw["chunk_id"])
+                raws[:] = [
+                    raw for raw in raws if raw["content"] is not None
+                ]  # Deleted since the search
+
+        for i, (raws, (_, strategy)) in enumerate(zip(kept, searches, strict=True)):
+            if raws is not None:
+                results[i] = self._to_search_results(raws, strategy)
+        return results
+
+    @staticmethod
+    def _to_search_results(raw_results: list[dict[str, Any]], strategy: str) -> list[SearchResult]:
+        """Convert vector store results to SearchResult objects tagged with their strategy."""
+        search_results = []
+        for result in raw_results:
+            # Include search strategy in metadata at creation time (since DocumentChunk is frozen)
+            metadata = result.get("metadata", {}).copy()
+            metadata["search_strategy"] = strategy
+
+            chunk = DocumentChunk(
+                chunk_id=result["chunk_id"],
+                doc_id=result["doc_id"],
+                content=result["content"],
+                chunk_type=result.get("chunk_type", "text"),
+                page_num=result.get("page_num"),
+                section=result.get("section"),
+                metadata=metadata
+            )
+
+            search_result = SearchResult(
+                chunk=chunk,
+                score=result["score"],
+                document_name=result.get("document_name", "Unknown")
+            )
+            search_results.append(search_result)
+
+        return search_results
     
-    async def _semantic_expansion_search(self, query: str, limit: int) -> List[SearchResult]:
-        """Perform semantic expansion based on TPN domain knowledge."""
+    def _semantic_expansion_queries(self, query: str) -> list[str]:
+        """Query variants expanded with TPN domain synonyms."""
         
         # TPN-specific semantic expansions
         expansions = []
@@ -629,29 +972,22 @@ TPN Entity Analysis:"""
         # Component expansions
         if "protein" in query.lower():
             expansions.extend(["amino acids", "amino acid solution"])
-        
+
         if "sugar" in query.lower() or "carb" in query.lower():
             expansions.extend(["dextrose", "glucose"])
-        
+
         if "fat" in query.lower():
             expansions.extend(["lipid", "fat emulsion", "lipid emulsion"])
-        
+
         # Condition expansions
         if "liver" in query.lower():
             expansions.extend(["IFALD", "cholestasis", "hepatic"])
-        
-        # Perform searches with expansions
-        expansion_results = []
-        for expansion in expansions[:2]:  # Limit expansions
-            expanded_query = f"{query} {expansion}"
-            results = await self._search_with_strategy(expanded_query, "semantic_expansion", limit)
-            expansion_results.extend(results)
-        
-        return expansion_results
-    
+
+        return [f"{query} {expansion}" for expansion in expansions[:2]]  # Limit expansions
+
     def _deduplicate_and_rank(self, all_results: List[SearchResult], limit: int) -> List[SearchResult]:
         """Deduplicate results and rank by relevance and strategy."""
-        
+
         # Remove duplicates based on content hash
         seen_content = set()
         unique_results = []
@@ -661,13 +997,13 @@ TPN Entity Analysis:"""
             if content_hash not in seen_content:
                 seen_content.add(content_hash)
                 unique_results.append(result)
-        
+
         # Enhanced scoring based on multiple factors - create new SearchResults with updated scores
         enhanced_results = []
         for result in unique_results:
             strategy = result.chunk.metadata.get("search_strategy", "unknown")
             base_score = result.score
-            
+
             # Strategy bonuses
             strategy_bonus = {
                 "original": 0.0,
@@ -675,7 +1011,7 @@ TPN Entity Analysis:"""
                 "entity_focused": 0.05,
                 "semantic_expansion": 0.02
             }.get(strategy, 0.0)
-            
+
             # Content type bonuses
             content_type = result.chunk.metadata.get("content_type", "")
             content_bonus = {
@@ -684,7 +1020,7 @@ TPN Entity Analysis:"""
                 "safety_information": 0.10,
                 "clinical_procedure": 0.08
             }.get(content_type, 0.0)
-            
+
             # Document type bonuses
             doc_type = result.chunk.metadata.get("document_type", "")
             doc_bonus = {
@@ -692,23 +1028,23 @@ TPN Entity Analysis:"""
                 "nutrition_protocol": 0.08,
                 "pediatric_protocol": 0.06
             }.get(doc_type, 0.0)
-            
+
             # TPN relevance bonus
             tpn_keywords = ["tpn", "parenteral", "amino acid", "dextrose", "lipid", "aspen"]
             content_lower = result.content.lower()
             tpn_score = sum(1 for keyword in tpn_keywords if keyword in content_lower)
             tpn_bonus = min(0.1, tpn_score * 0.02)
-            
+
             # Calculate final score and create new SearchResult (since SearchResult is frozen)
             final_score = min(1.0, base_score + strategy_bonus + content_bonus + doc_bonus + tpn_bonus)
-            
+
             enhanced_result = SearchResult(
                 chunk=result.chunk,
                 score=final_score,
                 document_name=result.document_name
             )
             enhanced_results.append(enhanced_result)
-        
+
         # Sort by enhanced score and return top results
         sorted_results = sorted(enhanced_results, key=lambda x: x.score, reverse=True)
         return sorted_results[:limit]
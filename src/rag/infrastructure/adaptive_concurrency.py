@@ -0,0 +1,181 @@
+"""
+Adaptive (AIMD) concurrency limiter for remote model backends.
+
+Used by the Ollama embedding provider and by the Mistral embedding runner in
+``ocr_pipeline``; it only depends on asyncio and httpx so both can share it.
+"""
+
+import asyncio
+import time
+from collections import deque
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from typing import Any
+
+import httpx
+
+
+def is_overload_error(error: BaseException) -> bool:
+    """Whether an error means the backend is overloaded (timeout, 429 or 5xx)."""
+    if isinstance(error, (asyncio.TimeoutError, TimeoutError, httpx.TimeoutException)):
+        return True
+
+    # httpx.HTTPStatusError carries the response; SDK errors (e.g. Mistral) carry status_code
+    status = getattr(error, "status_code", None)
+    if status is None:
+        status = getattr(getattr(error, "response", None), "status_code", None)
+    if status is None and error.__cause__ is not None:
+        return is_overload_error(error.__cause__)
+
+    return isinstance(status, int) and (status == 429 or status >= 500)
+
+
+class AdaptiveConcurrencyLimiter:
+    """Additive-increase / multiplicative-decrease limit on in-flight requests.
+
+    While latency stays within ``latency_tolerance`` of the best latency seen, the
+    limit grows by ``increase_step`` per window of ``limit`` successful requests.
+    Timeouts, 429s and 5xx errors multiply it by ``decrease_factor`` (at most once
+    per observed latency window, so one burst of failures halves it only once).
+    """
+
+    def __init__(
+        self,
+        initial_limit: int = 4,
+        min_limit: int = 1,
+        max_limit: int = 32,
+        increase_step: float = 1.0,
+        decrease_factor: float = 0.5,
+        latency_tolerance: float = 1.5,
+        ewma_alpha: float = 0.2,
+    ):
+        if not 1 <= min_limit <= max_limit:
+            raise ValueError("Concurrency limits must satisfy 1 <= min_limit <= max_limit")
+
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.increase_step = increase_step
+        self.decrease_factor = decrease_factor
+        self.latency_tolerance = latency_tolerance
+        self.ewma_alpha = ewma_alpha
+
+        self._limit = float(min(max(initial_limit, min_limit), max_limit))
+        self._in_flight = 0
+        self._waiters: deque[asyncio.Future] = deque()
+        self._latency_ewma: float | None = None
+        self._baseline_latency: float | None = None
+        self._last_decrease = 0.0
+
+        self.successes = 0
+        self.failures = 0
+        self.increases = 0
+        self.decreases = 0
+
+    @property
+    def limit(self) -> int:
+        """Current number of requests allowed in flight."""
+        return max(self.min_limit, int(self._limit))
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        """Hold one concurrency slot for a single request and feed back its outcome."""
+        await self.acquire()
+        started = time.monotonic()
+        try:
+            yield
+        except asyncio.CancelledError:
+            raise
+        except BaseException as e:
+            self.record_failure(e)
+            raise
+        else:
+            self.record_success(time.monotonic() - started)
+        finally:
+            self.release()
+
+    async def acquire(self) -> None:
+        """Wait until a slot is free under the current limit."""
+        if self._in_flight < self.limit and not self._waiters:
+            self._in_flight += 1
+            return
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                self.release()  # Slot was granted just before cancellation
+            elif waiter in self._waiters:
+                self._waiters.remove(waiter)
+            raise
+
+    def release(self) -> None:
+        """Return a slot and wake waiters that now fit under the limit."""
+        self._in_flight = max(0, self._in_flight - 1)
+        self._wake_waiters()
+
+    def record_success(self, latency_seconds: float) -> None:
+        """Additive increase while latency stays flat."""
+        self.successes += 1
+
+        if self._latency_ewma is None:
+            self._latency_ewma = latency_seconds
+        else:
+            self._latency_ewma += self.ewma_alpha * (latency_seconds - self._latency_ewma)
+
+        if self._baseline_latency is None or latency_seconds < self._baseline_latency:
+            self._baseline_latency = latency_seconds
+        else:
+            # Let the baseline drift up slowly so a permanently slower backend isn't punished
+            self._baseline_latency += 0.01 * (latency_seconds - self._baseline_latency)
+
+        if (
+            self._latency_ewma <= self._baseline_latency * self.latency_tolerance
+            and self._limit < self.max_limit
+        ):
+            self._limit = min(float(self.max_limit), self._limit + self.increase_step / self._limit)
+            self.increases += 1
+            self._wake_waiters()
+
+    def record_failure(self, error: BaseException) -> None:
+        """Multiplicative decrease on overload signals; other errors leave the limit alone."""
+        self.failures += 1
+        if not is_overload_error(error):
+            return
+
+        now = time.monotonic()
+        window = self._latency_ewma or 1.0
+        if now - self._last_decrease >= window:
+            self._limit = max(float(self.min_limit), self._limit * self.decrease_factor)
+            self._last_decrease = now
+            self.decreases += 1
+
+    def stats(self) -> dict[str, Any]:
+        """Current limit, load and observed latency."""
+        return {
+            "limit": self.limit,
+            "in_flight": self._in_flight,
+            "waiting": len(self._waiters),
+            "latency_ms": (
+                round(self._latency_ewma * 1000, 1) if self._latency_ewma is not None else None
+            ),
+            "baseline_latency_ms": (
+                round(self._baseline_latency * 1000, 1)
+                if self._baseline_latency is not None
+                else None
+            ),
+            "successes": self.successes,
+            "failures": self.failures,
+            "increases": self.increases,
+            "decreases": self.decreases,
+        }
+
+    def _wake_waiters(self) -> None:
+        """Hand free slots to queued waiters in FIFO order."""
+        while self._waiters and self._in_flight < self.limit:
+            waiter = self._waiters.popleft()
+            if waiter.done() or waiter.get_loop().is_closed():
+                continue
+            self._in_flight += 1
+            waiter.set_result(None)
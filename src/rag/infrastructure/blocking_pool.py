@@ -0,0 +1,104 @@
+"""
+Bounded thread pools for blocking client calls made from async code.
+"""
+
+import asyncio
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, TypeVar, cast
+
+T = TypeVar("T")
+
+
+class BlockingCallPool:
+    """Runs synchronous calls on a fixed number of worker threads, off the event loop.
+
+    Calls beyond ``max_workers`` wait in the executor queue; queue depth, queue wait
+    and run time are tracked so a saturated pool is visible in stats. A call whose
+    caller is cancelled before it starts is skipped.
+    """
+
+    def __init__(self, name: str, max_workers: int):
+        self.name = name
+        self.max_workers = max(1, max_workers)
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix=name)
+        self._lock = threading.Lock()
+
+        self.submitted = 0
+        self.started = 0
+        self.completed = 0
+        self.failed = 0
+        self.cancelled = 0
+        self.active = 0
+        self.queued = 0
+        self.max_queued = 0
+        self.queue_wait_seconds = 0.0
+        self.run_seconds = 0.0
+
+    async def run(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """Run ``fn(*args, **kwargs)`` on the pool and await its result."""
+        submitted_at = time.perf_counter()
+        state = {"started": False, "cancelled": False}
+        with self._lock:
+            self.submitted += 1
+            self.queued += 1
+            self.max_queued = max(self.max_queued, self.queued)
+
+        def call() -> T | None:
+            started_at = time.perf_counter()
+            with self._lock:
+                if state["cancelled"]:
+                    return None
+                state["started"] = True
+                self.started += 1
+                self.queued -= 1
+                self.active += 1
+                self.queue_wait_seconds += started_at - submitted_at
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                with self._lock:
+                    self.active -= 1
+                    self.run_seconds += time.perf_counter() - started_at
+
+        try:
+            result = await asyncio.get_running_loop().run_in_executor(self._executor, call)
+        except asyncio.CancelledError:
+            with self._lock:
+                self.cancelled += 1
+                if not state["started"]:
+                    state["cancelled"] = True
+                    self.queued -= 1
+            raise
+        except Exception:
+            with self._lock:
+                self.failed += 1
+            raise
+        with self._lock:
+            self.completed += 1
+        # call() only returns None for a job whose awaiter was already cancelled
+        return cast(T, result)
+
+    def stats(self) -> dict[str, Any]:
+        """Worker, queue and timing statistics."""
+        with self._lock:
+            finished = self.completed + self.failed
+            return {
+                "workers": self.max_workers,
+                "active": self.active,
+                "queued": self.queued,
+                "max_queued": self.max_queued,
+                "submitted": self.submitted,
+                "completed": self.completed,
+                "failed": self.failed,
+                "avg_queue_wait_ms": (
+                    round(self.queue_wait_seconds / self.started * 1000, 2) if self.started else 0.0
+                ),
+                "avg_run_ms": round(self.run_seconds / finished * 1000, 2) if finished else 0.0,
+            }
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop the worker threads."""
+        self._executor.shutdown(wait=wait, cancel_futures=True)
@@ -0,0 +1,178 @@
+"""
+Persistent dead-letter queue for chunks whose embeddings could not be generated.
+"""
+
+import sqlite3
+import threading
+import time
+from collections.abc import Sequence
+from pathlib import Path
+from typing import Any
+
+from ..config.settings import settings
+from ..core.models.documents import DocumentChunk
+
+
+class FailedEmbeddingQueue:
+    """SQLite-backed queue of chunks that were skipped at insert time.
+
+    Ingestion records chunks whose embedding failed instead of storing placeholder
+    vectors; ``RAGService.retry_failed_embeddings`` (``python main.py retry-failed``)
+    re-embeds and inserts only those chunks.
+
+    Each row records the collection (version) it failed to reach, so a retry
+    after a reindex only replays chunks into the version that was missing them.
+    Rows queued before versions were tracked have an empty collection and are
+    retried into whichever version is live. Calls block on SQLite; async code
+    runs them in a worker thread.
+    """
+
+    def __init__(self, path: Path | None = None):
+        self.path = Path(path or settings.failed_embeddings_path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        with self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            columns = [row[1] for row in self._conn.execute("PRAGMA table_info(failed_chunks)")]
+            if columns and "collection" not in columns:
+                # Queue from before collection versions: keep its rows under the empty collection
+                self._conn.execute("ALTER TABLE failed_chunks RENAME TO failed_chunks_unversioned")
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS failed_chunks (
+                    collection TEXT NOT NULL DEFAULT '',
+                    chunk_id TEXT NOT NULL,
+                    doc_id TEXT NOT NULL,
+                    doc_name TEXT NOT NULL,
+                    chunk TEXT NOT NULL,
+                    error TEXT NOT NULL,
+                    attempts INTEGER NOT NULL DEFAULT 1,
+                    first_failed_at REAL NOT NULL,
+                    last_failed_at REAL NOT NULL,
+                    PRIMARY KEY (collection, chunk_id)
+                )
+                """)
+            if columns and "collection" not in columns:
+                self._conn.execute(
+                    "INSERT INTO failed_chunks (chunk_id, doc_id, doc_name, chunk, error, "
+                    "attempts, first_failed_at, last_failed_at) "
+                    "SELECT chunk_id, doc_id, doc_name, chunk, error, attempts, "
+                    "first_failed_at, last_failed_at "
+                    "FROM failed_chunks_unversioned"
+                )
+                self._conn.execute("DROP TABLE failed_chunks_unversioned")
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS failed_chunks_doc_id ON failed_chunks (doc_id)"
+            )
+
+    def record(
+        self, chunks: Sequence[DocumentChunk], doc_name: str, error: str, collection: str = ""
+    ) -> None:
+        """Queue chunks that did not reach ``collection`` (bumps the attempts of queued ones)."""
+        if not chunks:
+            return
+        now = time.time()
+        rows = [
+            (
+                collection,
+                chunk.chunk_id,
+                chunk.doc_id,
+                doc_name,
+                chunk.model_dump_json(),
+                error[:1000],
+                now,
+                now,
+            )
+            for chunk in chunks
+        ]
+        with self._lock, self._conn:
+            self._conn.executemany(
+                """
+                INSERT INTO failed_chunks (
+                    collection, chunk_id, doc_id, doc_name, chunk, error,
+                    attempts, first_failed_at, last_failed_at
+                )
+                VALUES (?, ?, ?, ?, ?, ?, 1, ?, ?)
+                ON CONFLICT(collection, chunk_id) DO UPDATE SET
+                    doc_name = excluded.doc_name,
+                    chunk = excluded.chunk,
+                    error = excluded.error,
+                    attempts = failed_chunks.attempts + 1,
+                    last_failed_at = excluded.last_failed_at
+                """,
+                rows,
+            )
+
+    def pending(
+        self, limit: int | None = None, collection: str | None = None
+    ) -> list[tuple[DocumentChunk, str]]:
+        """Queued ``(chunk, doc_name)`` pairs, oldest first (only ``collection``'s if given)."""
+        query = "SELECT chunk, doc_name FROM failed_chunks"
+        params: tuple[Any, ...] = ()
+        if collection is not None:
+            query += " WHERE collection IN (?, '')"
+            params = (collection,)
+        query += " ORDER BY first_failed_at, chunk_id"
+        if limit is not None:
+            query += " LIMIT ?"
+            params += (limit,)
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+        return [
+            (DocumentChunk.model_validate_json(chunk_json), doc_name)
+            for chunk_json, doc_name in rows
+        ]
+
+    def remove(self, chunk_ids: Sequence[str], collection: str = "") -> None:
+        """Drop chunks that have been embedded and inserted into ``collection``."""
+        if not chunk_ids:
+            return
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "DELETE FROM failed_chunks WHERE chunk_id = ? AND collection IN (?, '')",
+                [(chunk_id, collection) for chunk_id in chunk_ids],
+            )
+
+    def remove_collections(self, collections: Sequence[str]) -> None:
+        """Forget queued chunks of collection versions that were discarded or garbage-collected."""
+        if not collections:
+            return
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "DELETE FROM failed_chunks WHERE collection = ?", [(name,) for name in collections]
+            )
+
+    def remove_document(self, doc_id: str) -> None:
+        """Forget queued chunks of a deleted document."""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM failed_chunks WHERE doc_id = ?", (doc_id,))
+
+    def clear(self) -> None:
+        """Empty the queue (after a full reset and reload)."""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM failed_chunks")
+
+    def count(self, collection: str | None = None) -> int:
+        """Number of queued chunks (for ``collection`` if given)."""
+        with self._lock:
+            if collection is None:
+                row = self._conn.execute("SELECT COUNT(*) FROM failed_chunks").fetchone()
+            else:
+                row = self._conn.execute(
+                    "SELECT COUNT(*) FROM failed_chunks WHERE collection IN (?, '')", (collection,)
+                ).fetchone()
+            return int(row[0])
+
+    def stats(self) -> dict[str, Any]:
+        """Queue size, affected documents and retry attempts."""
+        with self._lock:
+            count, documents, max_attempts = self._conn.execute(
+                "SELECT COUNT(*), COUNT(DISTINCT doc_id), MAX(attempts) FROM failed_chunks"
+            ).fetchone()
+        return {
+            "queued_chunks": count,
+            "documents": documents,
+            "max_attempts": max_attempts or 0,
+            "path": str(self.path),
+        }
@@ -0,0 +1,276 @@
+"""
+Document registry: exact per-document and per-collection counts kept beside the vector store.
+"""
+
+import sqlite3
+import threading
+import time
+from collections import Counter
+from collections.abc import Iterable, Iterator, Sequence
+from pathlib import Path
+from typing import Any
+
+from ..config.settings import settings
+
+
+class DocumentRegistry:
+    """SQLite sidecar that answers collection statistics without reading the vector store.
+
+    ``record_chunks`` and ``remove_document`` update chunk membership, per-document
+    counts, chunk-type counts and collection totals in one transaction, so
+    ``stats()`` reads a handful of rows however large the collection is. Chunk ids
+    already registered are ignored, matching ChromaDB's ``add`` semantics.
+
+    ``path=None`` keeps the registry in memory (for stores built on an injected client).
+    """
+
+    def __init__(self, path: Path | None = None) -> None:
+        self.path = Path(path) if path is not None else None
+        if self.path is not None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            str(self.path) if self.path else ":memory:", check_same_thread=False
+        )
+        with self._conn:
+            if self.path is not None:
+                self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript("""
+                CREATE TABLE IF NOT EXISTS chunks (
+                    chunk_id TEXT PRIMARY KEY,
+                    doc_id TEXT NOT NULL,
+                    chunk_type TEXT NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS chunks_doc_id ON chunks (doc_id);
+                CREATE TABLE IF NOT EXISTS documents (
+                    doc_id TEXT PRIMARY KEY,
+                    document_name TEXT NOT NULL,
+                    chunk_count INTEGER NOT NULL,
+                    embedding_model TEXT,
+                    first_ingested_at REAL NOT NULL,
+                    last_ingested_at REAL NOT NULL
+                );
+                CREATE TABLE IF NOT EXISTS document_chunk_types (
+                    doc_id TEXT NOT NULL,
+                    chunk_type TEXT NOT NULL,
+                    chunk_count INTEGER NOT NULL,
+                    PRIMARY KEY (doc_id, chunk_type)
+                );
+                CREATE TABLE IF NOT EXISTS chunk_types (
+                    chunk_type TEXT PRIMARY KEY,
+                    chunk_count INTEGER NOT NULL
+                );
+                CREATE TABLE IF NOT EXISTS totals (
+                    key TEXT PRIMARY KEY,
+                    value INTEGER NOT NULL
+                );
+                INSERT OR IGNORE INTO totals (key, value) VALUES ('chunks', 0), ('documents', 0);
+                """)
+
+    @classmethod
+    def for_collection(
+        cls, collection_name: str, directory: Path | None = None
+    ) -> "DocumentRegistry":
+        """Registry file for a collection under ``settings.document_registry_dir``."""
+        return cls(Path(directory or settings.document_registry_dir) / f"{collection_name}.sqlite")
+
+    @staticmethod
+    def remove_for_collection(collection_name: str, directory: Path | None = None) -> None:
+        """Delete the registry file of a collection that was dropped."""
+        path = Path(directory or settings.document_registry_dir) / f"{collection_name}.sqlite"
+        for suffix in ("", "-wal", "-shm"):
+            path.with_name(path.name + suffix).unlink(missing_ok=True)
+
+    @property
+    def total_chunks(self) -> int:
+        with self._lock:
+            return self._total("chunks")
+
+    def record_chunks(
+        self,
+        chunk_ids: Sequence[str],
+        metadatas: Sequence[dict[str, Any]],
+        embedding_model: str | None = None,
+    ) -> int:
+        """Register stored chunks (ChromaDB-style metadata); returns how many were new."""
+        now = time.time()
+        with self._lock, self._conn:
+            return self._record(chunk_ids, metadatas, embedding_model, now)
+
+    def remove_document(self, doc_id: str) -> int:
+        """Unregister a document; returns how many chunks it had."""
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                "SELECT chunk_count FROM documents WHERE doc_id = ?", (doc_id,)
+            ).fetchone()
+            if row is None:
+                return 0
+            type_counts = self._conn.execute(
+                "SELECT chunk_type, chunk_count FROM document_chunk_types WHERE doc_id = ?",
+                (doc_id,),
+            ).fetchall()
+            self._conn.executemany(
+                "UPDATE chunk_types SET chunk_count = chunk_count - ? WHERE chunk_type = ?",
+                [(count, chunk_type) for chunk_type, count in type_counts],
+            )
+            self._conn.execute("DELETE FROM chunk_types WHERE chunk_count <= 0")
+            self._conn.execute("DELETE FROM chunks WHERE doc_id = ?", (doc_id,))
+            self._conn.execute("DELETE FROM document_chunk_types WHERE doc_id = ?", (doc_id,))
+            self._conn.execute("DELETE FROM documents WHERE doc_id = ?", (doc_id,))
+            self._add_total("chunks", -row[0])
+            self._add_total("documents", -1)
+            return int(row[0])
+
+    def stats(self) -> dict[str, Any]:
+        """Exact totals and chunk-type counts (reads O(number of chunk types) rows)."""
+        with self._lock:
+            return {
+                "total_chunks": self._total("chunks"),
+                "total_documents": self._total("documents"),
+                "chunk_types": dict(
+                    self._conn.execute("SELECT chunk_type, chunk_count FROM chunk_types").fetchall()
+                ),
+            }
+
+    def documents(self) -> dict[str, dict[str, Any]]:
+        """Per-document chunk counts, name, embedding model and ingest timestamps."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT doc_id, document_name, chunk_count, embedding_model, "
+                "first_ingested_at, last_ingested_at FROM documents ORDER BY document_name"
+            ).fetchall()
+        return {
+            doc_id: {
+                "document_name": name,
+                "chunk_count": count,
+                "embedding_model": model,
+                "first_ingested_at": first,
+                "last_ingested_at": last,
+            }
+            for doc_id, name, count, model, first, last in rows
+        }
+
+    def rebuild(self, pages: Iterable[tuple[Sequence[str], Sequence[dict[str, Any]]]]) -> int:
+        """Replace the registry with ``(ids, metadatas)`` pages read from the vector store."""
+        now = time.time()
+        with self._lock, self._conn:
+            for table in ("chunks", "documents", "document_chunk_types", "chunk_types"):
+                self._conn.execute(f"DELETE FROM {table}")
+            self._conn.execute("UPDATE totals SET value = 0")
+            for chunk_ids, metadatas in pages:
+                self._record(chunk_ids, metadatas, None, now)
+            return self._total("chunks")
+
+    def sync_with_collection(self, collection: Any, page_size: int = 5000) -> bool:
+        """Rebuild from a ChromaDB collection if chunk counts disagree; returns whether it did."""
+        return self.sync_with_collections([collection], page_size)
+
+    def sync_with_collections(self, collections: Sequence[Any], page_size: int = 5000) -> bool:
+        """Same for a collection sharded over several ChromaDB collections."""
+        if sum(collection.count() for collection in collections) == self.total_chunks:
+            return False
+        print(
+            "🔄 Rebuilding document registry for "
+            f"{', '.join(collection.name for collection in collections)}..."
+        )
+
+        def pages() -> Iterator[tuple[Sequence[str], Sequence[dict[str, Any]]]]:
+            for collection in collections:
+                offset = 0
+                while True:
+                    page = collection.get(include=["metadatas"], limit=page_size, offset=offset)
+                    if not page["ids"]:
+                        break
+                    yield page["ids"], page["metadatas"]
+                    offset += len(page["ids"])
+
+        self.rebuild(pages())
+        return True
+
+    def reset(self) -> None:
+        """Forget everything (the collection was reset)."""
+        self.rebuild([])
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
+
+    def _record(
+        self,
+        chunk_ids: Sequence[str],
+        metadatas: Sequence[dict[str, Any]],
+        embedding_model: str | None,
+        now: float,
+    ) -> int:
+        documents: dict[str, str] = {}
+        per_document: Counter = Counter()
+        per_document_type: Counter = Counter()
+        per_type: Counter = Counter()
+        for chunk_id, metadata in zip(chunk_ids, metadatas, strict=True):
+            metadata = metadata or {}
+            doc_id = metadata.get("doc_id") or metadata.get("document_name") or "unknown"
+            chunk_type = metadata.get("chunk_type") or "text"
+            inserted = self._conn.execute(
+                "INSERT OR IGNORE INTO chunks (chunk_id, doc_id, chunk_type) VALUES (?, ?, ?)",
+                (chunk_id, doc_id, chunk_type),
+            ).rowcount
+            if not inserted:
+                continue
+            documents[doc_id] = metadata.get("document_name") or doc_id
+            per_document[doc_id] += 1
+            per_document_type[(doc_id, chunk_type)] += 1
+            per_type[chunk_type] += 1
+
+        new_documents = 0
+        for doc_id, count in per_document.items():
+            exists = self._conn.execute(
+                "SELECT 1 FROM documents WHERE doc_id = ?", (doc_id,)
+            ).fetchone()
+            new_documents += exists is None
+            self._conn.execute(
+                """
+                INSERT INTO documents (
+                    doc_id, document_name, chunk_count, embedding_model,
+                    first_ingested_at, last_ingested_at
+                )
+                VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT(doc_id) DO UPDATE SET
+                    document_name = excluded.document_name,
+                    chunk_count = documents.chunk_count + excluded.chunk_count,
+                    embedding_model = COALESCE(excluded.embedding_model, documents.embedding_model),
+                    last_ingested_at = excluded.last_ingested_at
+                """,
+                (doc_id, documents[doc_id], count, embedding_model, now, now),
+            )
+        self._conn.executemany(
+            """
+            INSERT INTO document_chunk_types (doc_id, chunk_type, chunk_count) VALUES (?, ?, ?)
+            ON CONFLICT(doc_id, chunk_type)
+                DO UPDATE SET chunk_count = chunk_count + excluded.chunk_count
+            """,
+            [
+                (doc_id, chunk_type, count)
+                for (doc_id, chunk_type), count in per_document_type.items()
+            ],
+        )
+        self._conn.executemany(
+            """
+            INSERT INTO chunk_types (chunk_type, chunk_count) VALUES (?, ?)
+            ON CONFLICT(chunk_type) DO UPDATE SET chunk_count = chunk_count + excluded.chunk_count
+            """,
+            list(per_type.items()),
+        )
+        added = sum(per_document.values())
+        self._add_total("chunks", added)
+        self._add_total("documents", new_documents)
+        return added
+
+    def _total(self, key: str) -> int:
+        return int(
+            self._conn.execute("SELECT value FROM totals WHERE key = ?", (key,)).fetchone()[0]
+        )
+
+    def _add_total(self, key: str, delta: int) -> None:
+        self._conn.execute("UPDATE totals SET value = value + ? WHERE key = ?", (delta, key))
@@ -0,0 +1,205 @@
+"""
+Persistent content-addressed embedding cache for any EmbeddingProvider.
+"""
+
+import asyncio
+import hashlib
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from ...config.settings import settings
+from ...core.interfaces.embeddings import EmbeddingProvider
+from ...core.models.embeddings import (
+    EMBEDDING_DTYPE,
+    EmbeddingMatrix,
+    EmbeddingVector,
+    as_embedding_matrix,
+    is_valid_embedding,
+)
+
+
+class CachedEmbeddingProvider(EmbeddingProvider):
+    """Disk-backed embedding cache keyed by (model name, dimension, sha256 of text).
+
+    Wraps another provider transparently: cached texts are served from SQLite,
+    only misses reach the wrapped provider. SQLite reads and writes run in a
+    worker thread (``asyncio.to_thread``), never on the event loop.
+    """
+
+    _LOOKUP_CHUNK = 500  # Stay below SQLite's bound-parameter limit
+
+    def __init__(self, provider: EmbeddingProvider, cache_path: Path | None = None):
+        self.provider = provider
+        self.cache_path = Path(cache_path or settings.embedding_cache_path)
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.cache_path), check_same_thread=False)
+        with self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS embeddings (
+                    model TEXT NOT NULL,
+                    dimension INTEGER NOT NULL,
+                    text_hash TEXT NOT NULL,
+                    vector BLOB NOT NULL,
+                    created_at REAL NOT NULL,
+                    PRIMARY KEY (model, dimension, text_hash)
+                )
+                """)
+
+        self._dimension: int | None = None
+        self.hits = 0
+        self.misses = 0
+
+    async def embed_texts(self, texts: list[str]) -> EmbeddingMatrix:
+        """Generate embeddings, serving previously seen texts from the cache."""
+        if not texts:
+            dimension = await asyncio.to_thread(self._known_dimension)
+            return np.empty((0, dimension or 0), dtype=EMBEDDING_DTYPE)
+
+        hashes = [self._hash(text) for text in texts]
+        cached = await asyncio.to_thread(self._lookup, hashes)
+
+        # Embed each missing text once, even if it repeats within the request
+        missing: dict[str, str] = {}
+        for text, text_hash in zip(texts, hashes, strict=True):
+            if text_hash not in cached and text_hash not in missing:
+                missing[text_hash] = text
+
+        miss_count = sum(1 for text_hash in hashes if text_hash not in cached)
+        self.hits += len(texts) - miss_count
+        self.misses += miss_count
+
+        if missing:
+            new_embeddings = as_embedding_matrix(
+                await self.provider.embed_texts(list(missing.values()))
+            )
+            fresh = dict(zip(missing.keys(), new_embeddings, strict=True))
+            await asyncio.to_thread(self._store, fresh)
+            cached.update(fresh)
+
+        if not cached:
+            return np.full((len(texts), 0), np.nan, dtype=EMBEDDING_DTYPE)
+        return as_embedding_matrix([cached[text_hash] for text_hash in hashes])
+
+    async def embed_query(self, query: str) -> EmbeddingVector:
+        """Generate embedding for a single query, using the cache when possible."""
+        text_hash = self._hash(query)
+        cached = await asyncio.to_thread(self._lookup, [text_hash])
+
+        if text_hash in cached:
+            self.hits += 1
+            return cached[text_hash]
+
+        self.misses += 1
+        embedding = await self.provider.embed_query(query)
+        await asyncio.to_thread(self._store, {text_hash: embedding})
+        return embedding
+
+    @property
+    def model_name(self) -> str:
+        """Return the wrapped provider's model name."""
+        return self.provider.model_name
+
+    @property
+    def dimension(self) -> int:
+        """Return the embedding dimension (known from the cache before any model call)."""
+        dimension = self._known_dimension()
+        if dimension is None:
+            raise RuntimeError("Dimension unknown - generate at least one embedding first")
+        return dimension
+
+    def stats(self) -> dict[str, Any]:
+        """Return cache hit/miss counters merged with the wrapped provider's stats."""
+        lookups = self.hits + self.misses
+        return {
+            **self.provider.stats(),
+            "embedding_cache": {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "path": str(self.cache_path),
+            },
+        }
+
+    async def open(self) -> None:
+        """Open the wrapped provider's resources."""
+        await self.provider.open()
+
+    async def aclose(self) -> None:
+        """Close the wrapped provider's resources."""
+        await self.provider.aclose()
+
+    def _known_dimension(self) -> int | None:
+        """Return the embedding dimension from the provider or the cache, if known."""
+        try:
+            return self.provider.dimension
+        except RuntimeError:
+            pass
+
+        if self._dimension is None:
+            with self._lock:
+                rows = self._conn.execute(
+                    "SELECT DISTINCT dimension FROM embeddings WHERE model = ? LIMIT 2",
+                    (self.model_name,),
+                ).fetchall()
+            # Only trust the cache when the model maps to a single dimension
+            if len(rows) == 1:
+                self._dimension = rows[0][0]
+        return self._dimension
+
+    def _lookup(self, hashes: list[str]) -> dict[str, EmbeddingVector]:
+        """Fetch cached vectors for the given text hashes."""
+        dimension = self._known_dimension()
+        if dimension is None:
+            return {}
+
+        found: dict[str, EmbeddingVector] = {}
+        unique = list(dict.fromkeys(hashes))
+        with self._lock:
+            for start in range(0, len(unique), self._LOOKUP_CHUNK):
+                chunk = unique[start : start + self._LOOKUP_CHUNK]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self._conn.execute(
+                    f"SELECT text_hash, vector FROM embeddings "
+                    f"WHERE model = ? AND dimension = ? AND text_hash IN ({placeholders})",
+                    (self.model_name, dimension, *chunk),
+                ).fetchall()
+                for text_hash, blob in rows:
+                    found[text_hash] = np.frombuffer(
+                        blob, dtype=EMBEDDING_DTYPE
+                    )  # Read-only, no copy
+        return found
+
+    def _store(self, embeddings: dict[str, EmbeddingVector | None]) -> None:
+        """Persist freshly computed vectors (failed, NaN or zero vectors are skipped)."""
+        rows = []
+        now = time.time()
+        for text_hash, embedding in embeddings.items():
+            if not is_valid_embedding(embedding):
+                continue
+            vector = np.asarray(embedding, dtype=EMBEDDING_DTYPE)
+            if self._dimension is None:
+                self._dimension = len(vector)
+            rows.append((self.model_name, len(vector), text_hash, vector.tobytes(), now))
+
+        if not rows:
+            return
+
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embeddings "
+                "(model, dimension, text_hash, vector, created_at) VALUES (?, ?, ?, ?, ?)",
+                rows,
+            )
+
+    @staticmethod
+    def _hash(text: str) -> str:
+        """Content address for a text."""
+        return hashlib.sha256(text.encode("utf-8")).hexdigest()
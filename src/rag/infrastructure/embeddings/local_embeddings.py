@@ -0,0 +1,161 @@
+"""
+In-process CPU embedding provider (sentence-transformers, optionally ONNX int8).
+"""
+
+import asyncio
+import threading
+from typing import Any
+
+import numpy as np
+
+from ...config.settings import settings
+from ...core.interfaces.embeddings import EmbeddingProvider
+from ...core.models.embeddings import EMBEDDING_DTYPE, EmbeddingMatrix, EmbeddingVector
+
+try:
+    from sentence_transformers import SentenceTransformer
+
+    SENTENCE_TRANSFORMERS_AVAILABLE = True
+except ImportError:
+    SENTENCE_TRANSFORMERS_AVAILABLE = False
+    SentenceTransformer = None
+
+
+class LocalEmbeddingProvider(EmbeddingProvider):
+    """Embedding provider that runs a small model in this process, no Ollama daemon needed.
+
+    The model is loaded lazily (or eagerly via ``open()``). Encoding runs in worker
+    threads in batches of ``batch_size`` so the event loop stays responsive and a
+    query can slip in between the batches of a large ingestion request.
+    """
+
+    def __init__(
+        self,
+        model: str | None = None,
+        batch_size: int | None = None,
+        use_onnx: bool | None = None,
+        onnx_file: str | None = None,
+        device: str = "cpu",
+    ) -> None:
+        if not SENTENCE_TRANSFORMERS_AVAILABLE:
+            raise RuntimeError(
+                "Local embedding backend requires sentence-transformers. "
+                "Install: pip install sentence-transformers"
+            )
+
+        self.model = model or settings.local_embed_model
+        self.batch_size = max(1, batch_size or settings.local_embed_batch_size)
+        self.use_onnx = settings.local_embed_onnx if use_onnx is None else use_onnx
+        self.onnx_file = onnx_file or settings.local_embed_onnx_file
+        self.device = device
+
+        self._encoder: Any | None = None
+        self._backend: str | None = None
+        self._load_lock = threading.Lock()
+        self._encoded_texts = 0
+
+    async def embed_texts(self, texts: list[str]) -> EmbeddingMatrix:
+        """Generate embeddings for multiple texts in worker-thread batches."""
+        if not texts:
+            return np.empty((0, 0), dtype=EMBEDDING_DTYPE)
+
+        embeddings: list[EmbeddingMatrix] = []
+        for start in range(0, len(texts), self.batch_size):
+            batch = texts[start : start + self.batch_size]
+            if len(texts) > self.batch_size:
+                print(f"    Embedding {start + 1}-{start + len(batch)}/{len(texts)} (local)...")
+            embeddings.append(await asyncio.to_thread(self._encode, batch))
+        return embeddings[0] if len(embeddings) == 1 else np.concatenate(embeddings)
+
+    async def embed_query(self, query: str) -> EmbeddingVector:
+        """Generate embedding for a single query."""
+        return (await asyncio.to_thread(self._encode, [query])).reshape(-1)
+
+    async def open(self) -> None:
+        """Load the model up front so the first request doesn't pay for it."""
+        await asyncio.to_thread(self._get_encoder)
+
+    def stats(self) -> dict[str, Any]:
+        """Return backend details of the in-process model."""
+        return {
+            "local_embedding": {
+                "model": self.model,
+                "backend": self._backend,
+                "loaded": self._encoder is not None,
+                "batch_size": self.batch_size,
+                "encoded_texts": self._encoded_texts,
+            }
+        }
+
+    @property
+    def model_name(self) -> str:
+        """Return the model name (int8 ONNX vectors differ slightly, so they get their own name)."""
+        if self._get_backend_name() == "onnx":
+            return f"{self.model}:onnx-int8"
+        return self.model
+
+    @property
+    def dimension(self) -> int:
+        """Return the embedding dimension."""
+        if self._encoder is None:
+            raise RuntimeError("Dimension unknown - generate at least one embedding first")
+        return int(self._encoder.get_sentence_embedding_dimension())
+
+    def _encode(self, texts: list[str]) -> EmbeddingMatrix:
+        """Encode one batch synchronously (runs in a worker thread)."""
+        encoder = self._get_encoder()
+        try:
+            vectors = encoder.encode(
+                texts,
+                batch_size=self.batch_size,
+                normalize_embeddings=True,
+                convert_to_numpy=True,
+                show_progress_bar=False,
+            )
+        except Exception as e:
+            raise RuntimeError(f"Failed to generate local embeddings: {e}") from e
+
+        self._encoded_texts += len(texts)
+        return np.ascontiguousarray(vectors, dtype=EMBEDDING_DTYPE)
+
+    def _get_backend_name(self) -> str:
+        """Backend in use, or the configured one before the model is loaded."""
+        return self._backend or ("onnx" if self.use_onnx else "torch")
+
+    def _get_encoder(self) -> Any:
+        """Load the model once; concurrent first calls wait for the same load."""
+        if self._encoder is not None:
+            return self._encoder
+
+        with self._load_lock:
+            if self._encoder is not None:
+                return self._encoder
+
+            if self.use_onnx:
+                try:
+                    print(f"🔧 Loading local embedding model: {self.model} (ONNX {self.onnx_file})")
+                    self._encoder = SentenceTransformer(
+                        self.model,
+                        device=self.device,
+                        backend="onnx",
+                        model_kwargs={"file_name": self.onnx_file},
+                    )
+                    self._backend = "onnx"
+                except Exception as e:
+                    print(f"⚠️  Failed to load ONNX model ({e}), falling back to PyTorch")
+
+            if self._encoder is None:
+                try:
+                    print(f"🔧 Loading local embedding model: {self.model}")
+                    self._encoder = SentenceTransformer(self.model, device=self.device)
+                    self._backend = "torch"
+                except Exception as e:
+                    raise RuntimeError(
+                        f"Failed to load local embedding model {self.model}: {e}"
+                    ) from e
+
+            print(
+                f"✅ Local embedding model loaded ({self._backend}, "
+                f"{self._encoder.get_sentence_embedding_dimension()}d)"
+            )
+            return self._encoder
@@ -3,121 +3,269 @@ Ollama embedding provider implementation with robust error handling.
 """
 import asyncio
 import httpx
-from typing import List, Dict, Any, Optional
+import numpy as np
+from collections.abc import Callable, Awaitable
+from typing import Any, TypeVar
 from ...core.interfaces.embeddings import EmbeddingProvider
+from ...core.models.embeddings import EMBEDDING_DTYPE, EmbeddingMatrix, EmbeddingVector, failed_rows
 from ...config.settings import settings
+from ..http_client import PooledHTTPClient
+from ..adaptive_concurrency import AdaptiveConcurrencyLimiter
+from ..endpoint_pool import EndpointPool
+
+T = TypeVar("T")
 
 
 class OllamaEmbeddingProvider(EmbeddingProvider):
     """Ollama-based embedding provider with concurrency control and retry logic."""
     
-    def __init__(self, model: str = None, base_url: str = None, max_concurrent: int = 10):
-        self.base_url = (base_url or settings.ollama_base_url).rstrip('/')
+    def __init__(
+        self,
+        model: str | None = None,
+        base_url: str | None = None,
+        max_concurrent: int | None = None,
+        batch_size: int | None = None
+    ):
+        # One or more hosts (comma-separated base_url or OLLAMA_BASE_URLS),
+        # least outstanding requests first
+        self.endpoints = EndpointPool.from_settings(base_url)
+        self.base_url = self.endpoints.primary
         self.model = model or self._auto_select_embedding_model()
         self._dimension = None
-        self.max_concurrent = max_concurrent  # Limit concurrent requests
-        self.semaphore = asyncio.Semaphore(max_concurrent)
-        
-    async def embed_texts(self, texts: List[str]) -> List[List[float]]:
-        """Generate embeddings for multiple texts with concurrency control."""
-        async with httpx.AsyncClient(timeout=180.0) as client:  # 3 min timeout for retry logic
-            # Use semaphore to limit concurrent requests (10 at a time, not 50!)
-            tasks = [self._embed_with_semaphore(client, text, idx, len(texts)) for idx, text in enumerate(texts)]
-            embeddings = await asyncio.gather(*tasks, return_exceptions=True)
-            
-            # Handle any failed embeddings
-            processed_embeddings = []
-            failed_count = 0
-            for i, emb in enumerate(embeddings):
-                if isinstance(emb, Exception):
-                    failed_count += 1
-                    # Use zero vector as fallback
-                    if self._dimension:
-                        processed_embeddings.append([0.0] * self._dimension)
-                    else:
-                        # Try to get dimension from first successful embedding
-                        processed_embeddings.append(None)  # Will handle later
-                else:
-                    processed_embeddings.append(emb)
-            
-            # Fill in any None values with zero vectors
-            if self._dimension:
-                processed_embeddings = [
-                    emb if emb is not None else [0.0] * self._dimension 
-                    for emb in processed_embeddings
-                ]
-            
-            if failed_count > 0:
-                print(f"    WARNING: {failed_count}/{len(texts)} embeddings failed, using zero vectors")
-            
-            return processed_embeddings
+        self.max_concurrent = (
+            max_concurrent or settings.max_concurrent_requests
+        )  # Starting concurrency per host
+        # AIMD limiter: grows while latency is flat, halves on timeouts / 5xx;
+        # capacity scales with hosts
+        hosts = len(self.endpoints)
+        self.limiter = AdaptiveConcurrencyLimiter(
+            initial_limit=self.max_concurrent * hosts,
+            min_limit=1,
+            max_limit=max(self.max_concurrent, settings.embed_max_concurrency) * hosts
+        )
+        # Texts per /api/embed request; 1 keeps the legacy /api/embeddings path
+        self.batch_size = max(1, batch_size or settings.ollama_embed_batch_size)
+        self._batch_endpoint_supported = True
+        self.http = PooledHTTPClient(timeout=180.0)  # 3 min timeout for retry logic
+
+    async def embed_texts(self, texts: list[str]) -> EmbeddingMatrix:
+        """Generate embeddings for multiple texts with concurrency control.
+
+        In batched mode texts are sent to /api/embed in groups of ``batch_size``;
+        a group that still fails after retries is re-embedded text by text.
+        Returns an (n, dimension) float32 matrix; rows that still fail are NaN.
+        """
+        client = self.http.get()
+        if self._use_batch_endpoint:
+            # One request per batch, batches share the concurrency limiter
+            starts = list(range(0, len(texts), self.batch_size))
+            tasks = [
+                self._embed_batch_with_fallback(
+                    client, texts[start : start + self.batch_size], start, len(texts)
+                )
+                for start in starts
+            ]
+            batch_results = await asyncio.gather(*tasks)
+        else:
+            # The limiter caps in-flight requests, not the number of queued tasks
+            tasks = [
+                self._embed_with_progress(client, text, idx, len(texts))
+                for idx, text in enumerate(texts)
+            ]
+            starts = [0]
+            batch_results = [await asyncio.gather(*tasks, return_exceptions=True)]
+
+        # Write every result straight into one preallocated float32 matrix
+        embeddings = np.full((len(texts), self._dimension or 0), np.nan, dtype=EMBEDDING_DTYPE)
+        for start, result in zip(starts, batch_results, strict=True):
+            if isinstance(result, np.ndarray):
+                embeddings[start:start + len(result)] = result
+                continue
+            for offset, emb in enumerate(result):
+                if not isinstance(emb, Exception) and len(emb) == embeddings.shape[1]:
+                    embeddings[start + offset] = emb
     
-    async def embed_query(self, query: str) -> List[float]:
+        failed_count = int(failed_rows(embeddings).sum()) if len(texts) else 0
+        if failed_count > 0:
+            print(f"    WARNING: {failed_count}/{len(texts)} embeddings failed")
+
+        return embeddings
+
+    async def embed_query(self, query: str) -> EmbeddingVector:
         """Generate embedding for a single query."""
-        async with httpx.AsyncClient(timeout=180.0) as client:
-            return await self._embed_with_retry(client, query, max_retries=3)
-    
-    async def _embed_with_semaphore(self, client: httpx.AsyncClient, text: str, idx: int, total: int) -> List[float]:
-        """Generate embedding with semaphore-based concurrency control."""
-        async with self.semaphore:
-            # Show progress for every 10th embedding
-            if (idx + 1) % 10 == 0 or idx == 0:
-                print(f"    Embedding {idx+1}/{total}...")
-            return await self._embed_with_retry(client, text, max_retries=3)
-    
-    async def _embed_with_retry(self, client: httpx.AsyncClient, text: str, max_retries: int = 3) -> List[float]:
+        return await self._embed_with_retry(self.http.get(), query, max_retries=3)
+
+    def stats(self) -> dict[str, Any]:
+        """Return adaptive concurrency and per-host statistics."""
+        return {
+            "embedding_concurrency": self.limiter.stats(),
+            "ollama_endpoints": self.endpoints.stats(),
+        }
+
+    async def open(self) -> None:
+        """Open the pooled HTTP client."""
+        await self.http.open()
+
+    async def aclose(self) -> None:
+        """Close the pooled HTTP client."""
+        await self.http.aclose()
+
+    @property
+    def _use_batch_endpoint(self) -> bool:
+        """Whether requests go through the batched /api/embed endpoint."""
+        return self.batch_size > 1 and self._batch_endpoint_supported
+
+    async def _embed_batch_with_fallback(
+        self,
+        client: httpx.AsyncClient,
+        texts: list[str],
+        offset: int,
+        total: int
+    ) -> Any:
+        """Embed one batch; on failure fall back to per-text calls for that batch only.
+
+        Returns the batch matrix, or after fallback a list of vectors in input order
+        with per-text failures returned as exceptions.
+        """
+        print(f"    Embedding {offset + 1}-{offset + len(texts)}/{total}...")
+        try:
+            return await self._with_retry(lambda: self._embed_batch(client, texts), max_retries=3)
+        except Exception as e:
+            print(
+                f"    Batch {offset + 1}-{offset + len(texts)} failed ({e}), "
+                "falling back to per-text embedding"
+            )
+
+        tasks = [
+            self._embed_with_progress(client, text, offset + i, total)
+            for i, text in enumerate(texts)
+        ]
+        return await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _embed_with_progress(
+        self, client: httpx.AsyncClient, text: str, idx: int, total: int
+    ) -> EmbeddingVector:
+        """Generate embedding for one text of a larger request, reporting progress."""
+        # Show progress for every 10th embedding
+        if (idx + 1) % 10 == 0 or idx == 0:
+            print(f"    Embedding {idx+1}/{total}...")
+        return await self._embed_with_retry(client, text, max_retries=3)
+
+    async def _embed_with_retry(
+        self, client: httpx.AsyncClient, text: str, max_retries: int = 3
+    ) -> EmbeddingVector:
         """Generate embedding with exponential backoff retry logic."""
-        last_error = None
+        return await self._with_retry(
+            lambda: self._embed_single(client, text), max_retries=max_retries
+        )
+
+    async def _with_retry(self, request: Callable[[], Awaitable[T]], max_retries: int = 3) -> T:
+        """Run an embedding request with exponential backoff retry logic.
+
+        Each attempt holds one limiter slot; backoff sleeps do not.
+        """
+        last_error: Exception | None = None
         
         for attempt in range(max_retries):
             try:
-                return await self._embed_single(client, text)
+                async with self.limiter.slot():
+                    return await request()
             except httpx.ReadTimeout as e:
                 last_error = e
                 if attempt < max_retries - 1:
                     wait_time = 2 ** attempt  # Exponential backoff: 1s, 2s, 4s
                     print(f"    Timeout on attempt {attempt+1}/{max_retries}, retrying in {wait_time}s...")
                     await asyncio.sleep(wait_time)
+            except httpx.HTTPStatusError as e:
+                last_error = e
+                if 400 <= e.response.status_code < 500 and e.response.status_code != 429:
+                    break  # Client errors (unknown model/endpoint) won't succeed on retry
+                if attempt < max_retries - 1:
+                    print(
+                        f"    HTTP {e.response.status_code} "
+                        f"on attempt {attempt + 1}/{max_retries}, "
+                        "retrying..."
+                    )
+                    await asyncio.sleep(1)
             except Exception as e:
                 last_error = e
                 if attempt < max_retries - 1:
                     print(f"    Error on attempt {attempt+1}/{max_retries}: {type(e).__name__}, retrying...")
                     await asyncio.sleep(1)
-        
+
         # All retries failed
         raise RuntimeError(f"Failed after {max_retries} attempts: {last_error}")
-    
-    async def _embed_single(self, client: httpx.AsyncClient, text: str) -> List[float]:
+
+    async def _embed_batch(self, client: httpx.AsyncClient, texts: list[str]) -> EmbeddingMatrix:
+        """Generate embeddings for several texts in one /api/embed request (no retry)."""
+        async with self.endpoints.request() as base_url:
+            response = await client.post(
+                f"{base_url}/api/embed",
+                json={
+                    "model": self.model,
+                    "input": texts
+                }
+            )
+            if response.status_code == 404 and "model" not in response.text.lower():
+                # Older Ollama servers only expose /api/embeddings
+                print(
+                    "    /api/embed not available on this Ollama server, "
+                    "using per-text /api/embeddings"
+                )
+                self._batch_endpoint_supported = False
+            response.raise_for_status()
+        embeddings = np.asarray(response.json().get("embeddings", []), dtype=EMBEDDING_DTYPE)
+
+        if embeddings.ndim != 2 or len(embeddings) != len(texts):
+            raise RuntimeError(
+                f"Expected {len(texts)} embeddings from /api/embed, got {len(embeddings)}"
+            )
+
+        # Cache dimension on first call
+        if self._dimension is None and embeddings.shape[1] > 0:
+            self._dimension = embeddings.shape[1]
+
+        return embeddings
+
+    async def _embed_single(self, client: httpx.AsyncClient, text: str) -> EmbeddingVector:
         """Generate embedding for a single text (no retry)."""
-        response = await client.post(
-            f"{self.base_url}/api/embeddings",
-            json={
-                "model": self.model,
-                "prompt": text
-            }
-        )
-        response.raise_for_status()
+        if self._use_batch_endpoint:
+            # Same endpoint as batches so queries and documents share one vector space
+            vector: EmbeddingVector = (await self._embed_batch(client, [text]))[0]
+            return vector
+
+        async with self.endpoints.request() as base_url:
+            response = await client.post(
+                f"{base_url}/api/embeddings",
+                json={
+                    "model": self.model,
+                    "prompt": text
+                }
+            )
+            response.raise_for_status()
         result = response.json()
-        embedding = result.get("embedding", [])
-        
+        embedding = np.asarray(result.get("embedding", []), dtype=EMBEDDING_DTYPE)
+        if embedding.size == 0:
+            raise RuntimeError("Ollama returned an empty embedding")
+
         # Cache dimension on first call
-        if self._dimension is None and embedding:
-            self._dimension = len(embedding)
-            
-        return embedding
+        if self._dimension is None:
+            self._dimension = embedding.shape[0]
     
+        return embedding
+
     @property
     def model_name(self) -> str:
         """Return the model name."""
         return self.model
-    
+
     @property
     def dimension(self) -> int:
         """Return the embedding dimension."""
         if self._dimension is None:
             raise RuntimeError("Dimension unknown - generate at least one embedding first")
         return self._dimension
-    
+
     def _auto_select_embedding_model(self) -> str:
         """Auto-select the best available embedding model from Ollama."""
         # Preferred models in order of priority
@@ -135,23 +283,23 @@ class OllamaEmbeddingProvider(EmbeddingProvider):
             if response.status_code == 200:
                 data = response.json()
                 available_models = [model["name"] for model in data.get("models", [])]
-                
+
                 # Check for preferred models
                 for model in preferred_models:
                     if any(model in available for available in available_models):
                         print(f"Auto-selected embedding model: {model}")
                         return model
-                
+
                 # If no preferred model, try to find any embedding model
                 embedding_keywords = ["embed", "embedding"]
                 for available in available_models:
                     if any(keyword in available.lower() for keyword in embedding_keywords):
                         print(f"Auto-selected embedding model: {available}")
                         return available
-        
+
         except Exception as e:
             print(f"Could not auto-detect embedding models: {e}")
-        
+
         # Fallback to settings or default
         fallback = getattr(settings, 'ollama_embed_model', 'nomic-embed-text')
         print(f"Using fallback embedding model: {fallback}")
@@ -0,0 +1,133 @@
+"""
+In-memory LRU + TTL cache for query embeddings.
+"""
+
+import time
+from collections import OrderedDict
+from typing import Any
+
+from ...config.settings import settings
+from ...core.interfaces.embeddings import EmbeddingProvider
+from ...core.models.embeddings import (
+    EmbeddingMatrix,
+    EmbeddingVector,
+    as_query_vector,
+    is_valid_embedding,
+)
+from ..singleflight import SingleFlight
+
+
+class QueryCachedEmbeddingProvider(EmbeddingProvider):
+    """Keeps recent ``embed_query`` results in memory.
+
+    One search embeds the same strings several times (original query, semantic
+    expansions, multi-query variants); repeats are served from a size-bounded LRU
+    whose entries expire after ``ttl_seconds``. Identical concurrent lookups share
+    one request. Cached vectors are read-only arrays handed out without copying.
+    ``embed_texts`` (ingestion) passes straight through.
+    """
+
+    def __init__(
+        self,
+        provider: EmbeddingProvider,
+        max_size: int | None = None,
+        ttl_seconds: float | None = None,
+    ):
+        self.provider = provider
+        self.max_size = max_size if max_size is not None else settings.query_embedding_cache_size
+        self.ttl_seconds = ttl_seconds if ttl_seconds is not None else settings.cache_ttl_seconds
+
+        self._entries: OrderedDict[tuple[str, str], tuple[float, EmbeddingVector]] = OrderedDict()
+        self._single_flight = SingleFlight()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    async def embed_texts(self, texts: list[str]) -> EmbeddingMatrix:
+        """Generate embeddings for multiple texts (not cached here)."""
+        return await self.provider.embed_texts(texts)
+
+    async def embed_query(self, query: str) -> EmbeddingVector:
+        """Return the cached query embedding, or compute it once for all concurrent callers."""
+        key = (self.provider.model_name, query)
+        cached = self._get(key)
+        if cached is not None:
+            self.hits += 1
+            return cached
+
+        self.misses += 1
+        return await self._single_flight.do(key, lambda: self._fetch(key, query))
+
+    def clear(self) -> None:
+        """Drop all cached query embeddings."""
+        self._entries.clear()
+
+    def stats(self) -> dict[str, Any]:
+        """Return query cache statistics merged with the wrapped provider's."""
+        lookups = self.hits + self.misses
+        return {
+            **self.provider.stats(),
+            "query_embedding_cache": {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+                "coalesced": self._single_flight.coalesced,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+            },
+        }
+
+    async def open(self) -> None:
+        """Open the wrapped provider."""
+        await self.provider.open()
+
+    async def aclose(self) -> None:
+        """Close the wrapped provider."""
+        await self.provider.aclose()
+
+    @property
+    def model_name(self) -> str:
+        """Return the wrapped provider's model name."""
+        return self.provider.model_name
+
+    @property
+    def dimension(self) -> int:
+        """Return the wrapped provider's embedding dimension."""
+        return self.provider.dimension
+
+    async def _fetch(self, key: tuple[str, str], query: str) -> EmbeddingVector:
+        """Embed a query through the wrapped provider and remember the result."""
+        embedding = as_query_vector(await self.provider.embed_query(query))
+        embedding.flags.writeable = False  # Shared by every caller and the cache
+        self._put(key, embedding)
+        return embedding
+
+    def _get(self, key: tuple[str, str]) -> EmbeddingVector | None:
+        """Look up a live entry and mark it most recently used."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        expires_at, embedding = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            self.expirations += 1
+            return None
+
+        self._entries.move_to_end(key)
+        return embedding
+
+    def _put(self, key: tuple[str, str], embedding: EmbeddingVector) -> None:
+        """Insert an entry, evicting the least recently used ones over ``max_size``."""
+        if self.max_size <= 0 or not is_valid_embedding(embedding):
+            return  # Disabled, or a failed (empty / NaN / zero) embedding
+
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, embedding)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
@@ -0,0 +1,218 @@
+"""
+Client-side load balancing over several Ollama hosts.
+"""
+
+import asyncio
+import itertools
+import time
+from collections.abc import AsyncIterator, Sequence
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import Any
+
+import httpx
+
+from ..config.settings import settings
+from .adaptive_concurrency import is_overload_error
+
+
+def parse_base_urls(value: str | None) -> list[str]:
+    """Split a comma-separated URL list, dropping blanks, trailing slashes and duplicates."""
+    urls: list[str] = []
+    for url in (value or "").split(","):
+        url = url.strip().rstrip("/")
+        if url and url not in urls:
+            urls.append(url)
+    return urls
+
+
+def is_endpoint_failure(error: BaseException) -> bool:
+    """Whether an error says something about the host (unreachable, timeout, 429, 5xx).
+
+    4xx responses such as an unknown model are the request's fault and leave the
+    host's health alone.
+    """
+    return isinstance(error, httpx.TransportError) or is_overload_error(error)
+
+
+@dataclass
+class Endpoint:
+    """One host and its passively observed health."""
+
+    base_url: str
+    outstanding: int = 0
+    requests: int = 0
+    failures: int = 0
+    consecutive_failures: int = 0
+    latency_ewma: float | None = None
+    samples: int = 0
+    ejected_until: float = 0.0
+    ejections: int = 0
+    consecutive_ejections: int = 0
+    last_ejection_reason: str | None = None
+
+    def is_ejected(self, now: float) -> bool:
+        return now < self.ejected_until
+
+
+class EndpointPool:
+    """Spreads requests over hosts by least outstanding requests, with passive health checks.
+
+    No probes are sent: a host is ejected after ``eject_after_failures`` consecutive
+    connection errors, timeouts, 429s or 5xx responses, or when its latency average
+    exceeds ``slow_factor`` times the fastest healthy host's. It is re-admitted after
+    ``ejection_seconds`` (doubling while it keeps getting ejected, up to 10x). If
+    every host is ejected the one due back soonest still takes traffic, so a single
+    host pool behaves exactly like a plain base URL.
+    """
+
+    MIN_SAMPLES_FOR_SLOW = 5
+
+    def __init__(
+        self,
+        base_urls: Sequence[str],
+        eject_after_failures: int | None = None,
+        slow_factor: float | None = None,
+        ejection_seconds: float | None = None,
+        ewma_alpha: float = 0.2,
+    ):
+        urls = parse_base_urls(",".join(base_urls))
+        if not urls:
+            raise ValueError("EndpointPool needs at least one base URL")
+
+        self.endpoints = [Endpoint(url) for url in urls]
+        self.eject_after_failures = max(
+            1, eject_after_failures or settings.ollama_eject_after_failures
+        )
+        self.slow_factor = (
+            slow_factor if slow_factor is not None else settings.ollama_slow_host_factor
+        )
+        self.ejection_seconds = (
+            ejection_seconds if ejection_seconds is not None else settings.ollama_ejection_seconds
+        )
+        self.ewma_alpha = ewma_alpha
+        self._round_robin = itertools.count()
+
+    @classmethod
+    def from_settings(cls, base_url: str | None = None) -> "EndpointPool":
+        """Pool from explicit (comma-separated) URLs, else OLLAMA_BASE_URLS / OLLAMA_BASE_URL."""
+        urls = parse_base_urls(base_url) or parse_base_urls(settings.ollama_base_urls)
+        return cls(urls or [settings.ollama_base_url])
+
+    @property
+    def primary(self) -> str:
+        """First configured host (used for one-off calls such as model auto-detection)."""
+        return self.endpoints[0].base_url
+
+    def __len__(self) -> int:
+        return len(self.endpoints)
+
+    @asynccontextmanager
+    async def request(self) -> AsyncIterator[str]:
+        """Pick a host for one request and record how it went; yields its base URL."""
+        endpoint = self.pick()
+        endpoint.outstanding += 1
+        endpoint.requests += 1
+        started = time.monotonic()
+        try:
+            yield endpoint.base_url
+        except asyncio.CancelledError:
+            raise
+        except BaseException as e:
+            if is_endpoint_failure(e):
+                self._record_failure(endpoint)
+            raise
+        else:
+            self._record_success(endpoint, time.monotonic() - started)
+        finally:
+            endpoint.outstanding -= 1
+
+    def pick(self) -> Endpoint:
+        """Live host with the fewest outstanding requests (then fewest failures, lowest latency)."""
+        now = time.monotonic()
+        live = [endpoint for endpoint in self.endpoints if not endpoint.is_ejected(now)]
+        if not live:
+            return min(self.endpoints, key=lambda endpoint: endpoint.ejected_until)
+
+        offset = next(self._round_robin)  # Rotates among exact ties so idle hosts all get traffic
+        return min(
+            (live[(offset + i) % len(live)] for i in range(len(live))),
+            key=lambda endpoint: (
+                endpoint.outstanding,
+                endpoint.consecutive_failures,
+                endpoint.latency_ewma if endpoint.latency_ewma is not None else 0.0,
+            ),
+        )
+
+    def stats(self) -> dict[str, Any]:
+        """Per-host load, latency and ejection state."""
+        now = time.monotonic()
+        return {
+            "hosts": len(self.endpoints),
+            "healthy": sum(not endpoint.is_ejected(now) for endpoint in self.endpoints),
+            "endpoints": [
+                {
+                    "base_url": endpoint.base_url,
+                    "outstanding": endpoint.outstanding,
+                    "requests": endpoint.requests,
+                    "failures": endpoint.failures,
+                    "latency_ms": (
+                        round(endpoint.latency_ewma * 1000, 1)
+                        if endpoint.latency_ewma is not None
+                        else None
+                    ),
+                    "ejected_for_s": round(max(0.0, endpoint.ejected_until - now), 1),
+                    "ejections": endpoint.ejections,
+                    "last_ejection_reason": endpoint.last_ejection_reason,
+                }
+                for endpoint in self.endpoints
+            ],
+        }
+
+    def _record_success(self, endpoint: Endpoint, latency_seconds: float) -> None:
+        endpoint.consecutive_failures = 0
+        endpoint.samples += 1
+        if endpoint.latency_ewma is None:
+            endpoint.latency_ewma = latency_seconds
+        else:
+            endpoint.latency_ewma += self.ewma_alpha * (latency_seconds - endpoint.latency_ewma)
+
+        if self.slow_factor > 0 and endpoint.samples >= self.MIN_SAMPLES_FOR_SLOW:
+            now = time.monotonic()
+            peers = [
+                other.latency_ewma
+                for other in self.endpoints
+                if other is not endpoint
+                and not other.is_ejected(now)
+                and other.samples >= self.MIN_SAMPLES_FOR_SLOW
+                and other.latency_ewma is not None
+            ]
+            if peers and endpoint.latency_ewma > self.slow_factor * min(peers):
+                self._eject(endpoint, "slow")
+                return
+            endpoint.consecutive_ejections = 0  # Healthy for a full sample window
+
+    def _record_failure(self, endpoint: Endpoint) -> None:
+        endpoint.failures += 1
+        endpoint.consecutive_failures += 1
+        if endpoint.consecutive_failures >= self.eject_after_failures:
+            self._eject(endpoint, "failures")
+
+    def _eject(self, endpoint: Endpoint, reason: str) -> None:
+        now = time.monotonic()
+        if endpoint.is_ejected(now):
+            return
+        endpoint.consecutive_ejections += 1
+        backoff = min(10.0, 2.0 ** (endpoint.consecutive_ejections - 1))
+        endpoint.ejected_until = now + self.ejection_seconds * backoff
+        endpoint.ejections += 1
+        endpoint.last_ejection_reason = reason
+        # Start fresh on re-admission: one failure or fresh latency samples decide again
+        endpoint.consecutive_failures = self.eject_after_failures - 1
+        endpoint.latency_ewma = None
+        endpoint.samples = 0
+        if len(self.endpoints) > 1:
+            print(
+                f"⚠️  Ejected Ollama host {endpoint.base_url} ({reason}) "
+                f"for {self.ejection_seconds * backoff:.0f}s"
+            )
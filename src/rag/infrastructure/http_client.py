@@ -0,0 +1,58 @@
+"""
+Long-lived pooled HTTP client shared by the HTTP-based providers.
+"""
+
+import asyncio
+
+import httpx
+
+from ..config.settings import settings
+
+
+class PooledHTTPClient:
+    """An ``httpx.AsyncClient`` owned by one provider for its whole lifetime.
+
+    The client is opened lazily (or explicitly via ``open()`` from the API lifespan)
+    and keeps connections alive between calls. Callers that drive the provider from
+    several ``asyncio.run`` invocations get a fresh client per event loop, because
+    an httpx client cannot outlive the loop it was created on.
+    """
+
+    def __init__(
+        self,
+        timeout: float,
+        max_connections: int | None = None,
+        max_keepalive_connections: int | None = None,
+        keepalive_expiry: float | None = None,
+        connect_timeout: float | None = None,
+    ):
+        self.timeout = httpx.Timeout(
+            timeout, connect=connect_timeout or settings.http_connect_timeout_seconds
+        )
+        self.limits = httpx.Limits(
+            max_connections=max_connections or settings.http_max_connections,
+            max_keepalive_connections=max_keepalive_connections
+            or settings.http_max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry or settings.http_keepalive_expiry_seconds,
+        )
+        self._client: httpx.AsyncClient | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    async def open(self) -> httpx.AsyncClient:
+        """Open the pooled client on the running event loop."""
+        return self.get()
+
+    def get(self) -> httpx.AsyncClient:
+        """Return the pooled client, creating it on first use in this event loop."""
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._client.is_closed or self._loop is not loop:
+            self._client = httpx.AsyncClient(timeout=self.timeout, limits=self.limits)
+            self._loop = loop
+        return self._client
+
+    async def aclose(self) -> None:
+        """Close the pooled client and release its connections."""
+        client, self._client = self._client, None
+        if client is not None and not client.is_closed and self._loop is asyncio.get_running_loop():
+            await client.aclose()
+        self._loop = None
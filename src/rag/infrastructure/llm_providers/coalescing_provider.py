@@ -0,0 +1,101 @@
+"""
+Single-flight coalescing in front of an LLM provider.
+"""
+
+import json
+from typing import Any
+
+from ...core.interfaces.embeddings import LLMProvider
+from ..singleflight import SingleFlight
+
+
+class CoalescingLLMProvider(LLMProvider):
+    """Concurrent identical ``generate`` calls share one upstream request.
+
+    Requests are identical when model, prompt, temperature, seed and max_tokens
+    match (the ER-extraction and HyDE prompts of simultaneous questions, or the
+    same popular question asked twice). Nothing is cached after the call
+    completes. Everything else is forwarded to the wrapped provider.
+    """
+
+    def __init__(self, provider: LLMProvider) -> None:
+        # Any: seed, default_model and check_health are common to the concrete
+        # providers but not declared on the LLMProvider interface
+        self.provider: Any = provider
+        self._single_flight = SingleFlight()
+        self.requests = 0
+
+    async def generate(
+        self,
+        prompt: str,
+        model: str | None = None,
+        temperature: float = 0.1,
+        max_tokens: int = 500,
+        seed: int | None = None,
+        **kwargs: Any,
+    ) -> str:
+        """Generate text, joining an identical request already in flight."""
+        self.requests += 1
+        key = (
+            model or getattr(self.provider, "default_model", None),
+            prompt,
+            temperature,
+            seed,
+            max_tokens,
+            # JSON, not a tuple of items: kwargs may hold lists or dicts (format schemas, options)
+            json.dumps(kwargs, sort_keys=True, default=repr),
+        )
+        response: str = await self._single_flight.do(
+            key,
+            lambda: self.provider.generate(
+                prompt,
+                model=model,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                seed=seed,
+                **kwargs,
+            ),
+        )
+        return response
+
+    @property
+    def available_models(self) -> list[str]:
+        """Return the wrapped provider's models."""
+        models: list[str] = self.provider.available_models
+        return models
+
+    @property
+    def default_model(self) -> str | None:
+        """Return the wrapped provider's default model."""
+        return getattr(self.provider, "default_model", None)
+
+    @default_model.setter
+    def default_model(self, value: str) -> None:
+        self.provider.default_model = value
+
+    async def check_health(self) -> bool:
+        """Check the wrapped provider's health."""
+        return bool(await self.provider.check_health())
+
+    def stats(self) -> dict[str, Any]:
+        """Return coalescing statistics merged with the wrapped provider's."""
+        provider_stats = self.provider.stats() if hasattr(self.provider, "stats") else {}
+        return {
+            **provider_stats,
+            "llm_coalescing": {
+                "requests": self.requests,
+                "coalesced": self._single_flight.coalesced,
+            },
+        }
+
+    async def open(self) -> None:
+        """Open the wrapped provider."""
+        await self.provider.open()
+
+    async def aclose(self) -> None:
+        """Close the wrapped provider."""
+        await self.provider.aclose()
+
+    def __getattr__(self, name: str) -> Any:
+        # Provider-specific attributes (base_url, endpoints, http, ...) stay reachable
+        return getattr(self.provider, name)
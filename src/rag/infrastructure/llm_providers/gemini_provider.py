@@ -5,6 +5,7 @@ from typing import List, Optional
 import httpx
 from ...core.interfaces.embeddings import LLMProvider
 from ...config.settings import settings
+from ..http_client import PooledHTTPClient
 
 
 class GeminiLLMProvider(LLMProvider):
@@ -27,7 +28,16 @@ class GeminiLLMProvider(LLMProvider):
                 "or pass api_key parameter."
             )
         
-        self._available_models = None
+        self._available_models: list[str] | None = None
+        self.http = PooledHTTPClient(timeout=60.0)
+
+    async def open(self) -> None:
+        """Open the pooled HTTP client."""
+        await self.http.open()
+
+    async def aclose(self) -> None:
+        """Close the pooled HTTP client."""
+        await self.http.aclose()
     
     async def generate(
         self,
@@ -70,32 +80,32 @@ class GeminiLLMProvider(LLMProvider):
             if seed is not None:
                 payload["generationConfig"]["seed"] = seed
             
-            async with httpx.AsyncClient(timeout=60.0) as client:
-                response = await client.post(url, json=payload)
-                response.raise_for_status()
-                
-                result = response.json()
-                
-                # Extract text from Gemini response format
-                if "candidates" in result and len(result["candidates"]) > 0:
-                    candidate = result["candidates"][0]
-                    
-                    # Check for content with parts (standard response)
-                    if "content" in candidate and "parts" in candidate["content"]:
-                        parts = candidate["content"]["parts"]
-                        if len(parts) > 0 and "text" in parts[0]:
-                            return parts[0]["text"].strip()
-                    
-                    # Handle finish reason issues
-                    finish_reason = candidate.get("finishReason", "")
-                    if finish_reason == "MAX_TOKENS":
-                        # Response was truncated - return empty to trigger fallback
-                        return ""
-                    elif finish_reason in ["SAFETY", "RECITATION", "OTHER"]:
-                        return ""
+            client = self.http.get()
+            response = await client.post(url, json=payload)
+            response.raise_for_status()
+
+            result = response.json()
+
+            # Extract text from Gemini response format
+            if "candidates" in result and len(result["candidates"]) > 0:
+                candidate = result["candidates"][0]
                 
-                raise RuntimeError(f"Unexpected Gemini response format: {result}")
+                # Check for content with parts (standard response)
+                if "content" in candidate and "parts" in candidate["content"]:
+                    parts = candidate["content"]["parts"]
+                    if len(parts) > 0 and "text" in parts[0]:
+                        return str(parts[0]["text"]).strip()
                 
+                # Handle finish reason issues
+                finish_reason = candidate.get("finishReason", "")
+                if finish_reason == "MAX_TOKENS":
+                    # Response was truncated - return empty to trigger fallback
+                    return ""
+                elif finish_reason in ["SAFETY", "RECITATION", "OTHER"]:
+                    return ""
+
+            raise RuntimeError(f"Unexpected Gemini response format: {result}")
+
         except httpx.HTTPStatusError as e:
             error_detail = e.response.text if hasattr(e.response, 'text') else str(e)
             raise RuntimeError(f"Failed to generate text with Gemini (HTTP {e.response.status_code}): {error_detail}")
@@ -112,36 +122,36 @@ class GeminiLLMProvider(LLMProvider):
             # Get models from Gemini API
             url = f"{self.base_url}/models?key={self.api_key}"
             
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.get(url)
-                response.raise_for_status()
-                
-                result = response.json()
-                
-                # Filter for text generation models (exclude embeddings, vision, etc.)
-                chat_models = []
-                if "models" in result:
-                    for model in result["models"]:
-                        model_name = model.get("name", "")
-                        # Extract model ID (remove 'models/' prefix)
-                        if model_name.startswith("models/"):
-                            model_id = model_name[7:]
-                        else:
-                            model_id = model_name
-                        
-                        # Only accept gemini-2.5-pro and gemini-2.5-flash (stable versions)
-                        if model_id in ["gemini-2.5-pro", "gemini-2.5-flash"]:
-                            # Check if it supports generateContent method
-                            supported_methods = model.get("supportedGenerationMethods", [])
-                            if "generateContent" in supported_methods:
-                                chat_models.append(model_id)
-                
-                # Sort: Pro first, then Flash
-                chat_models.sort(key=lambda x: 0 if "pro" in x else 1)
-                
-                self._available_models = chat_models
-                return self._available_models
-                
+            client = self.http.get()
+            response = await client.get(url, timeout=30.0)
+            response.raise_for_status()
+
+            result = response.json()
+
+            # Filter for text generation models (exclude embeddings, vision, etc.)
+            chat_models = []
+            if "models" in result:
+                for model in result["models"]:
+                    model_name = model.get("name", "")
+                    # Extract model ID (remove 'models/' prefix)
+                    if model_name.startswith("models/"):
+                        model_id = model_name[7:]
+                    else:
+                        model_id = model_name
+
+                    # Only accept gemini-2.5-pro and gemini-2.5-flash (stable versions)
+                    if model_id in ["gemini-2.5-pro", "gemini-2.5-flash"]:
+                        # Check if it supports generateContent method
+                        supported_methods = model.get("supportedGenerationMethods", [])
+                        if "generateContent" in supported_methods:
+                            chat_models.append(model_id)
+
+            # Sort: Pro first, then Flash
+            chat_models.sort(key=lambda x: 0 if "pro" in x else 1)
+
+            self._available_models = chat_models
+            return self._available_models
+
         except Exception as e:
             # If API call fails, return default models (Pro and Flash only)
             print(f"Warning: Could not fetch Gemini models: {e}")
@@ -156,10 +166,10 @@ class GeminiLLMProvider(LLMProvider):
             # Try to list models as a health check
             url = f"{self.base_url}/models?key={self.api_key}"
             
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                response = await client.get(url)
-                return response.status_code == 200
-                
+            client = self.http.get()
+            response = await client.get(url, timeout=10.0)
+            return response.status_code == 200
+
         except Exception:
             return False
 
@@ -0,0 +1,50 @@
+"""
+Single-flight: identical concurrent calls share one in-flight request.
+"""
+
+import asyncio
+import functools
+from collections.abc import Callable, Coroutine, Hashable
+from typing import Any, TypeVar
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """Deduplicate concurrent async calls by key.
+
+    The first caller for a key starts the work; callers arriving while it is in
+    flight await the same task. Results are not kept after completion - caching
+    is the caller's job. A caller being cancelled does not cancel the shared task
+    for the others.
+    """
+
+    def __init__(self) -> None:
+        self._in_flight: dict[Hashable, asyncio.Task[Any]] = {}
+        self.coalesced = 0
+
+    async def do(self, key: Hashable, fn: Callable[[], Coroutine[Any, Any, T]]) -> T:
+        """Run ``fn`` for ``key`` unless an identical call is already in flight."""
+        loop = asyncio.get_running_loop()
+        task = self._in_flight.get(key)
+
+        if task is not None and not task.done() and task.get_loop() is loop:
+            self.coalesced += 1
+        else:
+            task = loop.create_task(fn())
+            self._in_flight[key] = task
+            task.add_done_callback(functools.partial(self._forget, key))
+
+        return await asyncio.shield(task)
+
+    @property
+    def in_flight(self) -> int:
+        """Number of distinct calls currently running."""
+        return len(self._in_flight)
+
+    def _forget(self, key: Hashable, task: asyncio.Task[Any]) -> None:
+        """Drop a finished task (only if it is still the registered one)."""
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
+        if not task.cancelled():
+            task.exception()  # Mark retrieved; the awaiting callers already received it
@@ -0,0 +1,305 @@
+"""
+On-disk storage shared by the NumPy-based vector stores.
+
+Float32 vectors live in an append-only file that is memory-mapped for reads;
+chunk text and metadata live in SQLite. Chunk ids, doc ids, metadata and a
+liveness mask are kept in memory for filtering.
+
+Every method blocks (file, memmap and SQLite I/O); the async stores call them
+from worker threads and serialize access with their own lock.
+"""
+
+import json
+import shutil
+import sqlite3
+import threading
+from collections.abc import Iterator, Sequence
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from ...core.models.documents import DocumentChunk
+from .filters import matches_where
+
+
+class VectorArrayStorage:
+    """Append-only float32 vector file plus chunk records, addressed by row number.
+
+    Rows are never reused: deleting a document tombstones its rows, and adding a
+    chunk id that already exists tombstones the old row before appending.
+    """
+
+    VECTORS_FILE = "vectors.f32"
+    RECORDS_FILE = "records.sqlite"
+
+    def __init__(self, directory: Path) -> None:
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+
+        # Filled in by _open()
+        self._conn: sqlite3.Connection
+        self.dimension: int | None = None
+        self.chunk_ids: list[str] = []
+        self.doc_ids: list[str] = []
+        self.metadatas: list[dict[str, Any]] = []
+        self.alive: np.ndarray = np.zeros(0, dtype=bool)
+        self._row_by_id: dict[str, int] = {}
+        self._vectors: np.memmap | None = None
+        self._open()
+
+    @property
+    def vectors_path(self) -> Path:
+        return self.directory / self.VECTORS_FILE
+
+    @property
+    def size(self) -> int:
+        """Number of rows, including tombstoned ones."""
+        return len(self.chunk_ids)
+
+    @property
+    def live_count(self) -> int:
+        """Number of rows that have not been deleted."""
+        return int(self.alive.sum())
+
+    def append(
+        self,
+        chunks: Sequence[DocumentChunk],
+        chunk_ids: Sequence[str],
+        embeddings: np.ndarray,
+        doc_name: str,
+    ) -> np.ndarray:
+        """Persist chunks and their vectors; returns the new row numbers."""
+        vectors = np.ascontiguousarray(embeddings, dtype=np.float32)
+        if vectors.ndim != 2 or len(vectors) != len(chunks):
+            raise ValueError("Number of chunks must match number of embeddings")
+        if self.dimension is None:
+            self.dimension = int(vectors.shape[1])
+        elif vectors.shape[1] != self.dimension:
+            raise ValueError(
+                f"Embedding dimension {vectors.shape[1]} does not match "
+                f"store dimension {self.dimension}"
+            )
+
+        with self._lock:
+            start = self.size
+            rows = np.arange(start, start + len(chunks))
+            records = []
+            replaced = []
+            for row, chunk_id, chunk in zip(rows, chunk_ids, chunks, strict=True):
+                metadata = self.build_metadata(chunk, doc_name)
+                if chunk_id in self._row_by_id:
+                    replaced.append(self._row_by_id[chunk_id])
+                records.append(
+                    (
+                        int(row),
+                        chunk_id,
+                        chunk.doc_id,
+                        chunk.content,
+                        json.dumps(metadata, default=str),
+                    )
+                )
+                self._row_by_id[chunk_id] = int(row)
+                self.chunk_ids.append(chunk_id)
+                self.doc_ids.append(chunk.doc_id)
+                self.metadatas.append(metadata)
+
+            # Vectors first: a crash before the commit leaves only trailing bytes, trimmed on open
+            with open(self.vectors_path, "ab") as f:
+                f.write(vectors.tobytes())
+
+            with self._conn:
+                if replaced:
+                    self._conn.executemany(
+                        "UPDATE records SET deleted = 1 WHERE row = ?", [(row,) for row in replaced]
+                    )
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO records "
+                    "(row, chunk_id, doc_id, content, metadata, deleted) VALUES (?, ?, ?, ?, ?, 0)",
+                    records,
+                )
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO meta (key, value) VALUES ('dimension', ?)",
+                    (str(self.dimension),),
+                )
+
+            self.alive = np.concatenate([self.alive, np.ones(len(chunks), dtype=bool)])
+            if replaced:
+                self.alive[replaced] = False
+            self._vectors = None  # Re-map with the new length on next read
+        return rows
+
+    def delete_document(self, doc_id: str) -> np.ndarray:
+        """Tombstone all rows of a document; returns the deleted row numbers."""
+        with self._lock:
+            rows = np.array(
+                [
+                    row
+                    for row, row_doc in enumerate(self.doc_ids)
+                    if row_doc == doc_id and self.alive[row]
+                ],
+                dtype=np.int64,
+            )
+            if len(rows) == 0:
+                return rows
+            with self._conn:
+                self._conn.execute("UPDATE records SET deleted = 1 WHERE doc_id = ?", (doc_id,))
+            self.alive[rows] = False
+            for row in rows:
+                if self._row_by_id.get(self.chunk_ids[row]) == row:
+                    del self._row_by_id[self.chunk_ids[row]]
+        return rows
+
+    def vectors(self) -> np.ndarray:
+        """Memory-mapped (rows, dimension) float32 view of all stored vectors."""
+        if self._vectors is None:
+            if self.size == 0 or self.dimension is None:
+                return np.empty((0, self.dimension or 0), dtype=np.float32)
+            self._vectors = np.memmap(
+                self.vectors_path, dtype=np.float32, mode="r", shape=(self.size, self.dimension)
+            )
+        return self._vectors
+
+    def get_vectors(self, rows: np.ndarray) -> np.ndarray:
+        """Read the float32 vectors of the given rows (touches only their pages)."""
+        return np.asarray(self.vectors()[np.asarray(rows, dtype=np.int64)], dtype=np.float32)
+
+    def iter_vector_blocks(self, block_rows: int = 65536) -> Iterator[tuple[int, np.ndarray]]:
+        """Yield ``(start, block)`` slices of the vector file for whole-store passes."""
+        vectors = self.vectors()
+        for start in range(0, len(vectors), block_rows):
+            yield start, np.asarray(vectors[start : start + block_rows], dtype=np.float32)
+
+    def candidate_mask(self, filters: dict[str, Any] | None = None) -> np.ndarray:
+        """Live rows that satisfy a Chroma-style ``where`` filter."""
+        mask: np.ndarray = self.alive.copy()
+        if not filters:
+            return mask
+        for row in np.flatnonzero(mask):
+            if not matches_where(self.metadatas[row], filters):
+                mask[row] = False
+        return mask
+
+    def hydrate(
+        self,
+        rows: Sequence[int] | np.ndarray,
+        distances: Sequence[float] | np.ndarray,
+        include_content: bool = True,
+    ) -> list[dict[str, Any]]:
+        """Build search results (same shape as ChromaVectorStore) for ranked rows."""
+        row_numbers = [int(row) for row in rows]
+        if not row_numbers:
+            return []
+
+        content_by_row = self._contents(row_numbers) if include_content else {}
+
+        results = []
+        for row, distance in zip(row_numbers, distances, strict=True):
+            metadata = self.metadatas[row]
+            results.append(
+                {
+                    "chunk_id": self.chunk_ids[row],
+                    "content": content_by_row.get(row, "") if include_content else None,
+                    "score": max(
+                        0.0, min(1.0, 1.0 / (1.0 + float(distance)))
+                    ),  # Same normalization as Chroma (squared L2)
+                    "doc_id": metadata.get("doc_id", ""),
+                    "document_name": metadata.get("document_name", "Unknown"),
+                    "chunk_type": metadata.get("chunk_type", "text"),
+                    "section": metadata.get("section", ""),
+                    "page_num": metadata.get("page_num"),
+                    "metadata": metadata,
+                }
+            )
+        return results
+
+    def get_contents(self, chunk_ids: Sequence[str]) -> dict[str, str]:
+        """Content of live chunks by chunk id."""
+        rows = [self._row_by_id[chunk_id] for chunk_id in chunk_ids if chunk_id in self._row_by_id]
+        return {self.chunk_ids[row]: content for row, content in self._contents(rows).items()}
+
+    def document_count(self) -> int:
+        """Number of distinct documents with at least one live chunk."""
+        return len({self.doc_ids[row] for row in np.flatnonzero(self.alive)})
+
+    def reset(self) -> None:
+        """Delete all stored vectors and records."""
+        with self._lock:
+            self._conn.close()
+            shutil.rmtree(self.directory, ignore_errors=True)
+            self.directory.mkdir(parents=True, exist_ok=True)
+            self._open()
+
+    @staticmethod
+    def build_metadata(chunk: DocumentChunk, doc_name: str) -> dict[str, Any]:
+        """Chunk metadata in the same layout ChromaVectorStore stores."""
+        metadata = {
+            "doc_id": chunk.doc_id,
+            "document_name": doc_name,
+            "chunk_type": chunk.chunk_type,
+            "section": chunk.section or "",
+            **chunk.metadata,
+        }
+        if chunk.page_num is not None:
+            metadata["page_num"] = chunk.page_num
+        return metadata
+
+    def _contents(self, rows: Sequence[int]) -> dict[int, str]:
+        if not rows:
+            return {}
+        placeholders = ",".join("?" * len(rows))
+        return dict(
+            self._conn.execute(
+                f"SELECT row, content FROM records WHERE row IN ({placeholders})", rows
+            ).fetchall()
+        )
+
+    def _open(self) -> None:
+        """Open SQLite and load the in-memory row index."""
+        self._conn = sqlite3.connect(
+            str(self.directory / self.RECORDS_FILE), check_same_thread=False
+        )
+        with self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS records (
+                    row INTEGER PRIMARY KEY,
+                    chunk_id TEXT NOT NULL,
+                    doc_id TEXT NOT NULL,
+                    content TEXT NOT NULL,
+                    metadata TEXT NOT NULL,
+                    deleted INTEGER NOT NULL DEFAULT 0
+                )
+                """)
+            self._conn.execute("CREATE INDEX IF NOT EXISTS records_doc_id ON records (doc_id)")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)"
+            )
+
+        row = self._conn.execute("SELECT value FROM meta WHERE key = 'dimension'").fetchone()
+        self.dimension = int(row[0]) if row else None
+
+        self.chunk_ids = []
+        self.doc_ids = []
+        self.metadatas = []
+        self._row_by_id = {}
+        alive = []
+        for row_num, chunk_id, doc_id, metadata, deleted in self._conn.execute(
+            "SELECT row, chunk_id, doc_id, metadata, deleted FROM records ORDER BY row"
+        ):
+            self.chunk_ids.append(chunk_id)
+            self.doc_ids.append(doc_id)
+            self.metadatas.append(json.loads(metadata))
+            alive.append(not deleted)
+            if not deleted:
+                self._row_by_id[chunk_id] = row_num
+        self.alive = np.array(alive, dtype=bool)
+
+        # Drop vectors written by an add that crashed before its records were committed
+        if self.dimension and self.vectors_path.exists():
+            expected_bytes = self.size * self.dimension * 4
+            if self.vectors_path.stat().st_size > expected_bytes:
+                with open(self.vectors_path, "r+b") as f:
+                    f.truncate(expected_bytes)
+        self._vectors = None
@@ -0,0 +1,98 @@
+"""
+ChromaDB client factory (embedded or client/server) and retries for client calls.
+"""
+
+import time
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any, TypeVar
+
+import httpx
+from chromadb.config import Settings
+
+from ...config.settings import settings
+
+T = TypeVar("T")
+
+RETRYABLE_STATUS_CODES = {429, 502, 503, 504}
+
+
+def create_chroma_client(
+    mode: str | None = None,
+    path: Path | None = None,
+    host: str | None = None,
+    port: int | None = None,
+) -> Any:
+    """Build the configured ChromaDB client.
+
+    ``embedded`` opens a ``PersistentClient`` on the local directory; only one
+    process may use it at a time. ``http`` talks to a Chroma server
+    (``python main.py chroma-server``) over a pooled keep-alive connection, so any
+    number of API workers and the OCR pipeline can share one index.
+    """
+    # Disable telemetry
+    import chromadb.telemetry
+
+    chromadb.telemetry.telemetry = None  # type: ignore[attr-defined]
+
+    mode = (mode or settings.chroma_mode).lower()
+    if mode == "embedded":
+        return chromadb.PersistentClient(
+            path=str(path or settings.chromadb_dir),
+            settings=Settings(anonymized_telemetry=False, allow_reset=True),
+        )
+    if mode == "http":
+        host = host or settings.chroma_host
+        port = port or settings.chroma_port
+        client = with_retries(
+            chromadb.HttpClient,
+            host=host,
+            port=port,
+            ssl=settings.chroma_ssl,
+            settings=Settings(
+                anonymized_telemetry=False,
+                chroma_http_max_connections=settings.chroma_http_max_connections,
+                chroma_http_max_keepalive_connections=settings.chroma_http_max_connections,
+                chroma_http_keepalive_secs=settings.http_keepalive_expiry_seconds,
+            ),
+        )
+        print(f"🔌 Connected to Chroma server at {host}:{port}")
+        return client
+    raise ValueError(f"Unknown CHROMA_MODE '{mode}' (expected 'embedded' or 'http')")
+
+
+def with_retries(
+    fn: Callable[..., T], *args: Any, max_retries: int | None = None, **kwargs: Any
+) -> T:
+    """Call ``fn``, retrying connection errors and overloaded-server responses with backoff.
+
+    Only transport failures (refused/reset connections, timeouts) and 429/502/503/504
+    are retried; ChromaDB errors about the request itself are raised at once. Writes
+    are safe to repeat because chunk ids are fixed before the first attempt.
+    """
+    max_retries = settings.chroma_max_retries if max_retries is None else max_retries
+    for attempt in range(max_retries):
+        try:
+            return fn(*args, **kwargs)
+        except Exception as e:
+            if not _is_retryable(e):
+                raise
+            wait_time = 0.5 * 2**attempt  # 0.5s, 1s, 2s, ...
+            print(
+                f"    Chroma {type(e).__name__} on attempt {attempt + 1}/{max_retries + 1}, "
+                f"retrying in {wait_time}s..."
+            )
+            time.sleep(wait_time)
+    return fn(*args, **kwargs)
+
+
+def _is_retryable(error: BaseException | None) -> bool:
+    # HttpClient() reports an unreachable server as a ValueError raised while handling ConnectError
+    if isinstance(error, ValueError):
+        error = error.__context__
+    if isinstance(error, httpx.TransportError):
+        return True
+    return (
+        isinstance(error, httpx.HTTPStatusError)
+        and error.response.status_code in RETRYABLE_STATUS_CODES
+    )
@@ -1,76 +1,315 @@
 """
 ChromaDB vector store implementation.
 """
+import asyncio
+import heapq
+import itertools
 import uuid
-from typing import List, Dict, Any, Optional
-import chromadb
-from chromadb.config import Settings
-from chromadb.errors import NotFoundError
+from collections import OrderedDict, defaultdict
+from collections.abc import Sequence
+from typing import Any
+
+from ...config.settings import settings
 from ...core.interfaces.embeddings import VectorStore
 from ...core.models.documents import DocumentChunk
-from ...config.settings import settings
+from ...core.models.embeddings import (
+    EmbeddingsLike,
+    EmbeddingVector,
+    as_embedding_matrix,
+    as_query_vector,
+)
+from ..blocking_pool import BlockingCallPool
+from ..document_registry import DocumentRegistry
+from .chroma_client import create_chroma_client, with_retries
+from .collection_alias import CollectionAlias
+from .sharding import ShardLayout, open_shards
 
 
 class ChromaVectorStore(VectorStore):
-    """ChromaDB-based vector store implementation."""
+    """ChromaDB-based vector store implementation.
     
-    def __init__(self, collection_name: str = None):
-        self.collection_name = collection_name or settings.chroma_collection_name
-        self.client = None
-        self.collection = None
+    Statistics come from a ``DocumentRegistry`` sidecar maintained by ``add_chunks``
+    and ``delete_document``, so ``get_stats`` reads nothing from ChromaDB. The
+    registry is rebuilt from the collection if its chunk total disagrees with the
+    shard counts when a version is opened or switched to, or after a write whose
+    registry update failed.
+
+    Searches with ``include_content=False`` skip documents in the ChromaDB query;
+    ``get_chunk_texts`` then serves the survivors from an LRU of chunk texts and
+    fetches misses with one ``get(ids=...)``.
+
+    The ChromaDB client is synchronous, so every call runs on a bounded thread
+    pool instead of the event loop: queries and gets on a read pool, adds and
+    deletes on a separate write pool, so searches keep going during a bulk load.
+    The client is embedded or talks to a Chroma server (``CHROMA_MODE``); calls are
+    retried on connection errors either way.
+
+    ``collection_name`` is an alias for the live version of a versioned collection
+    (see ``CollectionAlias``). A reindex fills a new version from ``create_version``
+    while this store keeps serving the old one, then ``promote`` switches the alias;
+    stores in other processes follow the switch on their next call. ``rollback``
+    switches back to the previous version and ``garbage_collect`` drops old ones.
+
+    A version can be sharded over several ChromaDB collections (``CHROMA_SHARDS``,
+    routed by ``CHROMA_SHARD_KEY``, see ``ShardLayout``). Writes go to each shard in
+    parallel; searches query the shards a filter can match concurrently and merge
+    their top-k with a heap. The layout is recorded on the shard collections, so an
+    existing version keeps its layout and a reindex applies a new one.
+    """
+
+    supports_projection = True
+
+    def __init__(
+        self,
+        collection_name: str | None = None,
+        client: Any | None = None,
+        registry: DocumentRegistry | None = None,
+        alias: CollectionAlias | None = None,
+        shards: int | None = None,
+        shard_key: str | None = None
+    ):
+        alias_name = collection_name or settings.chroma_collection_name
+        # Alias and registry files only for the default persistent client;
+        # injected clients keep them in memory
+        if alias is None:
+            alias = (
+                CollectionAlias.for_collection(alias_name)
+                if client is None
+                else CollectionAlias(alias_name)
+            )
+        self.alias = alias
+        self.collection_name = self.alias.active
+        if registry is None:
+            registry = self._new_registry(self.collection_name, persistent=client is None)
+        self.registry = registry
+        self.client: Any = client  # Defaults to create_chroma_client() (settings.chroma_mode)
+        # Layout for collections created by this store;
+        # existing ones keep the layout they were built with
+        self.default_layout = ShardLayout(
+            shards or settings.chroma_shards, shard_key or settings.chroma_shard_key
+        )
+        self.layout = self.default_layout
+        self.collections: list[Any] = []  # One per shard
+        self.text_cache_size = settings.chunk_text_cache_size
+        self._texts: OrderedDict[str, tuple[str, str]] = (
+            OrderedDict()
+        )  # chunk_id -> (doc_id, content)
+        self.text_cache_hits = 0
+        self.text_cache_misses = 0
+        # At least one thread per shard, so a fan-out is not serialized
+        self.read_pool = BlockingCallPool(
+            "chroma-read", max(settings.chroma_read_threads, self.default_layout.count)
+        )
+        self.write_pool = BlockingCallPool(
+            "chroma-write", max(settings.chroma_write_threads, self.default_layout.count)
+        )
         self._initialize_client()
     
     def _initialize_client(self):
         """Initialize ChromaDB client and collection."""
         try:
-            # Disable telemetry
-            import chromadb.telemetry
-            chromadb.telemetry.telemetry = None
+            if self.client is None:
+                self.client = create_chroma_client()
             
-            self.client = chromadb.PersistentClient(
-                path=str(settings.chromadb_dir),
-                settings=Settings(
-                    anonymized_telemetry=False,
-                    allow_reset=True
-                )
-            )
-            
-            # Get or create collection
-            try:
-                self.collection = self.client.get_collection(name=self.collection_name)
-            except (NotFoundError, ValueError):  # Catch ChromaDB NotFoundError and ValueError
-                self.collection = self.client.create_collection(
-                    name=self.collection_name,
-                    metadata={"description": "Document chunks for RAG"}
-                )
+            # Get or create collection (all of its shards)
+            self.layout, self.collections = self._open_shards(self.collection_name)
+            self.registry.sync_with_collections(self.collections)
                 
         except Exception as e:
             raise RuntimeError(f"Failed to initialize ChromaDB: {e}")
     
+    @property
+    def collection(self) -> Any:
+        """The ChromaDB collection of an unsharded version (the first shard otherwise)."""
+        return self.collections[0]
+
+    def _open_shards(
+        self, collection_name: str, create: bool = True
+    ) -> tuple[ShardLayout, list[Any]]:
+        """Open the shard collections of a version (created with the default layout if missing)."""
+        return open_shards(self.client, collection_name, self.default_layout, create=create)
+
+    @staticmethod
+    def _new_registry(collection_name: str, persistent: bool) -> DocumentRegistry:
+        return (
+            DocumentRegistry.for_collection(collection_name) if persistent else DocumentRegistry()
+        )
+
+    def _bind(
+        self,
+        collection_name: str,
+        layout: ShardLayout,
+        collections: list[Any],
+        registry: DocumentRegistry
+    ) -> None:
+        """Serve another version; in-flight calls finish against the collections they started on."""
+        registry.sync_with_collections(collections)
+        self._serve(collection_name, layout, collections, registry)
+
+    def _serve(
+        self,
+        collection_name: str,
+        layout: ShardLayout,
+        collections: list[Any],
+        registry: DocumentRegistry
+    ) -> None:
+        self.collection_name = collection_name
+        self.layout = layout
+        self.collections = collections
+        self.registry = registry
+        self._texts.clear()
+
+    def _open_version(
+        self, collection_name: str
+    ) -> tuple[ShardLayout, list[Any], DocumentRegistry]:
+        """Open an existing version and its synced registry (blocking; runs on the read pool)."""
+        layout, collections = self._open_shards(collection_name, create=False)
+        registry = self._new_registry(collection_name, self.registry.path is not None)
+        registry.sync_with_collections(collections)
+        return layout, collections, registry
+
+    async def _follow_alias(self) -> None:
+        """Switch to the alias target if another process moved it.
+
+        Only the alias file's mtime is checked on the event loop; opening the new
+        version and syncing its registry run on the read pool.
+        """
+        if not self.alias.refresh() or self.alias.active == self.collection_name:
+            return
+        target = self.alias.active
+        try:
+            layout, collections, registry = await self.read_pool.run(self._open_version, target)
+        except Exception as e:
+            print(f"⚠️  Collection alias points at {target}, which cannot be opened: {e}")
+            return
+        if self.alias.active != target:
+            return  # Moved again while opening; the next call follows it
+        self._serve(target, layout, collections, registry)
+        print(f"🔀 Now serving collection {self.collection_name}")
+
+    def _physical_names(self) -> list[str]:
+        return [
+            getattr(collection, "name", collection) for collection in self.client.list_collections()
+        ]
+
+    def _version_names(self) -> list[str]:
+        return self.alias.versions(
+            {ShardLayout.logical_name(name) for name in self._physical_names()}
+        )
+
+    def create_version(self) -> "ChromaVectorStore":
+        """An empty new version of this collection to build a reindex into, not yet served."""
+        try:
+            name = self.alias.next_version(self._version_names())
+            return ChromaVectorStore(
+                collection_name=name,
+                client=self.client,
+                registry=self._new_registry(name, self.registry.path is not None),
+                alias=CollectionAlias(name),
+                shards=self.default_layout.count,
+                shard_key=self.default_layout.key
+            )
+        except Exception as e:
+            raise RuntimeError(f"Failed to create collection version: {e}") from e
+
+    def promote(self, version: "ChromaVectorStore") -> str:
+        """Atomically switch the alias (and this store) to a built version; returns the old one."""
+        try:
+            replaced = self.alias.switch(version.collection_name)
+            self._bind(
+                version.collection_name, version.layout, version.collections, version.registry
+            )
+            version.close()
+            print(
+                f"🔀 Collection alias {self.alias.alias} -> {self.collection_name} (was {replaced})"
+            )
+            return replaced
+        except Exception as e:
+            raise RuntimeError(f"Failed to promote collection version: {e}") from e
+
+    def rollback(self) -> str:
+        """Switch the alias back to the previously active version; returns it."""
+        try:
+            self.alias.refresh()
+            target = self.alias.previous[0] if self.alias.previous else None
+            if target is None:
+                raise ValueError("no previous version")
+            layout, collections = self._open_shards(target, create=False)
+            self.alias.rollback()
+            self._bind(
+                target,
+                layout,
+                collections,
+                self._new_registry(target, self.registry.path is not None),
+            )
+            print(f"↩️  Collection alias {self.alias.alias} -> {target}")
+            return target
+        except Exception as e:
+            raise RuntimeError(f"Failed to roll back collection: {e}") from e
+
+    def discard_version(self, version: "ChromaVectorStore") -> None:
+        """Drop a version that was built but not promoted."""
+        if version.collection_name == self.collection_name:
+            raise ValueError("Cannot discard the active collection version")
+        try:
+            version.close()
+            for collection in version.collections:
+                self.client.delete_collection(name=collection.name)
+            DocumentRegistry.remove_for_collection(version.collection_name)
+        except Exception as e:
+            raise RuntimeError(f"Failed to discard collection version: {e}") from e
+
+    def garbage_collect(self, keep_previous: int | None = None) -> list[str]:
+        """Delete versions beyond the ``keep_previous`` latest rollback targets; returns them."""
+        keep_previous = settings.chroma_versions_to_keep if keep_previous is None else keep_previous
+        try:
+            self.alias.refresh()
+            keep = {self.alias.active, *self.alias.previous[:max(0, keep_previous)]}
+            removed = [name for name in self._version_names() if name not in keep]
+            for physical_name in self._physical_names():
+                if ShardLayout.logical_name(physical_name) in removed:
+                    self.client.delete_collection(name=physical_name)
+            if self.registry.path is not None:
+                for name in removed:
+                    DocumentRegistry.remove_for_collection(name)
+            self.alias.forget(removed)
+            if removed:
+                print(f"🧹 Removed old collection versions: {', '.join(removed)}")
+            return removed
+        except Exception as e:
+            raise RuntimeError(f"Failed to garbage-collect collection versions: {e}") from e
+
+    def close(self) -> None:
+        """Stop the thread pools (the client and collection stay usable by other stores)."""
+        self.read_pool.shutdown(wait=False)
+        self.write_pool.shutdown(wait=False)
+
     async def add_chunks(
         self,
-        chunks: List[DocumentChunk],
-        embeddings: List[List[float]],
-        doc_name: str
+        chunks: list[DocumentChunk],
+        embeddings: EmbeddingsLike,
+        doc_name: str,
+        embedding_model: str | None = None
     ) -> None:
         """Add document chunks with their embeddings."""
         if len(chunks) != len(embeddings):
             raise ValueError("Number of chunks must match number of embeddings")
-        
+
+        # ChromaDB takes the float32 matrix directly - no per-row Python lists
+        embedding_matrix = as_embedding_matrix(embeddings)
+
         # Prepare data for ChromaDB
         ids = []
         documents = []
         metadatas = []
-        embeddings_list = []
-        
-        for chunk, embedding in zip(chunks, embeddings):
+
+        for chunk in chunks:
             # Use chunk_id or generate one if missing
             chunk_id = chunk.chunk_id or str(uuid.uuid4())
-            
+
             ids.append(chunk_id)
             documents.append(chunk.content)
-            embeddings_list.append(embedding)
-            
+
             metadata = {
                 "doc_id": chunk.doc_id,
                 "document_name": doc_name,
@@ -78,122 +317,264 @@ class ChromaVectorStore(VectorStore):
                 "section": chunk.section or "",
                 **chunk.metadata
             }
-            
+
             if chunk.page_num is not None:
                 metadata["page_num"] = chunk.page_num
-                
+
             metadatas.append(metadata)
-        
+
+        await self.add_records(ids, documents, embedding_matrix, metadatas, embedding_model)
+
+    async def add_records(
+        self,
+        ids: list[str],
+        documents: list[str],
+        embeddings: EmbeddingsLike,
+        metadatas: list[dict[str, Any]],
+        embedding_model: str | None = None
+    ) -> None:
+        """Add already-formatted ChromaDB records (used by ``add_chunks`` and snapshot imports)."""
+        await self._follow_alias()
+        embedding_matrix = as_embedding_matrix(embeddings)
+
+        # Group rows by shard; shards are written in parallel
+        layout, collections = self.layout, self.collections
+        rows_by_shard: dict[int, list[int]] = defaultdict(list)
+        for row, metadata in enumerate(metadatas):
+            rows_by_shard[layout.shard_of(metadata)].append(row)
+
         try:
-            self.collection.add(
-                ids=ids,
-                documents=documents,
-                embeddings=embeddings_list,
-                metadatas=metadatas
+            await asyncio.gather(
+                *[
+                    self.write_pool.run(
+                        with_retries,
+                        collections[shard].add,
+                        ids=[ids[row] for row in rows],
+                        documents=[documents[row] for row in rows],
+                        embeddings=(
+                            embedding_matrix if len(rows) == len(ids) else embedding_matrix[rows]
+                        ),
+                        metadatas=[metadatas[row] for row in rows],
+                    )
+                    for shard, rows in rows_by_shard.items()
+                ]
             )
         except Exception as e:
             raise RuntimeError(f"Failed to add chunks to ChromaDB: {e}")
-    
+
+        try:
+            await self.write_pool.run(self.registry.record_chunks, ids, metadatas, embedding_model)
+        except Exception as e:
+            # The chunks are stored; rebuild the registry from the collection instead
+            print(f"⚠️  Document registry update failed: {e}")
+            await self._resync_registry()
+
     async def search_similar(
         self,
-        query_embedding: List[float],
+        query_embedding: EmbeddingVector | Sequence[float],
         limit: int = 5,
-        filters: Optional[Dict[str, Any]] = None
-    ) -> List[Dict[str, Any]]:
+        filters: dict[str, Any] | None = None
+    ) -> list[dict[str, Any]]:
         """Search for similar chunks."""
-        try:
-            where_clause = filters or {}
-            
-            results = self.collection.query(
-                query_embeddings=[query_embedding],
-                n_results=limit,
-                where=where_clause if where_clause else None
+        return (
+            await self.search_similar_many(
+                as_query_vector(query_embedding).reshape(1, -1), limit, filters
             )
+        )[0]
             
-            # Convert ChromaDB results to our format
-            search_results = []
-            
-            if results["ids"] and results["ids"][0]:
-                for i in range(len(results["ids"][0])):
-                    result = {
-                        "chunk_id": results["ids"][0][i],
-                        "content": results["documents"][0][i],
-                        "score": max(0.0, min(1.0, 1.0 / (1.0 + results["distances"][0][i]))),  # Normalize distance to 0-1 similarity
-                        "doc_id": results["metadatas"][0][i].get("doc_id", ""),
-                        "document_name": results["metadatas"][0][i].get("document_name", "Unknown"),
-                        "chunk_type": results["metadatas"][0][i].get("chunk_type", "text"),
-                        "section": results["metadatas"][0][i].get("section", ""),
-                        "page_num": results["metadatas"][0][i].get("page_num"),
-                        "metadata": results["metadatas"][0][i]
-                    }
-                    search_results.append(result)
-            
-            return search_results
+    async def search_similar_many(
+        self,
+        query_embeddings: EmbeddingsLike,
+        limit: int = 5,
+        filters: dict[str, Any] | None = None,
+        include_content: bool = True
+    ) -> list[list[dict[str, Any]]]:
+        """Search for several query vectors in a single ChromaDB query per shard."""
+        query_matrix = as_embedding_matrix(query_embeddings)
+        if len(query_matrix) == 0:
+            return []
+        await self._follow_alias()
             
+        try:
+            where_clause = filters or {}
+
+            include = ["metadatas", "distances"] + (["documents"] if include_content else [])
+            layout, collections = self.layout, self.collections
+            shard_results = await asyncio.gather(
+                *[
+                    self.read_pool.run(
+                        with_retries,
+                        collections[shard].query,
+                        query_embeddings=query_matrix,
+                        n_results=limit,
+                        where=where_clause if where_clause else None,
+                        include=include,
+                    )
+                    for shard in layout.shards_for(
+                        where_clause
+                    )  # Shards the filter cannot match are skipped
+                ]
+            )
+
+            # Convert ChromaDB results to our format, one list per query
+            if len(shard_results) == 1:
+                return [self._format_results(shard_results[0], q) for q in range(len(query_matrix))]
+
+            # Each shard's results are sorted by distance: heap-merge them, keep the overall top-k
+            return [
+                list(itertools.islice(
+                    heapq.merge(
+                        *(self._format_results(results, q) for results in shard_results),
+                        key=lambda result: -result["score"]
+                    ),
+                    limit
+                ))
+                for q in range(len(query_matrix))
+            ]
+
         except Exception as e:
             raise RuntimeError(f"Failed to search ChromaDB: {e}")
+
+    @staticmethod
+    def _format_results(results: dict[str, Any], q: int) -> list[dict[str, Any]]:
+        """Convert the ChromaDB results of query ``q`` to our result dicts."""
+        search_results = []
+
+        if results["ids"] and results["ids"][q]:
+            for i in range(len(results["ids"][q])):
+                metadata = results["metadatas"][q][i]
+                result = {
+                    "chunk_id": results["ids"][q][i],
+                    "content": results["documents"][q][i] if results.get("documents") else None,
+                    "score": max(
+                        0.0, min(1.0, 1.0 / (1.0 + results["distances"][q][i]))
+                    ),  # Normalize distance to 0-1 similarity
+                    "doc_id": metadata.get("doc_id", ""),
+                    "document_name": metadata.get("document_name", "Unknown"),
+                    "chunk_type": metadata.get("chunk_type", "text"),
+                    "section": metadata.get("section", ""),
+                    "page_num": metadata.get("page_num"),
+                    "metadata": metadata,
+                }
+                search_results.append(result)
+
+        return search_results
+
+    async def get_chunk_texts(self, chunk_ids: Sequence[str]) -> dict[str, str]:
+        """Content of the given chunks: cached texts first, then one ChromaDB ``get`` per shard."""
+        await self._follow_alias()
+        texts: dict[str, str] = {}
+        missing = []
+        for chunk_id in dict.fromkeys(chunk_ids):
+            cached = self._texts.get(chunk_id)
+            if cached is None:
+                missing.append(chunk_id)
+                continue
+            self._texts.move_to_end(chunk_id)
+            texts[chunk_id] = cached[1]
+        self.text_cache_hits += len(texts)
+        self.text_cache_misses += len(missing)
     
+        if missing:
+            try:
+                # A chunk id does not tell which shard holds it
+                shard_pages = await asyncio.gather(
+                    *[
+                        self.read_pool.run(
+                            with_retries,
+                            collection.get,
+                            ids=missing,
+                            include=["documents", "metadatas"],
+                        )
+                        for collection in self.collections
+                    ]
+                )
+            except Exception as e:
+                raise RuntimeError(f"Failed to fetch chunk texts from ChromaDB: {e}") from e
+            for fetched in shard_pages:
+                for chunk_id, content, metadata in zip(
+                    fetched["ids"], fetched["documents"], fetched["metadatas"], strict=True
+                ):
+                    texts[chunk_id] = content or ""
+                    self._cache_text(chunk_id, (metadata or {}).get("doc_id", ""), texts[chunk_id])
+        return texts
+
+    def _cache_text(self, chunk_id: str, doc_id: str, content: str) -> None:
+        if self.text_cache_size <= 0:
+            return
+        self._texts[chunk_id] = (doc_id, content)
+        self._texts.move_to_end(chunk_id)
+        while len(self._texts) > self.text_cache_size:
+            self._texts.popitem(last=False)
+
     async def delete_document(self, doc_id: str) -> None:
         """Delete all chunks for a document."""
+        await self._follow_alias()
         try:
-            self.collection.delete(
-                where={"doc_id": doc_id}
-            )
+            where = {"doc_id": doc_id}
+            layout, collections = self.layout, self.collections
+            await asyncio.gather(*[
+                self.write_pool.run(with_retries, collections[shard].delete, where=where)
+                for shard in layout.shards_for(where)
+            ])
+            try:
+                await self.write_pool.run(self.registry.remove_document, doc_id)
+            except Exception as e:
+                print(f"⚠️  Document registry update failed: {e}")
+                await self._resync_registry()
+            for chunk_id in [
+                chunk_id
+                for chunk_id, (cached_doc, _) in self._texts.items()
+                if cached_doc == doc_id
+            ]:
+                del self._texts[chunk_id]
         except Exception as e:
             raise RuntimeError(f"Failed to delete document from ChromaDB: {e}")
-    
-    async def get_stats(self) -> Dict[str, Any]:
-        """Get collection statistics."""
+
+    async def _resync_registry(self) -> None:
         try:
-            count = self.collection.count()
-            
-            if count == 0:
-                return {
-                    "total_chunks": 0,
-                    "total_documents": 0,
-                    "collection_name": self.collection_name,
-                    "sample_size": 0
-                }
-            
-            # For accurate document count, get all metadata (or a larger sample)
-            # Since we need accurate counts for 52 documents, get more samples
-            sample_limit = min(5000, count)  # Sample more to get better accuracy
-            sample_results = self.collection.get(limit=sample_limit)
-            
-            # Count unique documents
-            unique_docs = set()
-            if sample_results["metadatas"]:
-                for metadata in sample_results["metadatas"]:
-                    if metadata.get("doc_id"):
-                        unique_docs.add(metadata["doc_id"])
-                    elif metadata.get("document_name"):  # Fallback to document_name
-                        unique_docs.add(metadata["document_name"])
-            
-            # If we sampled all data and still have low unique count, something's wrong
-            estimated_total_docs = len(unique_docs)
-            if sample_limit < count and len(unique_docs) > 0:
-                # Rough estimation: if we sampled X% and found Y docs, estimate total
-                sampling_ratio = sample_limit / count
-                estimated_total_docs = max(len(unique_docs), int(len(unique_docs) / sampling_ratio))
-            
+            await self.write_pool.run(self.registry.sync_with_collections, self.collections)
+        except Exception as e:
+            print(f"⚠️  Document registry rebuild failed: {e}")
+
+    async def get_stats(self) -> dict[str, Any]:
+        """Get exact collection statistics from the document registry."""
+        await self._follow_alias()
+        try:
+            lookups = self.text_cache_hits + self.text_cache_misses
             return {
-                "total_chunks": count,
-                "total_documents": estimated_total_docs,
-                "unique_docs_in_sample": len(unique_docs),
+                **self.registry.stats(),
                 "collection_name": self.collection_name,
-                "sample_size": len(sample_results["ids"]) if sample_results["ids"] else 0
+                "shards": {
+                    "count": self.layout.count,
+                    "key": self.layout.key if self.layout.count > 1 else None
+                },
+                "collection_alias": {
+                    "alias": self.alias.alias,
+                    "active": self.alias.active,
+                    "previous": self.alias.previous
+                },
+                "chunk_text_cache": {
+                    "size": len(self._texts),
+                    "max_size": self.text_cache_size,
+                    "hit_rate": round(self.text_cache_hits / lookups, 3) if lookups else 0.0
+                },
+                "thread_pools": {
+                    "read": self.read_pool.stats(),
+                    "write": self.write_pool.stats()
+                }
             }
-            
+
         except Exception as e:
             raise RuntimeError(f"Failed to get ChromaDB stats: {e}")
-    
+
     def reset_collection(self) -> None:
-        """Reset the collection (for development only)."""
+        """Empty the active version in place (development only; reindex via ``create_version``)."""
         try:
-            self.client.delete_collection(name=self.collection_name)
-            self.collection = self.client.create_collection(
-                name=self.collection_name,
-                metadata={"description": "Document chunks for RAG"}
-            )
+            for collection in self.collections:
+                self.client.delete_collection(name=collection.name)
+            self.layout, self.collections = self._open_shards(self.collection_name)
+            self.registry.reset()
+            self._texts.clear()
         except Exception as e:
             raise RuntimeError(f"Failed to reset collection: {e}")
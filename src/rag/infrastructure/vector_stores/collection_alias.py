@@ -0,0 +1,136 @@
+"""
+Collection alias: a stable name pointing at the live version of a versioned ChromaDB collection.
+"""
+
+import json
+import os
+import re
+from collections.abc import Iterable
+from pathlib import Path
+from typing import TypedDict
+
+from ...config.settings import settings
+
+# ChromaDB names only allow [a-zA-Z0-9._-], so version N of "medical_docs" is "medical_docs__vN"
+VERSION_SEPARATOR = "__v"
+
+
+class _AliasState(TypedDict):
+    active: str
+    previous: list[str]
+
+
+class CollectionAlias:
+    """Resolves an alias (the configured collection name) to its active versioned collection.
+
+    The alias is a small JSON file beside the ChromaDB data holding the active
+    collection and the previously active ones, most recent first. ``switch``
+    writes a temporary file and ``os.replace``s it, so a reader in any process
+    sees either the old or the new target, never a partial file; ``refresh``
+    picks up a switch made by another process with one ``stat``.
+
+    Without a file the alias resolves to the unversioned collection of the same
+    name, so data loaded before versioning stays live as version 0.
+    ``path=None`` keeps the alias in memory (for stores built on an injected client).
+    """
+
+    def __init__(self, alias: str, path: Path | None = None) -> None:
+        self.alias = alias
+        self.path = Path(path) if path is not None else None
+        self._state: _AliasState = {"active": alias, "previous": []}
+        self._mtime_ns: int | None = None
+        self.refresh()
+
+    @classmethod
+    def for_collection(cls, alias: str, directory: Path | None = None) -> "CollectionAlias":
+        """Alias file for a collection under ``settings.chromadb_dir``."""
+        return cls(alias, Path(directory or settings.chromadb_dir) / f"{alias}.alias.json")
+
+    @property
+    def active(self) -> str:
+        return self._state["active"]
+
+    @property
+    def previous(self) -> list[str]:
+        """Previously active collections, most recent first (rollback targets)."""
+        return list(self._state["previous"])
+
+    def refresh(self) -> bool:
+        """Reload the alias file if it changed on disk; returns whether the active one changed."""
+        if self.path is None:
+            return False
+        try:
+            mtime_ns = self.path.stat().st_mtime_ns
+        except FileNotFoundError:
+            return False
+        if mtime_ns == self._mtime_ns:
+            return False
+
+        try:
+            state = json.loads(self.path.read_text())
+        except (OSError, ValueError) as e:
+            print(f"⚠️  Could not read collection alias {self.path}: {e}")
+            return False
+        self._mtime_ns = mtime_ns
+        changed = bool(state["active"] != self.active)
+        self._state = {"active": state["active"], "previous": list(state.get("previous", []))}
+        return changed
+
+    def version_of(self, collection_name: str) -> int | None:
+        """Version number of a collection behind this alias (0 = unversioned), else None."""
+        if collection_name == self.alias:
+            return 0
+        match = re.fullmatch(re.escape(self.alias + VERSION_SEPARATOR) + r"(\d+)", collection_name)
+        return int(match.group(1)) if match else None
+
+    def versions(self, collection_names: Iterable[str]) -> list[str]:
+        """The given collections that are versions of this alias, oldest first."""
+        return sorted(
+            (name for name in collection_names if self.version_of(name) is not None),
+            key=lambda name: self.version_of(name) or 0,
+        )
+
+    def next_version(self, collection_names: Iterable[str]) -> str:
+        """Name for a new version, above every existing or referenced one."""
+        names = [*collection_names, self.active, *self.previous]
+        latest = max((self.version_of(name) or 0 for name in names), default=0)
+        return f"{self.alias}{VERSION_SEPARATOR}{latest + 1}"
+
+    def switch(self, collection_name: str) -> str:
+        """Point the alias at ``collection_name`` atomically; returns the previously active one."""
+        self.refresh()
+        old = self.active
+        if collection_name == old:
+            return old
+        previous = [old] + [
+            name for name in self._state["previous"] if name not in (old, collection_name)
+        ]
+        self._write({"active": collection_name, "previous": previous})
+        return old
+
+    def rollback(self) -> str:
+        """Point the alias back at the most recent previous collection; returns it."""
+        self.refresh()
+        if not self._state["previous"]:
+            raise ValueError(
+                f"Collection alias '{self.alias}' has no previous version to roll back to"
+            )
+        target = self._state["previous"][0]
+        self.switch(target)
+        return target
+
+    def forget(self, collection_names: Iterable[str]) -> None:
+        """Drop deleted collections from the rollback history."""
+        dropped = set(collection_names)
+        previous = [name for name in self._state["previous"] if name not in dropped]
+        if previous != self._state["previous"]:
+            self._write({"active": self.active, "previous": previous})
+
+    def _write(self, state: _AliasState) -> None:
+        if self.path is not None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_name(self.path.name + ".tmp")
+            tmp_path.write_text(json.dumps(state, indent=2))
+            os.replace(tmp_path, self.path)
+            self._mtime_ns = self.path.stat().st_mtime_ns
+        self._state = state
@@ -0,0 +1,59 @@
+"""
+Chroma-style ``where`` filters evaluated against in-memory chunk metadata.
+"""
+
+from typing import Any
+
+
+def matches_where(metadata: dict[str, Any], where: dict[str, Any] | None) -> bool:
+    """Whether a metadata dict satisfies a Chroma ``where`` clause.
+
+    Supports field equality, ``$eq``/``$ne``/``$gt``/``$gte``/``$lt``/``$lte``/
+    ``$in``/``$nin`` and ``$and``/``$or``. Several top-level keys are ANDed.
+    """
+    if not where:
+        return True
+
+    for key, condition in where.items():
+        if key == "$and":
+            if not all(matches_where(metadata, clause) for clause in condition):
+                return False
+        elif key == "$or":
+            if not any(matches_where(metadata, clause) for clause in condition):
+                return False
+        elif not _matches_field(metadata.get(key), condition):
+            return False
+    return True
+
+
+def _matches_field(value: Any, condition: Any) -> bool:
+    """Evaluate one field condition (a literal or an operator dict)."""
+    if not isinstance(condition, dict):
+        return bool(value == condition)
+
+    for operator, operand in condition.items():
+        if operator == "$eq":
+            ok = value == operand
+        elif operator == "$ne":
+            ok = value != operand
+        elif operator == "$in":
+            ok = value in operand
+        elif operator == "$nin":
+            ok = value not in operand
+        elif operator in ("$gt", "$gte", "$lt", "$lte"):
+            if value is None:
+                return False
+            try:
+                ok = {
+                    "$gt": value > operand,
+                    "$gte": value >= operand,
+                    "$lt": value < operand,
+                    "$lte": value <= operand,
+                }[operator]
+            except TypeError:
+                return False
+        else:
+            raise ValueError(f"Unsupported filter operator: {operator}")
+        if not ok:
+            return False
+    return True
@@ -0,0 +1,211 @@
+"""
+Exact flat-index vector store: memory-mapped float32 matrix, NumPy matmul top-k.
+"""
+
+import asyncio
+import threading
+import uuid
+from collections.abc import Callable, Sequence
+from pathlib import Path
+from typing import Any, TypeVar
+
+import numpy as np
+
+from ...config.settings import settings
+from ...core.interfaces.embeddings import VectorStore
+from ...core.models.documents import DocumentChunk
+from ...core.models.embeddings import (
+    EMBEDDING_DTYPE,
+    EmbeddingsLike,
+    EmbeddingVector,
+    as_embedding_matrix,
+    as_query_vector,
+)
+from .array_storage import VectorArrayStorage
+
+T = TypeVar("T")
+
+
+class FlatVectorStore(VectorStore):
+    """Brute-force exact search over every stored vector.
+
+    Vectors stay in the memory-mapped float32 file of ``VectorArrayStorage``;
+    only their squared norms are kept in memory, so squared L2 for a whole
+    batch of queries is one matrix product:
+    ``||q - v||^2 = ||q||^2 - 2 q.v + ||v||^2``. For corpora of a few hundred
+    thousand chunks this is faster than an HNSW round trip and never misses a
+    neighbour. Scores use the same ``1 / (1 + distance)`` normalization as
+    ChromaVectorStore; filters use the same ``where`` syntax.
+
+    Scoring, memmap writes and SQLite access run in worker threads
+    (``asyncio.to_thread``) so the event loop keeps serving requests; a lock
+    serializes them so searches see the matrix and norms at the same length.
+    """
+
+    supports_projection = True
+
+    BLOCK_ROWS = 65536  # Rows per matmul block (bounds the temporary distance matrix)
+
+    def __init__(self, collection_name: str | None = None, directory: Path | None = None):
+        self.collection_name = collection_name or settings.chroma_collection_name
+        self.directory = Path(directory or settings.embeddings_dir / "flat" / self.collection_name)
+        self._lock = threading.Lock()
+        try:
+            self.storage = VectorArrayStorage(self.directory)
+        except Exception as e:
+            raise RuntimeError(f"Failed to initialize flat vector store: {e}") from e
+        self._norms: np.ndarray  # Squared row norms, set by _rebuild_norms()
+        self._rebuild_norms()
+
+    async def add_chunks(
+        self,
+        chunks: list[DocumentChunk],
+        embeddings: EmbeddingsLike,
+        doc_name: str,
+        embedding_model: str | None = None,
+    ) -> None:
+        """Add document chunks with their embeddings."""
+        if len(chunks) != len(embeddings):
+            raise ValueError("Number of chunks must match number of embeddings")
+        if not chunks:
+            return
+
+        try:
+            vectors = as_embedding_matrix(embeddings)
+            chunk_ids = [chunk.chunk_id or str(uuid.uuid4()) for chunk in chunks]
+            await asyncio.to_thread(self._append, chunks, chunk_ids, vectors, doc_name)
+        except ValueError:
+            raise
+        except Exception as e:
+            raise RuntimeError(f"Failed to add chunks to flat store: {e}") from e
+
+    def _append(
+        self, chunks: list[DocumentChunk], chunk_ids: list[str], vectors: np.ndarray, doc_name: str
+    ) -> None:
+        with self._lock:
+            self.storage.append(chunks, chunk_ids, vectors, doc_name)
+            self._norms = np.concatenate(
+                [self._norms, (vectors**2).sum(axis=1, dtype=EMBEDDING_DTYPE)]
+            )
+
+    async def search_similar(
+        self,
+        query_embedding: EmbeddingVector | Sequence[float],
+        limit: int = 5,
+        filters: dict[str, Any] | None = None,
+    ) -> list[dict[str, Any]]:
+        """Search for similar chunks (exact)."""
+        return (
+            await self.search_similar_many(
+                as_query_vector(query_embedding).reshape(1, -1), limit, filters
+            )
+        )[0]
+
+    async def search_similar_many(
+        self,
+        query_embeddings: EmbeddingsLike,
+        limit: int = 5,
+        filters: dict[str, Any] | None = None,
+        include_content: bool = True,
+    ) -> list[list[dict[str, Any]]]:
+        """Exact top-``limit`` for every query with one pass over the matrix."""
+        try:
+            queries = as_embedding_matrix(query_embeddings)
+            return await asyncio.to_thread(
+                self._search_many, queries, limit, filters, include_content
+            )
+        except Exception as e:
+            raise RuntimeError(f"Failed to search flat store: {e}") from e
+
+    def _search_many(
+        self, queries: np.ndarray, limit: int, filters: dict[str, Any] | None, include_content: bool
+    ) -> list[list[dict[str, Any]]]:
+        with self._lock:
+            mask = self.storage.candidate_mask(filters)
+            candidates = np.flatnonzero(mask)
+            if len(candidates) == 0 or limit <= 0:
+                return [[] for _ in range(len(queries))]
+
+            # Unfiltered searches stream the memmap in place; filtered ones gather matching rows
+            rows = None if len(candidates) == self.storage.size else candidates
+            distances = self._distances(queries, rows)
+
+            k = min(limit, distances.shape[1])
+            results = []
+            for query_distances in distances:
+                top = np.argpartition(query_distances, k - 1)[:k]
+                top = top[np.argsort(query_distances[top])]
+                ranked_rows = top if rows is None else rows[top]
+                results.append(
+                    self.storage.hydrate(ranked_rows, query_distances[top], include_content)
+                )
+            return results
+
+    async def get_chunk_texts(self, chunk_ids: Sequence[str]) -> dict[str, str]:
+        """Content of the given chunks by chunk id."""
+        return await asyncio.to_thread(self._locked, self.storage.get_contents, chunk_ids)
+
+    async def delete_document(self, doc_id: str) -> None:
+        """Delete all chunks for a document."""
+        try:
+            await asyncio.to_thread(self._locked, self.storage.delete_document, doc_id)
+        except Exception as e:
+            raise RuntimeError(f"Failed to delete document from flat store: {e}") from e
+
+    async def get_stats(self) -> dict[str, Any]:
+        """Get collection statistics."""
+        live = self.storage.live_count
+        dimension = self.storage.dimension or 0
+        return {
+            "total_chunks": live,
+            "total_documents": self.storage.document_count(),
+            "collection_name": self.collection_name,
+            "backend": "flat",
+            "dimension": dimension,
+            # Only the norms are held in RAM; the matrix is memory-mapped from disk (page cache)
+            "in_memory_bytes_per_chunk": (
+                round(self._norms.nbytes / self.storage.size, 1) if self.storage.size else 0
+            ),
+            "on_disk_bytes_per_chunk": dimension * 4,
+            "float32_bytes_per_chunk": dimension * 4,
+            "tombstoned_chunks": self.storage.size - live,
+        }
+
+    def reset_collection(self) -> None:
+        """Reset the collection (for development only)."""
+        try:
+            with self._lock:
+                self.storage.reset()
+                self._rebuild_norms()
+        except Exception as e:
+            raise RuntimeError(f"Failed to reset collection: {e}") from e
+
+    def _locked(self, fn: Callable[..., T], *args: Any) -> T:
+        with self._lock:
+            return fn(*args)
+
+    def _rebuild_norms(self) -> None:
+        """Compute squared row norms from the vector file (on startup / reset)."""
+        norms = [
+            (block**2).sum(axis=1, dtype=EMBEDDING_DTYPE)
+            for _, block in self.storage.iter_vector_blocks(self.BLOCK_ROWS)
+        ]
+        self._norms = np.concatenate(norms) if norms else np.empty(0, dtype=EMBEDDING_DTYPE)
+
+    def _distances(self, queries: np.ndarray, rows: np.ndarray | None) -> np.ndarray:
+        """Exact squared L2, shape (queries, rows); all rows if None."""
+        query_norms = (queries**2).sum(axis=1, keepdims=True)
+        if rows is not None:
+            vectors = self.storage.get_vectors(rows)
+            gathered: np.ndarray = query_norms - 2.0 * (queries @ vectors.T) + self._norms[rows]
+            np.maximum(gathered, 0.0, out=gathered)
+            return gathered
+
+        distances = np.empty((len(queries), self.storage.size), dtype=EMBEDDING_DTYPE)
+        for start, block in self.storage.iter_vector_blocks(self.BLOCK_ROWS):
+            distances[:, start : start + len(block)] = queries @ block.T
+        distances *= -2.0
+        distances += query_norms
+        distances += self._norms
+        np.maximum(distances, 0.0, out=distances)
+        return distances
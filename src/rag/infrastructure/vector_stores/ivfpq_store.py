@@ -0,0 +1,517 @@
+"""
+IVF-PQ vector store: inverted lists over a k-means coarse quantizer, product-quantized residuals.
+"""
+
+import asyncio
+import os
+import threading
+import uuid
+from collections.abc import Callable, Sequence
+from pathlib import Path
+from typing import Any, TypeVar
+
+import numpy as np
+
+from ...config.settings import settings
+from ...core.interfaces.embeddings import VectorStore
+from ...core.models.documents import DocumentChunk
+from ...core.models.embeddings import (
+    EMBEDDING_DTYPE,
+    EmbeddingsLike,
+    EmbeddingVector,
+    as_embedding_matrix,
+    as_query_vector,
+)
+from .array_storage import VectorArrayStorage
+
+PQ_CENTROIDS = 256  # One uint8 code per subquantizer
+
+T = TypeVar("T")
+
+
+def nearest_centroids(
+    vectors: np.ndarray, centroids: np.ndarray, block_rows: int = 65536
+) -> np.ndarray:
+    """Index of the nearest centroid (squared L2) for every vector."""
+    centroid_norms = (centroids**2).sum(axis=1)
+    assignment = np.empty(len(vectors), dtype=np.int32)
+    for start in range(0, len(vectors), block_rows):
+        block = vectors[start : start + block_rows]
+        assignment[start : start + len(block)] = np.argmin(
+            centroid_norms - 2.0 * (block @ centroids.T), axis=1
+        )
+    return assignment
+
+
+def kmeans(vectors: np.ndarray, k: int, iterations: int = 20, seed: int = 0) -> np.ndarray:
+    """Lloyd's k-means from randomly chosen points; returns ``(min(k, n), d)`` centroids."""
+    rng = np.random.default_rng(seed)
+    k = min(k, len(vectors))
+    centroids = vectors[rng.choice(len(vectors), size=k, replace=False)].astype(EMBEDDING_DTYPE)
+    for _ in range(iterations):
+        assignment = nearest_centroids(vectors, centroids)
+        counts = np.bincount(assignment, minlength=k)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, assignment, vectors)
+        empty = counts == 0
+        centroids[~empty] = sums[~empty] / counts[~empty, None]
+        # Re-seed empty clusters with random points so every list stays usable
+        centroids[empty] = vectors[rng.choice(len(vectors), size=int(empty.sum()))]
+    return centroids
+
+
+class IVFPQVectorStore(VectorStore):
+    """Approximate search with a few bytes of memory per chunk.
+
+    Every vector is assigned to one of ``nlist`` coarse k-means centroids
+    (inverted lists), and its residual is product-quantized into ``m`` uint8
+    codes. A query scans only the ``nprobe`` nearest lists, ranks their rows
+    with PQ lookup tables (asymmetric distances), and rescores the best
+    ``limit * rescore_oversample`` with exact squared L2 against the float32
+    vectors memory-mapped on disk (``rescore_oversample=0`` returns PQ
+    distances as-is).
+
+    A query whose probed lists hold fewer than ``limit`` matching rows (a
+    selective filter) probes twice as many lists until it has enough; a filter
+    matching at most ``EXACT_SEARCH_MAX_ROWS`` rows is searched exactly instead.
+
+    Training happens on ingest: searches are exact until ``train_size`` chunks
+    are stored, then the quantizers are trained on them and every row is
+    encoded. ``train()`` retrains on the current contents (after the corpus has
+    grown a lot). Quantizers and codes persist next to the vectors.
+
+    Reads, writes and training run in worker threads, never on the event loop.
+    One lock serializes searches and writes; the k-means fit and the encoding of
+    already-stored rows run outside it, so searches continue during training.
+    """
+
+    supports_projection = True
+
+    BLOCK_ROWS = 65536  # Rows encoded per block while training
+    QUANTIZER_FILE = "ivfpq.npz"
+    CODES_FILE = "codes.u8"
+    LISTS_FILE = "lists.i32"
+    MAX_TRAIN_SAMPLE = 65536  # Vectors sampled for k-means
+    EXACT_SEARCH_MAX_ROWS = 4096  # Filters matching at most this many rows are searched exactly
+    SEED = 0
+
+    def __init__(
+        self,
+        collection_name: str | None = None,
+        nlist: int | None = None,
+        nprobe: int | None = None,
+        subquantizers: int | None = None,
+        train_size: int | None = None,
+        rescore_oversample: int | None = None,
+        directory: Path | None = None,
+    ):
+        self.collection_name = collection_name or settings.chroma_collection_name
+        self.nlist_setting = (
+            nlist if nlist is not None else settings.ivfpq_nlist
+        )  # 0 = derive from training size
+        self.nprobe = max(1, nprobe or settings.ivfpq_nprobe)
+        self.subquantizers_setting = (
+            subquantizers if subquantizers is not None else settings.ivfpq_subquantizers
+        )
+        self.train_size = max(1, train_size or settings.ivfpq_train_size)
+        self.rescore_oversample = max(
+            0,
+            (
+                rescore_oversample
+                if rescore_oversample is not None
+                else settings.ivfpq_rescore_oversample
+            ),
+        )
+
+        self.directory = Path(directory or settings.embeddings_dir / "ivfpq" / self.collection_name)
+        self._lock = threading.Lock()
+        self._training = False
+        try:
+            self.storage = VectorArrayStorage(self.directory)
+            self._load_index()
+        except Exception as e:
+            raise RuntimeError(f"Failed to initialize IVF-PQ vector store: {e}") from e
+
+    @property
+    def is_trained(self) -> bool:
+        return len(self._coarse) > 0
+
+    async def add_chunks(
+        self,
+        chunks: list[DocumentChunk],
+        embeddings: EmbeddingsLike,
+        doc_name: str,
+        embedding_model: str | None = None,
+    ) -> None:
+        """Add document chunks with their embeddings (training once enough are stored)."""
+        if len(chunks) != len(embeddings):
+            raise ValueError("Number of chunks must match number of embeddings")
+        if not chunks:
+            return
+
+        try:
+            vectors = as_embedding_matrix(embeddings)
+            chunk_ids = [chunk.chunk_id or str(uuid.uuid4()) for chunk in chunks]
+            await asyncio.to_thread(self._append, chunks, chunk_ids, vectors, doc_name)
+            if (
+                not self.is_trained
+                and not self._training
+                and self.storage.live_count >= self.train_size
+            ):
+                self._training = True
+                try:
+                    await asyncio.to_thread(self.train)
+                finally:
+                    self._training = False
+        except ValueError:
+            raise
+        except Exception as e:
+            raise RuntimeError(f"Failed to add chunks to IVF-PQ store: {e}") from e
+
+    def _append(
+        self, chunks: list[DocumentChunk], chunk_ids: list[str], vectors: np.ndarray, doc_name: str
+    ) -> None:
+        with self._lock:
+            rows = self.storage.append(chunks, chunk_ids, vectors, doc_name)
+            if self.is_trained:
+                self._append_codes(rows, vectors)
+
+    async def search_similar(
+        self,
+        query_embedding: EmbeddingVector | Sequence[float],
+        limit: int = 5,
+        filters: dict[str, Any] | None = None,
+    ) -> list[dict[str, Any]]:
+        """Search for similar chunks."""
+        return (
+            await self.search_similar_many(
+                as_query_vector(query_embedding).reshape(1, -1), limit, filters
+            )
+        )[0]
+
+    async def search_similar_many(
+        self,
+        query_embeddings: EmbeddingsLike,
+        limit: int = 5,
+        filters: dict[str, Any] | None = None,
+        include_content: bool = True,
+    ) -> list[list[dict[str, Any]]]:
+        """Search several queries; coarse centroids are scored for all of them at once."""
+        try:
+            queries = as_embedding_matrix(query_embeddings)
+            return await asyncio.to_thread(
+                self._search_many, queries, limit, filters, include_content
+            )
+        except Exception as e:
+            raise RuntimeError(f"Failed to search IVF-PQ store: {e}") from e
+
+    def _search_many(
+        self, queries: np.ndarray, limit: int, filters: dict[str, Any] | None, include_content: bool
+    ) -> list[list[dict[str, Any]]]:
+        with self._lock:
+            mask = self.storage.candidate_mask(filters)
+            matching = int(mask.sum())
+            if matching == 0 or limit <= 0:
+                return [[] for _ in range(len(queries))]
+            # Only a selective filter short-cuts to exact search; unfiltered queries use the index
+            if not self.is_trained or (filters and matching <= self.EXACT_SEARCH_MAX_ROWS):
+                candidates = np.flatnonzero(mask)
+                return [
+                    self._exact_search(query, candidates, limit, include_content)
+                    for query in queries
+                ]
+
+            shortlist_size = limit * max(1, self.rescore_oversample)
+            list_order = self._list_order(queries)
+            results: list[list[dict[str, Any]]] = []
+            for query, lists in zip(queries, list_order, strict=True):
+                nprobe = min(self.nprobe, len(lists))
+                rows, approx = self._scan_lists(query, lists[:nprobe], mask)
+                while len(rows) < limit and nprobe < len(lists):
+                    # Filters left too few rows in the probed lists: probe twice as many
+                    widened = min(2 * nprobe, len(lists))
+                    more_rows, more_approx = self._scan_lists(query, lists[nprobe:widened], mask)
+                    rows, approx = np.concatenate([rows, more_rows]), np.concatenate(
+                        [approx, more_approx]
+                    )
+                    nprobe = widened
+                if len(rows) == 0:
+                    results.append([])
+                    continue
+
+                if len(rows) > shortlist_size:
+                    keep = np.argpartition(approx, shortlist_size - 1)[:shortlist_size]
+                    rows, approx = rows[keep], approx[keep]
+                if self.rescore_oversample > 0:
+                    results.append(self._exact_search(query, np.sort(rows), limit, include_content))
+                else:
+                    order = np.argsort(approx)[:limit]
+                    results.append(
+                        self.storage.hydrate(rows[order], approx[order], include_content)
+                    )
+            return results
+
+    async def get_chunk_texts(self, chunk_ids: Sequence[str]) -> dict[str, str]:
+        """Content of the given chunks by chunk id."""
+        return await asyncio.to_thread(self._locked, self.storage.get_contents, chunk_ids)
+
+    async def delete_document(self, doc_id: str) -> None:
+        """Delete all chunks for a document."""
+        try:
+            await asyncio.to_thread(self._locked, self.storage.delete_document, doc_id)
+        except Exception as e:
+            raise RuntimeError(f"Failed to delete document from IVF-PQ store: {e}") from e
+
+    async def get_stats(self) -> dict[str, Any]:
+        """Get collection statistics."""
+        live = self.storage.live_count
+        dimension = self.storage.dimension or 0
+        index_bytes = (
+            self._codes.nbytes + self._assignment.nbytes + sum(rows.nbytes for rows in self._lists)
+        )
+        return {
+            "total_chunks": live,
+            "total_documents": self.storage.document_count(),
+            "collection_name": self.collection_name,
+            "backend": "ivfpq",
+            "dimension": dimension,
+            "trained": self.is_trained,
+            "nlist": len(self._coarse) if self.is_trained else 0,
+            "nprobe": self.nprobe,
+            "subquantizers": self._codes.shape[1] if self.is_trained else 0,
+            "in_memory_bytes_per_chunk": (
+                round(index_bytes / self.storage.size, 1)
+                if self.is_trained and self.storage.size
+                else 0
+            ),
+            "on_disk_bytes_per_chunk": dimension * 4,  # Memory-mapped float32 vectors for rescoring
+            "float32_bytes_per_chunk": dimension * 4,
+            "tombstoned_chunks": self.storage.size - live,
+        }
+
+    def reset_collection(self) -> None:
+        """Reset the collection (for development only)."""
+        try:
+            with self._lock:
+                self.storage.reset()
+                self._load_index()
+        except Exception as e:
+            raise RuntimeError(f"Failed to reset collection: {e}") from e
+
+    def train(self) -> None:
+        """Train the coarse quantizer and PQ codebooks on the stored vectors, then re-encode rows.
+
+        Blocking (call it from a worker thread in async code). The stored rows are
+        snapshotted under the lock; fitting and encoding them happen outside it, and
+        rows added meanwhile are encoded when the new index is swapped in.
+        """
+        with self._lock:
+            live = np.flatnonzero(self.storage.alive)
+            if len(live) == 0:
+                return
+            stored = (
+                self.storage.vectors()
+            )  # Rows are immutable; this map stays valid while rows are appended
+        rng = np.random.default_rng(self.SEED)
+        sample_rows = np.sort(
+            rng.choice(live, size=min(len(live), self.MAX_TRAIN_SAMPLE), replace=False)
+        )
+        sample = np.asarray(stored[sample_rows], dtype=EMBEDDING_DTYPE)
+        dimension = sample.shape[1]
+
+        # FAISS rule of thumb: at least ~39 training points per coarse centroid
+        nlist = self.nlist_setting or int(min(4 * np.sqrt(len(sample)), max(1, len(sample) // 39)))
+        print(
+            f"🧮 Training IVF-PQ on {len(sample)} vectors "
+            f"(nlist={nlist}, m={self._subquantizer_count(dimension)})..."
+        )
+        coarse = kmeans(sample, nlist, seed=self.SEED)
+        residuals = sample - coarse[nearest_centroids(sample, coarse)]
+
+        m = self._subquantizer_count(dimension)
+        subvectors = residuals.reshape(len(sample), m, dimension // m)
+        codebooks = np.zeros((m, PQ_CENTROIDS, dimension // m), dtype=EMBEDDING_DTYPE)
+        for j in range(m):
+            centroids = kmeans(
+                np.ascontiguousarray(subvectors[:, j]), PQ_CENTROIDS, seed=self.SEED + j
+            )
+            codebooks[j, : len(centroids)] = centroids
+            codebooks[j, len(centroids) :] = centroids[
+                0
+            ]  # Tiny training sets: duplicates, argmin keeps code 0
+
+        # Encode the snapshotted rows (tombstoned ones too: rows are never reused, row == index)
+        blocks = [
+            self._encode(
+                np.asarray(stored[start : start + self.BLOCK_ROWS], dtype=EMBEDDING_DTYPE),
+                coarse,
+                codebooks,
+            )
+            for start in range(0, len(stored), self.BLOCK_ROWS)
+        ]
+
+        with self._lock:
+            self._set_quantizers(coarse, codebooks)
+            temp_path = self.directory / f"{self.QUANTIZER_FILE}.tmp"
+            with open(temp_path, "wb") as f:
+                np.savez(f, coarse=coarse, codebooks=codebooks, trained_on=np.array(len(sample)))
+            os.replace(temp_path, self.directory / self.QUANTIZER_FILE)
+
+            self._reset_codes()
+            start = 0
+            for assignment, codes in blocks:
+                self._store_codes(np.arange(start, start + len(codes)), assignment, codes)
+                start += len(codes)
+            if start < self.storage.size:  # Added during training
+                rows = np.arange(start, self.storage.size)
+                self._append_codes(rows, self.storage.get_vectors(rows))
+
+    def _locked(self, fn: Callable[..., T], *args: Any) -> T:
+        with self._lock:
+            return fn(*args)
+
+    def _subquantizer_count(self, dimension: int) -> int:
+        """Configured ``m``, else ~8 dimensions per subquantizer; always divides the dimension."""
+        target = self.subquantizers_setting or max(1, dimension // 8)
+        return max(m for m in range(1, min(target, dimension) + 1) if dimension % m == 0)
+
+    def _load_index(self) -> None:
+        """Load quantizers and codes from disk, encoding rows appended after the last write."""
+        # Empty until trained: coarse (nlist, d), codebooks (m, 256, d / m)
+        self._coarse = np.empty((0, 0), dtype=EMBEDDING_DTYPE)
+        self._codebooks = np.empty((0, 256, 0), dtype=EMBEDDING_DTYPE)
+        self._codebook_norms = np.empty((0, 256), dtype=EMBEDDING_DTYPE)
+        self._codes = np.empty((0, 0), dtype=np.uint8)
+        self._assignment = np.empty(0, dtype=np.int32)
+        self._lists: list[np.ndarray] = []
+
+        quantizer_path = self.directory / self.QUANTIZER_FILE
+        if not quantizer_path.exists():
+            return
+        with np.load(quantizer_path) as data:
+            self._set_quantizers(data["coarse"], data["codebooks"])
+        m = len(self._codebooks)
+
+        codes_path, lists_path = self.directory / self.CODES_FILE, self.directory / self.LISTS_FILE
+        codes = (
+            np.fromfile(codes_path, dtype=np.uint8)
+            if codes_path.exists()
+            else np.empty(0, dtype=np.uint8)
+        )
+        assignment = (
+            np.fromfile(lists_path, dtype=np.int32)
+            if lists_path.exists()
+            else np.empty(0, dtype=np.int32)
+        )
+        encoded = min(len(codes) // m, len(assignment), self.storage.size)
+        self._codes = codes[: encoded * m].reshape(encoded, m)
+        self._assignment = assignment[:encoded]
+        self._lists = self._group_rows(np.arange(encoded), self._assignment)
+
+        # Rewrite files cut short or left long by a crash, then encode whatever is missing
+        if len(codes) != encoded * m or len(assignment) != encoded:
+            self._codes.tofile(codes_path)
+            self._assignment.tofile(lists_path)
+        if encoded < self.storage.size:
+            rows = np.arange(encoded, self.storage.size)
+            self._append_codes(rows, self.storage.get_vectors(rows))
+
+    def _set_quantizers(self, coarse: np.ndarray, codebooks: np.ndarray) -> None:
+        self._coarse = coarse.astype(EMBEDDING_DTYPE)
+        self._codebooks = codebooks.astype(EMBEDDING_DTYPE)
+        self._codebook_norms = (self._codebooks**2).sum(axis=2)  # (m, 256)
+
+    def _reset_codes(self) -> None:
+        m = len(self._codebooks)
+        self._codes = np.empty((0, m), dtype=np.uint8)
+        self._assignment = np.empty(0, dtype=np.int32)
+        self._lists = [np.empty(0, dtype=np.int32) for _ in range(len(self._coarse))]
+        for name in (self.CODES_FILE, self.LISTS_FILE):
+            (self.directory / name).unlink(missing_ok=True)
+
+    def _group_rows(self, rows: np.ndarray, assignment: np.ndarray) -> list[np.ndarray]:
+        """Split rows into per-list arrays."""
+        order = np.argsort(assignment, kind="stable")
+        bounds = np.searchsorted(assignment[order], np.arange(len(self._coarse) + 1))
+        return [
+            rows[order[bounds[i] : bounds[i + 1]]].astype(np.int32)
+            for i in range(len(self._coarse))
+        ]
+
+    def _encode(
+        self,
+        vectors: np.ndarray,
+        coarse: np.ndarray | None = None,
+        codebooks: np.ndarray | None = None,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Coarse list and PQ codes of each vector's residual (current quantizers by default)."""
+        coarse = self._coarse if coarse is None else coarse
+        codebooks = self._codebooks if codebooks is None else codebooks
+        assignment = nearest_centroids(vectors, coarse)
+        m, _, sub_dimension = codebooks.shape
+        residuals = (vectors - coarse[assignment]).reshape(len(vectors), m, sub_dimension)
+        codes = np.empty((len(vectors), m), dtype=np.uint8)
+        for j in range(m):
+            codes[:, j] = nearest_centroids(np.ascontiguousarray(residuals[:, j]), codebooks[j])
+        return assignment, codes
+
+    def _append_codes(self, rows: np.ndarray, vectors: np.ndarray) -> None:
+        """Encode new rows, add them to their lists and append them to the code files."""
+        assignment, codes = self._encode(vectors)
+        self._store_codes(rows, assignment, codes)
+
+    def _store_codes(self, rows: np.ndarray, assignment: np.ndarray, codes: np.ndarray) -> None:
+        """Add encoded rows to their lists and append them to the code files."""
+        with open(self.directory / self.CODES_FILE, "ab") as f:
+            codes.tofile(f)
+        with open(self.directory / self.LISTS_FILE, "ab") as f:
+            assignment.tofile(f)
+
+        self._codes = np.concatenate([self._codes, codes])
+        self._assignment = np.concatenate([self._assignment, assignment])
+        for list_id, list_rows in enumerate(self._group_rows(np.asarray(rows), assignment)):
+            if len(list_rows):
+                self._lists[list_id] = np.concatenate([self._lists[list_id], list_rows])
+
+    def _list_order(self, queries: np.ndarray) -> np.ndarray:
+        """Every list, nearest first, for each query; shape (queries, nlist)."""
+        distances = (self._coarse**2).sum(axis=1) - 2.0 * (queries @ self._coarse.T)
+        return np.argsort(distances, axis=1)
+
+    def _scan_lists(
+        self, query: np.ndarray, lists: np.ndarray, mask: np.ndarray
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Candidate rows of the probed lists and their PQ (asymmetric) squared distances."""
+        m, _, sub_dimension = self._codebooks.shape
+        list_rows = [self._lists[list_id] for list_id in lists]
+        rows = np.concatenate(list_rows)
+        probe_of_row = np.repeat(np.arange(len(lists)), [len(r) for r in list_rows])
+        keep = mask[rows]
+        rows, probe_of_row = rows[keep], probe_of_row[keep]
+        if len(rows) == 0:
+            return rows, np.empty(0, dtype=EMBEDDING_DTYPE)
+
+        # Lookup tables for every probed list at once: (nprobe, m, 256) squared distance per code
+        residuals = (query - self._coarse[lists]).reshape(len(lists), m, sub_dimension)
+        tables = (
+            (residuals**2).sum(axis=2)[:, :, None]
+            - 2.0
+            * np.matmul(residuals.transpose(1, 0, 2), self._codebooks.transpose(0, 2, 1)).transpose(
+                1, 0, 2
+            )
+            + self._codebook_norms[None]
+        )
+        distances = tables[probe_of_row[:, None], np.arange(m)[None, :], self._codes[rows]].sum(
+            axis=1
+        )
+        return rows, distances
+
+    def _exact_search(
+        self, query: np.ndarray, rows: np.ndarray, limit: int, include_content: bool = True
+    ) -> list[dict[str, Any]]:
+        """Exact squared-L2 top ``limit`` among the given rows."""
+        distances = ((self.storage.get_vectors(rows) - query) ** 2).sum(axis=1)
+        k = min(limit, len(rows))
+        top = np.argpartition(distances, k - 1)[:k]
+        top = top[np.argsort(distances[top])]
+        return self.storage.hydrate(rows[top], distances[top], include_content)
@@ -0,0 +1,269 @@
+"""
+Quantized vector store: int8 or binary codes in memory, float32 rescoring from disk.
+"""
+
+import asyncio
+import threading
+import uuid
+from collections.abc import Callable, Sequence
+from pathlib import Path
+from typing import Any, TypeVar
+
+import numpy as np
+
+from ...config.settings import settings
+from ...core.interfaces.embeddings import VectorStore
+from ...core.models.documents import DocumentChunk
+from ...core.models.embeddings import (
+    EmbeddingsLike,
+    EmbeddingVector,
+    as_embedding_matrix,
+    as_query_vector,
+)
+from .array_storage import VectorArrayStorage
+
+T = TypeVar("T")
+
+# Number of set bits for every byte value (popcount lookup for Hamming distance)
+_POPCOUNT = (
+    np.unpackbits(np.arange(256, dtype=np.uint8)[:, None], axis=1).sum(axis=1).astype(np.uint16)
+)
+
+
+def quantize_int8(vectors: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Per-vector symmetric int8 quantization; returns ``(codes, scales)``."""
+    scales = np.abs(vectors).max(axis=1) / 127.0
+    scales[scales == 0] = 1.0
+    codes = np.clip(np.rint(vectors / scales[:, None]), -127, 127).astype(np.int8)
+    return codes, scales.astype(np.float32)
+
+
+def quantize_binary(vectors: np.ndarray) -> np.ndarray:
+    """Sign-bit quantization packed 8 dimensions per byte."""
+    return np.packbits(vectors > 0, axis=1)
+
+
+class QuantizedVectorStore(VectorStore):
+    """Two-stage search over compressed vectors.
+
+    The first pass ranks every candidate with int8 (4x smaller than float32) or
+    binary (32x smaller) codes held in memory; the best ``limit * oversample``
+    candidates are then rescored with exact squared L2 against the float32
+    vectors, which stay memory-mapped on disk. Scores use the same
+    ``1 / (1 + distance)`` normalization as ChromaVectorStore.
+
+    Both passes, memmap writes and SQLite access run in worker threads
+    (``asyncio.to_thread``), off the event loop; a lock serializes them so
+    searches see the codes and the vector file at the same length.
+    """
+
+    supports_projection = True
+
+    BLOCK_ROWS = 65536  # Rows per first-pass block (bounds temporary float32 memory)
+
+    def __init__(
+        self,
+        collection_name: str | None = None,
+        quantization: str | None = None,
+        oversample: int | None = None,
+        directory: Path | None = None,
+    ):
+        self.collection_name = collection_name or settings.chroma_collection_name
+        self.quantization = (quantization or settings.vector_quantization).lower()
+        if self.quantization not in ("int8", "binary"):
+            raise ValueError(
+                f"Unknown quantization '{self.quantization}' (expected 'int8' or 'binary')"
+            )
+        self.oversample = max(1, oversample or settings.quantized_rescore_oversample)
+
+        self.directory = Path(
+            directory or settings.embeddings_dir / "quantized" / self.collection_name
+        )
+        self._lock = threading.Lock()
+        try:
+            self.storage = VectorArrayStorage(self.directory)
+        except Exception as e:
+            raise RuntimeError(f"Failed to initialize quantized vector store: {e}") from e
+        self._rebuild_codes()
+
+    async def add_chunks(
+        self,
+        chunks: list[DocumentChunk],
+        embeddings: EmbeddingsLike,
+        doc_name: str,
+        embedding_model: str | None = None,
+    ) -> None:
+        """Add document chunks with their embeddings."""
+        if len(chunks) != len(embeddings):
+            raise ValueError("Number of chunks must match number of embeddings")
+        if not chunks:
+            return
+
+        try:
+            vectors = as_embedding_matrix(embeddings)
+            chunk_ids = [chunk.chunk_id or str(uuid.uuid4()) for chunk in chunks]
+            await asyncio.to_thread(self._append, chunks, chunk_ids, vectors, doc_name)
+        except ValueError:
+            raise
+        except Exception as e:
+            raise RuntimeError(f"Failed to add chunks to quantized store: {e}") from e
+
+    def _append(
+        self, chunks: list[DocumentChunk], chunk_ids: list[str], vectors: np.ndarray, doc_name: str
+    ) -> None:
+        with self._lock:
+            self.storage.append(chunks, chunk_ids, vectors, doc_name)
+            self._append_codes(vectors)
+
+    async def search_similar(
+        self,
+        query_embedding: EmbeddingVector | Sequence[float],
+        limit: int = 5,
+        filters: dict[str, Any] | None = None,
+    ) -> list[dict[str, Any]]:
+        """Search for similar chunks: quantized first pass, exact float32 rescoring."""
+        return (
+            await self.search_similar_many(
+                as_query_vector(query_embedding).reshape(1, -1), limit, filters
+            )
+        )[0]
+
+    async def search_similar_many(
+        self,
+        query_embeddings: EmbeddingsLike,
+        limit: int = 5,
+        filters: dict[str, Any] | None = None,
+        include_content: bool = True,
+    ) -> list[list[dict[str, Any]]]:
+        """Search several queries; the first pass reads the in-memory codes once for all of them."""
+        try:
+            queries = as_embedding_matrix(query_embeddings)
+            return await asyncio.to_thread(
+                self._search_many, queries, limit, filters, include_content
+            )
+        except Exception as e:
+            raise RuntimeError(f"Failed to search quantized store: {e}") from e
+
+    def _search_many(
+        self, queries: np.ndarray, limit: int, filters: dict[str, Any] | None, include_content: bool
+    ) -> list[list[dict[str, Any]]]:
+        with self._lock:
+            mask = self.storage.candidate_mask(filters)
+            candidates = np.flatnonzero(mask)
+            if len(candidates) == 0 or limit <= 0:
+                return [[] for _ in range(len(queries))]
+
+            # Stage 1: approximate distances over all candidates, (queries, candidates)
+            approx = self._approximate_distances(
+                queries, None if len(candidates) == self.storage.size else candidates
+            )
+            shortlist_size = min(len(candidates), limit * self.oversample)
+
+            results = []
+            for query, query_approx in zip(queries, approx, strict=True):
+                shortlist = np.argpartition(query_approx, shortlist_size - 1)[:shortlist_size]
+                rows = np.sort(candidates[shortlist])  # Sorted rows read the memmap sequentially
+
+                # Stage 2: exact squared L2 on the float32 vectors of the shortlist
+                exact = self.storage.get_vectors(rows)
+                distances = ((exact - query) ** 2).sum(axis=1)
+                order = np.argsort(distances)[:limit]
+                results.append(self.storage.hydrate(rows[order], distances[order], include_content))
+            return results
+
+    async def get_chunk_texts(self, chunk_ids: Sequence[str]) -> dict[str, str]:
+        """Content of the given chunks by chunk id."""
+        return await asyncio.to_thread(self._locked, self.storage.get_contents, chunk_ids)
+
+    async def delete_document(self, doc_id: str) -> None:
+        """Delete all chunks for a document."""
+        try:
+            await asyncio.to_thread(self._locked, self.storage.delete_document, doc_id)
+        except Exception as e:
+            raise RuntimeError(f"Failed to delete document from quantized store: {e}") from e
+
+    async def get_stats(self) -> dict[str, Any]:
+        """Get collection statistics."""
+        live = self.storage.live_count
+        dimension = self.storage.dimension or 0
+        code_bytes = self._codes.nbytes + self._scales.nbytes + self._norms.nbytes
+        return {
+            "total_chunks": live,
+            "total_documents": self.storage.document_count(),
+            "collection_name": self.collection_name,
+            "backend": f"quantized-{self.quantization}",
+            "dimension": dimension,
+            "in_memory_bytes_per_chunk": (
+                round(code_bytes / self.storage.size, 1) if self.storage.size else 0
+            ),
+            "on_disk_bytes_per_chunk": dimension * 4,  # Memory-mapped float32 vectors for rescoring
+            "float32_bytes_per_chunk": dimension * 4,
+            "tombstoned_chunks": self.storage.size - live,
+        }
+
+    def reset_collection(self) -> None:
+        """Reset the collection (for development only)."""
+        try:
+            with self._lock:
+                self.storage.reset()
+                self._rebuild_codes()
+        except Exception as e:
+            raise RuntimeError(f"Failed to reset collection: {e}") from e
+
+    def _locked(self, fn: Callable[..., T], *args: Any) -> T:
+        with self._lock:
+            return fn(*args)
+
+    def _rebuild_codes(self) -> None:
+        """Quantize the float32 vector file into in-memory codes (on startup / reset)."""
+        self._codes = self._empty_codes()
+        self._scales = np.empty(0, dtype=np.float32)  # int8 only; stays empty for binary
+        self._norms = np.empty(0, dtype=np.float32)
+        for _, block in self.storage.iter_vector_blocks(self.BLOCK_ROWS):
+            self._append_codes(block)
+
+    def _empty_codes(self) -> np.ndarray:
+        dimension = self.storage.dimension or 0
+        if self.quantization == "int8":
+            return np.empty((0, dimension), dtype=np.int8)
+        return np.empty((0, (dimension + 7) // 8), dtype=np.uint8)
+
+    def _append_codes(self, vectors: np.ndarray) -> None:
+        """Quantize new vectors and append them to the in-memory code arrays."""
+        if self._codes.shape[1] == 0 and self.storage.dimension:
+            self._codes = self._empty_codes()  # First vectors fixed the dimension
+
+        if self.quantization == "int8":
+            codes, scales = quantize_int8(vectors)
+            self._scales = np.concatenate([self._scales, scales])
+        else:
+            codes = quantize_binary(vectors)
+        self._codes = np.concatenate([self._codes, codes])
+        self._norms = np.concatenate([self._norms, (vectors**2).sum(axis=1).astype(np.float32)])
+
+    def _approximate_distances(self, queries: np.ndarray, rows: np.ndarray | None) -> np.ndarray:
+        """First-pass distances (lower is closer), shape (queries, rows); all rows if None."""
+        codes = self._codes if rows is None else self._codes[rows]
+        distances = np.empty((len(queries), len(codes)), dtype=np.float32)
+
+        if self.quantization == "binary":
+            query_bits = quantize_binary(queries)
+            for start in range(0, len(codes), self.BLOCK_ROWS):
+                block = codes[start : start + self.BLOCK_ROWS]
+                for q, bits in enumerate(query_bits):
+                    distances[q, start : start + len(block)] = _POPCOUNT[
+                        np.bitwise_xor(block, bits)
+                    ].sum(axis=1)
+            return distances
+
+        # int8: ||q - v||^2 = ||q||^2 - 2 q.v + ||v||^2 with q.v ~= scale * (codes @ q)
+        scales = self._scales if rows is None else self._scales[rows]
+        norms = self._norms if rows is None else self._norms[rows]
+        for start in range(0, len(codes), self.BLOCK_ROWS):
+            block = codes[start : start + self.BLOCK_ROWS].astype(
+                np.float32
+            )  # Dequantized once for all queries
+            distances[:, start : start + len(block)] = (block @ queries.T).T
+        distances *= -2.0 * scales
+        distances += norms
+        return distances
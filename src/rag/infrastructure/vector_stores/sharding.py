@@ -0,0 +1,138 @@
+"""
+Shard layout: how one logical collection's chunks are spread over several ChromaDB collections.
+"""
+
+import re
+import zlib
+from typing import Any
+
+from chromadb.errors import NotFoundError
+
+from .chroma_client import with_retries
+
+# Shard i of "medical_docs__v3" is the ChromaDB collection "medical_docs__v3__s<i>"
+SHARD_SEPARATOR = "__s"
+
+
+class ShardLayout:
+    """Routes chunks to shards by the CRC32 of one metadata field.
+
+    ``key="doc_id"`` spreads documents evenly and sends all of a document's chunks
+    to one shard; ``key="document_type"`` groups chunks by type so searches filtered
+    on a type touch a single shard. ``shards_for`` works out from a Chroma ``where``
+    clause which shards can hold matches. A single shard is the plain, unsuffixed
+    collection, so unsharded collections keep their names.
+    """
+
+    def __init__(self, count: int = 1, key: str = "doc_id"):
+        if count < 1:
+            raise ValueError(f"Shard count must be at least 1, got {count}")
+        self.count = count
+        self.key = key
+
+    @classmethod
+    def from_metadata(cls, metadata: dict[str, Any] | None) -> "ShardLayout":
+        """Layout recorded on an existing shard collection (unsharded if absent)."""
+        metadata = metadata or {}
+        return cls(int(metadata.get("shard_count", 1)), metadata.get("shard_key", "doc_id"))
+
+    def metadata(self, index: int) -> dict[str, Any]:
+        """Collection metadata for shard ``index`` (records the layout for later opens)."""
+        if self.count == 1:
+            return {}
+        return {"shard": index, "shard_count": self.count, "shard_key": self.key}
+
+    def collection_names(self, name: str) -> list[str]:
+        if self.count == 1:
+            return [name]
+        return [f"{name}{SHARD_SEPARATOR}{i}" for i in range(self.count)]
+
+    @staticmethod
+    def logical_name(collection_name: str) -> str:
+        """The logical collection a shard collection belongs to."""
+        return re.sub(re.escape(SHARD_SEPARATOR) + r"\d+$", "", collection_name)
+
+    def shard_of(self, metadata: dict[str, Any]) -> int:
+        """Shard a chunk with this metadata is stored in."""
+        if self.count == 1:
+            return 0
+        return self._shard_of_value(metadata.get(self.key, ""))
+
+    def shards_for(self, where: dict[str, Any] | None) -> list[int]:
+        """Shards that can hold chunks matching ``where`` (all unless it pins the shard key)."""
+        values = self._key_values(where) if self.count > 1 else None
+        if values is None:
+            return list(range(self.count))
+        return sorted({self._shard_of_value(value) for value in values})
+
+    def _shard_of_value(self, value: Any) -> int:
+        return zlib.crc32(str(value).encode("utf-8")) % self.count
+
+    def _key_values(self, where: dict[str, Any] | None) -> set[Any] | None:
+        """Values the shard key may take under ``where``; None if unconstrained."""
+        allowed: set[Any] | None = None
+
+        def narrow(values: set[Any] | None) -> None:
+            nonlocal allowed
+            if values is not None:
+                allowed = values if allowed is None else allowed & values
+
+        for field, condition in (where or {}).items():
+            if field == "$and":
+                for clause in condition:
+                    narrow(self._key_values(clause))
+            elif field == "$or":
+                options = [self._key_values(clause) for clause in condition]
+                if options and all(option is not None for option in options):
+                    narrow(set().union(*(option or set() for option in options)))
+            elif field == self.key:
+                if not isinstance(condition, dict):
+                    narrow({condition})
+                elif "$eq" in condition:
+                    narrow({condition["$eq"]})
+                elif "$in" in condition:
+                    narrow(set(condition["$in"]))
+        return allowed
+
+
+def open_shards(
+    client: Any,
+    collection_name: str,
+    default_layout: ShardLayout,
+    create: bool = True,
+    description: str = "Document chunks for RAG",
+) -> tuple[ShardLayout, list[Any]]:
+    """Open the shard collections of a version, creating them with ``default_layout`` if missing.
+
+    A sharded version is recognised by its ``__s0`` collection, whose metadata holds
+    the layout; only then is the plain name tried, for unsharded versions. Nothing
+    is created unless neither exists, so a writer can never shadow existing shards
+    with an empty collection under the plain name.
+    """
+    try:
+        first = with_retries(client.get_collection, name=f"{collection_name}{SHARD_SEPARATOR}0")
+    except (NotFoundError, ValueError):  # Catch ChromaDB NotFoundError and ValueError
+        first = None
+    if first is not None:
+        layout = ShardLayout.from_metadata(first.metadata)
+        names = layout.collection_names(collection_name)
+        return layout, [first] + [
+            with_retries(client.get_collection, name=name) for name in names[1:]
+        ]
+
+    try:  # Unsharded (or created before sharding)
+        return ShardLayout(), [with_retries(client.get_collection, name=collection_name)]
+    except (NotFoundError, ValueError):
+        if not create:
+            raise
+
+    layout = default_layout
+    collections = [
+        with_retries(
+            client.get_or_create_collection,
+            name=name,
+            metadata={"description": description, **layout.metadata(index)},
+        )
+        for index, name in enumerate(layout.collection_names(collection_name))
+    ]
+    return layout, collections
@@ -0,0 +1,260 @@
+"""
+Portable index snapshots: float32 vectors plus columnar chunk records,
+bulk-loaded into a new collection version.
+"""
+
+import json
+import time
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from ...config.settings import settings
+from ...core.models.embeddings import EMBEDDING_DTYPE
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+    pa = None
+    pq = None
+
+SNAPSHOT_FORMAT_VERSION = 1
+MANIFEST_FILE = "manifest.json"
+VECTORS_FILE = "vectors.npy"
+
+RecordBatch = tuple[list[str], list[str], list[dict[str, Any]], np.ndarray]
+
+
+def export_snapshot(
+    store: Any, directory: Path, embedding_model: str, page_size: int | None = None
+) -> dict[str, Any]:
+    """Write every chunk of a ChromaVectorStore's active version to ``directory``.
+
+    Layout: ``vectors.npy`` (float32, one row per chunk, memory-mappable),
+    ``records.parquet`` (id, document, metadata JSON; ``records.jsonl`` without
+    pyarrow) in the same row order, and ``manifest.json`` with the embedding model,
+    dimension and count. The manifest is written last, so a directory without one
+    is an incomplete export. Export from a version that is not being written to.
+    """
+    page_size = page_size or settings.snapshot_batch_size
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    (directory / MANIFEST_FILE).unlink(missing_ok=True)
+
+    collections = list(store.collections)
+    total = sum(collection.count() for collection in collections)
+    if total == 0:
+        raise ValueError(f"Collection {store.collection_name} is empty - nothing to export")
+
+    records_format = "parquet" if PYARROW_AVAILABLE else "jsonl"
+    records = _RecordWriter(directory / f"records.{records_format}", records_format)
+    vectors = None
+    written = 0
+    try:
+        for collection in collections:
+            offset = 0
+            while True:
+                page = collection.get(
+                    include=["documents", "metadatas", "embeddings"], limit=page_size, offset=offset
+                )
+                if not page["ids"]:
+                    break
+                page_vectors = np.asarray(page["embeddings"], dtype=EMBEDDING_DTYPE)
+                if vectors is None:
+                    vectors = np.lib.format.open_memmap(
+                        directory / VECTORS_FILE,
+                        mode="w+",
+                        dtype=EMBEDDING_DTYPE,
+                        shape=(total, page_vectors.shape[1]),
+                    )
+                if written + len(page_vectors) > total:
+                    raise RuntimeError(
+                        "Collection changed during export - stop writers and export again"
+                    )
+                vectors[written : written + len(page_vectors)] = page_vectors
+                records.write(page["ids"], page["documents"], page["metadatas"])
+                written += len(page_vectors)
+                offset += len(page["ids"])
+                print(f"  📤 {written}/{total} chunks")
+    finally:
+        records.close()
+        if vectors is not None:
+            vectors.flush()
+            del vectors
+    if written != total:
+        raise RuntimeError(
+            f"Exported {written} of {total} chunks - collection changed during export"
+        )
+
+    manifest = {
+        "format_version": SNAPSHOT_FORMAT_VERSION,
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "source_collection": store.collection_name,
+        "embedding_model": embedding_model,
+        "dimension": int(np.load(directory / VECTORS_FILE, mmap_mode="r").shape[1]),
+        "count": written,
+        "distance": "l2",
+        "vectors_file": VECTORS_FILE,
+        "records_file": f"records.{records_format}",
+        "records_format": records_format,
+    }
+    (directory / MANIFEST_FILE).write_text(json.dumps(manifest, indent=2))
+    return manifest
+
+
+def read_manifest(directory: Path) -> dict[str, Any]:
+    """Load and sanity-check a snapshot manifest."""
+    path = Path(directory) / MANIFEST_FILE
+    if not path.exists():
+        raise ValueError(f"No {MANIFEST_FILE} in {directory} (missing or incomplete snapshot)")
+    manifest: dict[str, Any] = json.loads(path.read_text())
+    if manifest.get("format_version") != SNAPSHOT_FORMAT_VERSION:
+        raise ValueError(f"Unsupported snapshot format version: {manifest.get('format_version')}")
+    if manifest["records_format"] == "parquet" and not PYARROW_AVAILABLE:
+        raise ValueError(
+            "Snapshot records are Parquet but pyarrow is not installed (pip install pyarrow)"
+        )
+    return manifest
+
+
+def check_compatible(manifest: dict[str, Any], embedding_model: str, dimension: int) -> None:
+    """Raise if the snapshot's embedding model or dimension differs from the current provider's."""
+    if manifest["embedding_model"] != embedding_model:
+        raise ValueError(
+            f"Snapshot was embedded with '{manifest['embedding_model']}' "
+            f"but the configured model is '{embedding_model}'"
+        )
+    if manifest["dimension"] != dimension:
+        raise ValueError(
+            f"Snapshot dimension {manifest['dimension']} does not match "
+            f"embedding dimension {dimension}"
+        )
+
+
+def iter_snapshot(
+    directory: Path, manifest: dict[str, Any], batch_size: int
+) -> Iterator[RecordBatch]:
+    """Yield ``(ids, documents, metadatas, vectors)`` batches in row order."""
+    directory = Path(directory)
+    vectors = np.load(directory / manifest["vectors_file"], mmap_mode="r")
+    if vectors.shape != (manifest["count"], manifest["dimension"]):
+        raise ValueError(
+            f"{manifest['vectors_file']} has shape {vectors.shape}, manifest says "
+            f"({manifest['count']}, {manifest['dimension']})"
+        )
+
+    start = 0
+    for ids, documents, metadata_json in _read_records(
+        directory / manifest["records_file"], manifest["records_format"], batch_size
+    ):
+        batch_vectors = np.ascontiguousarray(vectors[start : start + len(ids)])
+        start += len(ids)
+        yield ids, documents, [json.loads(metadata) for metadata in metadata_json], batch_vectors
+    if start != manifest["count"]:
+        raise ValueError(f"Snapshot records hold {start} rows, manifest says {manifest['count']}")
+
+
+async def import_snapshot(
+    store: Any, directory: Path, embedding_model: str, dimension: int, batch_size: int | None = None
+) -> dict[str, Any]:
+    """Bulk-load a snapshot into a new version of a ChromaVectorStore and switch to it.
+
+    The live version keeps serving until the new one holds exactly the snapshot's
+    chunk count; on any failure the new version is discarded.
+    """
+    manifest = read_manifest(directory)
+    check_compatible(manifest, embedding_model, dimension)
+    batch_size = min(batch_size or settings.snapshot_batch_size, store.client.get_max_batch_size())
+
+    version = store.create_version()
+    print(f"📥 Importing {manifest['count']} chunks into {version.collection_name}...")
+    started = time.perf_counter()
+    try:
+        loaded = 0
+        for ids, documents, metadatas, vectors in iter_snapshot(directory, manifest, batch_size):
+            await version.add_records(
+                ids, documents, vectors, metadatas, embedding_model=manifest["embedding_model"]
+            )
+            loaded += len(ids)
+            print(f"  📥 {loaded}/{manifest['count']} chunks")
+        stats = await version.get_stats()
+        if stats["total_chunks"] != manifest["count"]:
+            raise RuntimeError(
+                f"{version.collection_name} holds {stats['total_chunks']} chunks, "
+                f"expected {manifest['count']}"
+            )
+    except Exception:
+        store.discard_version(version)
+        raise
+
+    replaced = store.promote(version)
+    removed = store.garbage_collect()
+    return {
+        "status": "success",
+        "version": store.collection_name,
+        "replaced": replaced,
+        "garbage_collected": removed,
+        "chunks": manifest["count"],
+        "documents": stats["total_documents"],
+        "seconds": round(time.perf_counter() - started, 2),
+    }
+
+
+class _RecordWriter:
+    """Appends (id, document, metadata JSON) rows as Parquet row groups or JSON lines."""
+
+    def __init__(self, path: Path, records_format: str):
+        self.format = records_format
+        if records_format == "parquet":
+            schema = pa.schema(
+                [("id", pa.string()), ("document", pa.string()), ("metadata", pa.string())]
+            )
+            self._writer = pq.ParquetWriter(str(path), schema)
+        else:
+            self._writer = open(path, "w", encoding="utf-8")
+
+    def write(
+        self, ids: list[str], documents: list[str | None], metadatas: list[dict[str, Any] | None]
+    ) -> None:
+        metadata_json = [json.dumps(metadata or {}) for metadata in metadatas]
+        documents = [document or "" for document in documents]
+        if self.format == "parquet":
+            self._writer.write_table(
+                pa.table({"id": ids, "document": documents, "metadata": metadata_json})
+            )
+        else:
+            for row in zip(ids, documents, metadata_json, strict=True):
+                self._writer.write(json.dumps(row) + "\n")
+
+    def close(self) -> None:
+        self._writer.close()
+
+
+def _read_records(
+    path: Path, records_format: str, batch_size: int
+) -> Iterator[tuple[list[str], list[str], list[str]]]:
+    if records_format == "parquet":
+        for record_batch in pq.ParquetFile(str(path)).iter_batches(
+            batch_size=batch_size, columns=["id", "document", "metadata"]
+        ):
+            columns = record_batch.to_pydict()
+            yield columns["id"], columns["document"], columns["metadata"]
+        return
+
+    with open(path, encoding="utf-8") as records:
+        batch: list[tuple[str, str, str]] = []
+        for line in records:
+            batch.append(json.loads(line))
+            if len(batch) == batch_size:
+                yield [row[0] for row in batch], [row[1] for row in batch], [
+                    row[2] for row in batch
+                ]
+                batch = []
+        if batch:
+            yield [row[0] for row in batch], [row[1] for row in batch], [row[2] for row in batch]
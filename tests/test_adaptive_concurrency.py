@@ -0,0 +1,91 @@
+"""AdaptiveConcurrencyLimiter: additive increase, multiplicative decrease, slot accounting."""
+
+import asyncio
+
+import httpx
+import pytest
+
+from rag.infrastructure.adaptive_concurrency import AdaptiveConcurrencyLimiter, is_overload_error
+
+
+def overloaded(status: int) -> httpx.HTTPStatusError:
+    request = httpx.Request("POST", "http://backend/api/embed")
+    return httpx.HTTPStatusError(
+        "overloaded", request=request, response=httpx.Response(status, request=request)
+    )
+
+
+def test_steady_latency_grows_the_limit_up_to_max() -> None:
+    limiter = AdaptiveConcurrencyLimiter(initial_limit=2, max_limit=4)
+
+    for _ in range(100):
+        limiter.record_success(0.05)
+
+    assert limiter.limit == 4
+    assert limiter.increases > 0
+
+
+def test_latency_spike_stops_growth() -> None:
+    limiter = AdaptiveConcurrencyLimiter(initial_limit=2, max_limit=32, ewma_alpha=1.0)
+    limiter.record_success(0.05)
+    increases = limiter.increases
+
+    limiter.record_success(1.0)
+
+    assert limiter.increases == increases
+
+
+def test_overload_halves_the_limit_once_per_window() -> None:
+    limiter = AdaptiveConcurrencyLimiter(initial_limit=8, max_limit=8)
+    limiter.record_success(5.0)  # Long latency window: the burst below counts once
+
+    limiter.record_failure(overloaded(429))
+    limiter.record_failure(overloaded(503))
+
+    assert limiter.limit == 4
+    assert limiter.decreases == 1
+
+
+def test_other_errors_leave_the_limit_alone() -> None:
+    limiter = AdaptiveConcurrencyLimiter(initial_limit=8, max_limit=8)
+
+    limiter.record_failure(overloaded(400))
+    limiter.record_failure(ValueError("bad input"))
+
+    assert limiter.limit == 8
+    assert limiter.failures == 2
+
+
+def test_overload_classification() -> None:
+    assert is_overload_error(httpx.ReadTimeout("slow"))
+    assert is_overload_error(overloaded(500))
+    assert not is_overload_error(overloaded(404))
+
+
+async def test_slots_cap_in_flight_requests() -> None:
+    limiter = AdaptiveConcurrencyLimiter(initial_limit=2, max_limit=2)
+    in_flight = peak = 0
+
+    async def request() -> None:
+        nonlocal in_flight, peak
+        async with limiter.slot():
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+
+    await asyncio.gather(*(request() for _ in range(10)))
+
+    assert peak == 2
+    assert limiter.stats()["in_flight"] == 0
+    assert limiter.successes == 10
+
+
+async def test_failed_request_releases_its_slot() -> None:
+    limiter = AdaptiveConcurrencyLimiter(initial_limit=1, max_limit=1)
+
+    with pytest.raises(ValueError):
+        async with limiter.slot():
+            raise ValueError("bad input")
+
+    await asyncio.wait_for(limiter.acquire(), timeout=1)
@@ -0,0 +1,51 @@
+"""TokenBudgetPacker: batches respect the token budget and item limit, shortest texts first."""
+
+import pytest
+
+from rag.core.services.batch_packing import TokenBudgetPacker
+
+
+class WordEncoder:
+    """One token per whitespace-separated word."""
+
+    def encode(self, text: str, disallowed_special: tuple[str, ...] = ()) -> list[str]:
+        return text.split()
+
+
+def words(n: int) -> str:
+    return " ".join(["word"] * n)
+
+
+def test_batches_stay_under_token_budget() -> None:
+    texts = [words(n) for n in (5, 1, 9, 3, 7, 2, 8)]
+    packer = TokenBudgetPacker(
+        max_tokens_per_batch=10, max_items_per_batch=64, encoder=WordEncoder()
+    )
+
+    batches = packer.pack(texts)
+
+    assert sorted(i for batch in batches for i in batch) == list(range(len(texts)))
+    for batch in batches:
+        assert sum(packer.count_tokens(texts[i]) for i in batch) <= 10
+
+
+def test_shortest_texts_are_packed_first() -> None:
+    texts = [words(n) for n in (4, 1, 3, 2)]
+    packer = TokenBudgetPacker(
+        max_tokens_per_batch=100, max_items_per_batch=2, encoder=WordEncoder()
+    )
+
+    assert packer.pack(texts) == [[1, 3], [2, 0]]
+
+
+def test_oversized_text_gets_its_own_batch() -> None:
+    texts = [words(2), words(50), words(3)]
+    packer = TokenBudgetPacker(max_tokens_per_batch=10, encoder=WordEncoder())
+
+    assert packer.pack(texts) == [[0, 2], [1]]
+
+
+def test_empty_input_and_invalid_limits() -> None:
+    assert TokenBudgetPacker(encoder=WordEncoder()).pack([]) == []
+    with pytest.raises(ValueError):
+        TokenBudgetPacker(max_tokens_per_batch=0)
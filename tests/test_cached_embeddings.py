@@ -0,0 +1,90 @@
+"""CachedEmbeddingProvider: hits are served from SQLite, only misses reach the wrapped provider."""
+
+from pathlib import Path
+
+import numpy as np
+
+from rag.core.interfaces.embeddings import EmbeddingProvider
+from rag.core.models.embeddings import EmbeddingMatrix, EmbeddingVector
+from rag.infrastructure.embeddings.cached_embeddings import CachedEmbeddingProvider
+
+
+class CountingProvider(EmbeddingProvider):
+    """Deterministic 4-d embeddings; records every text it is asked to embed."""
+
+    def __init__(self, model: str = "test-model") -> None:
+        self.model = model
+        self.embedded: list[str] = []
+
+    async def embed_texts(self, texts: list[str]) -> EmbeddingMatrix:
+        self.embedded.extend(texts)
+        return np.asarray([self._vector(text) for text in texts], dtype=np.float32)
+
+    async def embed_query(self, query: str) -> EmbeddingVector:
+        self.embedded.append(query)
+        return self._vector(query)
+
+    @staticmethod
+    def _vector(text: str) -> np.ndarray:
+        return np.asarray([len(text), text.count("a"), text.count("e"), 1.0], dtype=np.float32)
+
+    @property
+    def model_name(self) -> str:
+        return self.model
+
+    @property
+    def dimension(self) -> int:
+        raise RuntimeError("unknown until the first call")
+
+
+async def test_repeated_texts_are_served_from_cache(tmp_path: Path) -> None:
+    provider = CountingProvider()
+    cache = CachedEmbeddingProvider(provider, cache_path=tmp_path / "cache.db")
+
+    first = await cache.embed_texts(["alpha", "beta", "alpha"])
+    second = await cache.embed_texts(["beta", "gamma"])
+
+    assert provider.embedded == ["alpha", "beta", "gamma"]
+    assert (cache.hits, cache.misses) == (1, 4)
+    np.testing.assert_array_equal(first[0], first[2])
+    np.testing.assert_array_equal(second[0], first[1])
+
+
+async def test_cache_persists_across_instances(tmp_path: Path) -> None:
+    await CachedEmbeddingProvider(CountingProvider(), cache_path=tmp_path / "cache.db").embed_query(
+        "sodium"
+    )
+
+    provider = CountingProvider()
+    cache = CachedEmbeddingProvider(provider, cache_path=tmp_path / "cache.db")
+    embedding = await cache.embed_query("sodium")
+
+    assert provider.embedded == []
+    assert cache.dimension == 4
+    assert cache.stats()["embedding_cache"]["hit_rate"] == 1.0
+    np.testing.assert_array_equal(embedding, CountingProvider._vector("sodium"))
+
+
+async def test_cache_is_keyed_by_model(tmp_path: Path) -> None:
+    await CachedEmbeddingProvider(
+        CountingProvider("model-a"), cache_path=tmp_path / "cache.db"
+    ).embed_texts(["x"])
+
+    provider = CountingProvider("model-b")
+    await CachedEmbeddingProvider(provider, cache_path=tmp_path / "cache.db").embed_texts(["x"])
+
+    assert provider.embedded == ["x"]
+
+
+async def test_failed_embeddings_are_not_cached(tmp_path: Path) -> None:
+    class FailingProvider(CountingProvider):
+        async def embed_texts(self, texts: list[str]) -> EmbeddingMatrix:
+            self.embedded.extend(texts)
+            return np.full((len(texts), 4), np.nan, dtype=np.float32)
+
+    provider = FailingProvider()
+    cache = CachedEmbeddingProvider(provider, cache_path=tmp_path / "cache.db")
+    await cache.embed_texts(["x"])
+    await cache.embed_texts(["x"])
+
+    assert provider.embedded == ["x", "x"]
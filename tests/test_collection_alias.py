@@ -0,0 +1,137 @@
+"""Collection alias: versioned reindex, atomic promote, rollback and cross-process following."""
+
+import uuid
+from pathlib import Path
+
+import chromadb
+import numpy as np
+import pytest
+from chromadb.api import ClientAPI
+
+from rag.core.models.documents import DocumentChunk
+from rag.infrastructure.vector_stores.chroma_store import ChromaVectorStore
+from rag.infrastructure.vector_stores.collection_alias import CollectionAlias
+
+
+@pytest.fixture
+def alias_name() -> str:
+    # EphemeralClient instances share one in-process database; keep names unique per test
+    return f"alias_{uuid.uuid4().hex[:8]}"
+
+
+def make_store(alias_name: str, alias_path: Path, client: ClientAPI) -> ChromaVectorStore:
+    return ChromaVectorStore(
+        alias_name, client=client, alias=CollectionAlias(alias_name, alias_path)
+    )
+
+
+async def add_document(store: ChromaVectorStore, doc_id: str, count: int = 3) -> None:
+    chunks = [
+        DocumentChunk(chunk_id=f"{doc_id}_{i}", doc_id=doc_id, content=f"{doc_id} chunk {i}")
+        for i in range(count)
+    ]
+    vectors = np.random.default_rng(len(doc_id)).normal(size=(count, 8)).astype(np.float32)
+    await store.add_chunks(chunks, vectors, doc_name=doc_id)
+
+
+def test_switch_and_rollback_keep_history(tmp_path: Path) -> None:
+    alias = CollectionAlias("docs", tmp_path / "docs.alias.json")
+    assert alias.active == "docs"
+
+    assert alias.switch("docs__v1") == "docs"
+    assert alias.switch("docs__v2") == "docs__v1"
+    assert (alias.active, alias.previous) == ("docs__v2", ["docs__v1", "docs"])
+
+    assert alias.rollback() == "docs__v1"
+    assert (alias.active, alias.previous) == ("docs__v1", ["docs__v2", "docs"])
+
+
+def test_other_processes_see_a_switch(tmp_path: Path) -> None:
+    writer = CollectionAlias("docs", tmp_path / "docs.alias.json")
+    reader = CollectionAlias("docs", tmp_path / "docs.alias.json")
+
+    writer.switch("docs__v1")
+
+    assert reader.refresh() is True
+    assert reader.active == "docs__v1"
+    assert reader.refresh() is False
+
+
+def test_rollback_without_history_fails(tmp_path: Path) -> None:
+    with pytest.raises(ValueError):
+        CollectionAlias("docs", tmp_path / "docs.alias.json").rollback()
+
+
+def test_next_version_is_above_every_known_one(tmp_path: Path) -> None:
+    alias = CollectionAlias("docs", tmp_path / "docs.alias.json")
+    alias.switch("docs__v3")
+
+    assert alias.next_version(["docs", "docs__v1", "other__v9"]) == "docs__v4"
+    assert alias.versions(["docs__v2", "docs", "other", "docs__v10"]) == [
+        "docs",
+        "docs__v2",
+        "docs__v10",
+    ]
+
+
+async def test_promote_serves_the_new_version_and_rollback_restores_the_old(
+    tmp_path: Path, alias_name: str
+) -> None:
+    client = chromadb.EphemeralClient()
+    store = make_store(alias_name, tmp_path / "alias.json", client)
+    await add_document(store, "old_doc")
+
+    version = store.create_version()
+    await add_document(version, "new_doc", count=5)
+    assert (await store.get_stats())["total_chunks"] == 3  # Still serving the old version
+
+    replaced = store.promote(version)
+
+    assert replaced == alias_name
+    stats = await store.get_stats()
+    assert (stats["collection_name"], stats["total_chunks"]) == (f"{alias_name}__v1", 5)
+
+    assert store.rollback() == alias_name
+    assert (await store.get_stats())["total_chunks"] == 3
+    store.close()
+
+
+async def test_store_follows_a_promote_made_by_another_process(
+    tmp_path: Path, alias_name: str
+) -> None:
+    client = chromadb.EphemeralClient()
+    writer = make_store(alias_name, tmp_path / "alias.json", client)
+    reader = make_store(alias_name, tmp_path / "alias.json", client)
+    await add_document(writer, "old_doc")
+
+    version = writer.create_version()
+    await add_document(version, "new_doc", count=5)
+    writer.promote(version)
+
+    stats = await reader.get_stats()
+    assert (stats["collection_name"], stats["total_chunks"]) == (f"{alias_name}__v1", 5)
+    writer.close()
+    reader.close()
+
+
+async def test_discard_and_garbage_collect_remove_old_versions(
+    tmp_path: Path, alias_name: str
+) -> None:
+    client = chromadb.EphemeralClient()
+    store = make_store(alias_name, tmp_path / "alias.json", client)
+    await add_document(store, "doc")
+
+    for _ in range(3):
+        version = store.create_version()
+        await add_document(version, "doc")
+        store.promote(version)
+    discarded = store.create_version()
+    store.discard_version(discarded)
+
+    removed = store.garbage_collect(keep_previous=1)
+
+    assert removed == [alias_name, f"{alias_name}__v1"]
+    assert store.alias.previous == [f"{alias_name}__v2"]
+    names = {collection.name for collection in client.list_collections()}
+    assert f"{alias_name}__v3" in names and discarded.collection_name not in names
+    store.close()
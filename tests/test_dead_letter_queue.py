@@ -0,0 +1,70 @@
+"""FailedEmbeddingQueue: per-collection-version rows, retries and migration of older queues."""
+
+import sqlite3
+from pathlib import Path
+
+from rag.core.models.documents import DocumentChunk
+from rag.infrastructure.dead_letter_queue import FailedEmbeddingQueue
+
+
+def chunk(chunk_id: str, doc_id: str = "doc") -> DocumentChunk:
+    return DocumentChunk(chunk_id=chunk_id, doc_id=doc_id, content=f"text of {chunk_id}")
+
+
+def test_pending_only_returns_rows_of_the_requested_version(tmp_path: Path) -> None:
+    queue = FailedEmbeddingQueue(tmp_path / "queue.db")
+    queue.record([chunk("a"), chunk("b")], "Doc", "timeout", collection="docs__v1")
+    queue.record([chunk("c")], "Doc", "timeout", collection="docs__v2")
+
+    assert [c.chunk_id for c, _ in queue.pending(collection="docs__v1")] == ["a", "b"]
+    assert [c.chunk_id for c, _ in queue.pending(collection="docs__v2")] == ["c"]
+    assert queue.count() == 3
+
+
+def test_same_chunk_can_fail_in_two_versions(tmp_path: Path) -> None:
+    queue = FailedEmbeddingQueue(tmp_path / "queue.db")
+    queue.record([chunk("a")], "Doc", "timeout", collection="docs__v1")
+    queue.record([chunk("a")], "Doc", "timeout", collection="docs__v2")
+    queue.record([chunk("a")], "Doc", "timeout", collection="docs__v2")
+
+    queue.remove(["a"], collection="docs__v2")
+
+    assert queue.count("docs__v2") == 0
+    assert queue.count("docs__v1") == 1
+    assert queue.stats()["max_attempts"] == 1
+
+
+def test_discarded_versions_and_documents_are_forgotten(tmp_path: Path) -> None:
+    queue = FailedEmbeddingQueue(tmp_path / "queue.db")
+    queue.record([chunk("a", "doc1")], "Doc 1", "timeout", collection="docs__v1")
+    queue.record([chunk("b", "doc2")], "Doc 2", "timeout", collection="docs__v2")
+    queue.record([chunk("c", "doc2")], "Doc 2", "timeout", collection="docs__v3")
+
+    queue.remove_collections(["docs__v1"])
+    queue.remove_document("doc2")
+
+    assert queue.count() == 0
+
+
+def test_unversioned_queue_is_migrated(tmp_path: Path) -> None:
+    path = tmp_path / "queue.db"
+    legacy = chunk("old")
+    with sqlite3.connect(path) as conn:
+        conn.execute(
+            "CREATE TABLE failed_chunks (chunk_id TEXT PRIMARY KEY, doc_id TEXT NOT NULL, "
+            "doc_name TEXT NOT NULL, chunk TEXT NOT NULL, error TEXT NOT NULL, "
+            "attempts INTEGER NOT NULL DEFAULT 1, "
+            "first_failed_at REAL NOT NULL, last_failed_at REAL NOT NULL)"
+        )
+        conn.execute(
+            "INSERT INTO failed_chunks VALUES ('old', 'doc', 'Doc', ?, 'timeout', 2, 0, 0)",
+            (legacy.model_dump_json(),),
+        )
+    conn.close()
+
+    queue = FailedEmbeddingQueue(path)
+    queue.record([chunk("new")], "Doc", "timeout", collection="docs__v1")
+
+    # Rows from before versions were tracked are retried into whichever version is live
+    assert [c.chunk_id for c, _ in queue.pending(collection="docs__v1")] == ["old", "new"]
+    assert [c for c, _ in queue.pending(collection="docs__v7")] == [legacy]
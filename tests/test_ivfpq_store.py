@@ -0,0 +1,130 @@
+"""IVF-PQ store: recall against exact search, filters, and persistence of the trained index."""
+
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import pytest
+
+from rag.core.models.documents import DocumentChunk
+from rag.infrastructure.vector_stores.flat_store import FlatVectorStore
+from rag.infrastructure.vector_stores.ivfpq_store import IVFPQVectorStore
+
+COUNT = 3000
+DIMENSION = 32
+K = 10
+
+Corpus = tuple[list[DocumentChunk], np.ndarray, np.ndarray]  # chunks, vectors, queries
+
+
+def clustered_vectors(count: int, seed: int = 0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(size=(30, DIMENSION)).astype(np.float32)
+    vectors = centers[rng.integers(0, len(centers), count)] + 0.5 * rng.normal(
+        size=(count, DIMENSION)
+    ).astype(np.float32)
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors
+
+
+@pytest.fixture(scope="module")
+def corpus() -> Corpus:
+    vectors = clustered_vectors(COUNT)
+    chunks = [
+        DocumentChunk(
+            chunk_id=f"chunk_{i}",
+            doc_id=f"doc_{i // 100}",
+            content=f"chunk {i}",
+            chunk_type="table" if i % 50 == 0 else "text",
+        )
+        for i in range(COUNT)
+    ]
+    queries = clustered_vectors(50, seed=1)
+    return chunks, vectors, queries
+
+
+def make_ivfpq(tmp_path: Path, nprobe: int, oversample: int = 10) -> IVFPQVectorStore:
+    return IVFPQVectorStore(
+        "ivfpq_test",
+        nlist=32,
+        nprobe=nprobe,
+        subquantizers=8,
+        train_size=COUNT,
+        rescore_oversample=oversample,
+        directory=tmp_path / "ivfpq",
+    )
+
+
+async def load(
+    store: FlatVectorStore | IVFPQVectorStore, chunks: list[DocumentChunk], vectors: np.ndarray
+) -> None:
+    for offset in range(0, len(chunks), 500):
+        await store.add_chunks(
+            chunks[offset : offset + 500], vectors[offset : offset + 500], doc_name="corpus"
+        )
+
+
+def recall(results: list[list[dict[str, Any]]], truth: list[list[dict[str, Any]]]) -> float:
+    hits = [
+        len({r["chunk_id"] for r in found} & {r["chunk_id"] for r in exact}) / len(exact)
+        for found, exact in zip(results, truth, strict=True)
+    ]
+    return float(np.mean(hits))
+
+
+@pytest.fixture
+async def exact(tmp_path: Path, corpus: Corpus) -> FlatVectorStore:
+    chunks, vectors, _ = corpus
+    store = FlatVectorStore("flat_test", directory=tmp_path / "flat")
+    await load(store, chunks, vectors)
+    return store
+
+
+async def test_recall_against_exact_search_grows_with_nprobe(
+    tmp_path: Path, corpus: Corpus, exact: FlatVectorStore
+) -> None:
+    chunks, vectors, queries = corpus
+    truth = await exact.search_similar_many(queries, limit=K)
+    store = make_ivfpq(tmp_path, nprobe=1)
+    await load(store, chunks, vectors)
+    assert store.is_trained
+
+    recalls = []
+    for nprobe in (1, 4, 32):
+        store.nprobe = nprobe
+        recalls.append(recall(await store.search_similar_many(queries, limit=K), truth))
+
+    assert recalls == sorted(recalls)
+    assert (
+        recalls[0] < 1.0
+    )  # Unfiltered queries go through the index, not the exact-search fallback
+    assert recalls[1] >= 0.8
+    assert recalls[-1] >= 0.99  # Every list probed, rescored exactly
+
+
+async def test_filtered_search_matches_exact_search(
+    tmp_path: Path, corpus: Corpus, exact: FlatVectorStore
+) -> None:
+    chunks, vectors, queries = corpus
+    store = make_ivfpq(tmp_path, nprobe=1)
+    await load(store, chunks, vectors)
+    filters = {"chunk_type": "table"}
+
+    results = await store.search_similar_many(queries, limit=K, filters=filters)
+
+    assert all(r["metadata"]["chunk_type"] == "table" for found in results for r in found)
+    assert (
+        recall(results, await exact.search_similar_many(queries, limit=K, filters=filters)) == 1.0
+    )
+
+
+async def test_trained_index_survives_reopen(tmp_path: Path, corpus: Corpus) -> None:
+    chunks, vectors, queries = corpus
+    store = make_ivfpq(tmp_path, nprobe=4)
+    await load(store, chunks, vectors)
+    before = await store.search_similar_many(queries[:5], limit=K)
+
+    reopened = make_ivfpq(tmp_path, nprobe=4)
+
+    assert reopened.is_trained
+    assert await reopened.search_similar_many(queries[:5], limit=K) == before
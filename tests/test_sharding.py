@@ -0,0 +1,97 @@
+"""ShardLayout CRC32 routing, filter pruning and shard collection opening."""
+
+import zlib
+from typing import Any
+
+import chromadb
+import pytest
+from chromadb.errors import NotFoundError
+
+from rag.infrastructure.vector_stores.sharding import ShardLayout, open_shards
+
+
+def test_routing_is_crc32_of_the_shard_key() -> None:
+    layout = ShardLayout(count=4, key="doc_id")
+
+    for doc_id in ("doc_a", "doc_b", "ASPEN_2023", ""):
+        assert layout.shard_of({"doc_id": doc_id}) == zlib.crc32(doc_id.encode("utf-8")) % 4
+
+
+def test_chunks_of_a_document_share_a_shard() -> None:
+    layout = ShardLayout(count=8, key="doc_id")
+
+    shards = {layout.shard_of({"doc_id": "doc_a", "chunk_id": f"doc_a_{i}"}) for i in range(20)}
+
+    assert len(shards) == 1
+
+
+def test_documents_spread_over_all_shards() -> None:
+    layout = ShardLayout(count=4, key="doc_id")
+
+    shards = {layout.shard_of({"doc_id": f"doc_{i}"}) for i in range(200)}
+
+    assert shards == {0, 1, 2, 3}
+
+
+def test_single_shard_layout_keeps_the_plain_name() -> None:
+    layout = ShardLayout()
+
+    assert layout.collection_names("docs") == ["docs"]
+    assert layout.shard_of({"doc_id": "anything"}) == 0
+    assert layout.metadata(0) == {}
+
+
+def test_shard_names_round_trip_to_the_logical_name() -> None:
+    names = ShardLayout(count=3).collection_names("docs__v2")
+
+    assert names == ["docs__v2__s0", "docs__v2__s1", "docs__v2__s2"]
+    assert {ShardLayout.logical_name(name) for name in names} == {"docs__v2"}
+
+
+@pytest.mark.parametrize(
+    "where, expected_values",
+    [
+        ({"doc_id": "doc_a"}, ["doc_a"]),
+        ({"doc_id": {"$eq": "doc_a"}}, ["doc_a"]),
+        ({"doc_id": {"$in": ["doc_a", "doc_b"]}}, ["doc_a", "doc_b"]),
+        ({"$and": [{"doc_id": {"$in": ["doc_a", "doc_b"]}}, {"doc_id": "doc_b"}]}, ["doc_b"]),
+        ({"$or": [{"doc_id": "doc_a"}, {"doc_id": "doc_c"}]}, ["doc_a", "doc_c"]),
+    ],
+)
+def test_filters_on_the_shard_key_prune_shards(
+    where: dict[str, Any], expected_values: list[str]
+) -> None:
+    layout = ShardLayout(count=16, key="doc_id")
+
+    assert layout.shards_for(where) == sorted(
+        {layout.shard_of({"doc_id": v}) for v in expected_values}
+    )
+
+
+@pytest.mark.parametrize(
+    "where",
+    [
+        None,
+        {"chunk_type": "table"},
+        {"$or": [{"doc_id": "doc_a"}, {"chunk_type": "table"}]},
+    ],
+)
+def test_other_filters_search_every_shard(where: dict[str, Any] | None) -> None:
+    assert ShardLayout(count=4).shards_for(where) == [0, 1, 2, 3]
+
+
+def test_open_shards_keeps_the_layout_a_version_was_built_with() -> None:
+    client = chromadb.EphemeralClient()
+    layout, collections = open_shards(client, "shardtest", ShardLayout(count=3, key="doc_id"))
+    assert layout.count == 3
+    assert [c.name for c in collections] == ["shardtest__s0", "shardtest__s1", "shardtest__s2"]
+
+    reopened, collections = open_shards(client, "shardtest", ShardLayout(count=5), create=False)
+
+    assert (reopened.count, reopened.key) == (3, "doc_id")
+    assert len(collections) == 3
+
+
+def test_open_shards_without_create_raises_for_a_missing_version() -> None:
+    with pytest.raises((NotFoundError, ValueError)):
+        open_shards(chromadb.EphemeralClient(), "missing_version", ShardLayout(), create=False)
@@ -0,0 +1,103 @@
+"""SingleFlight and the coalescing LLM provider built on it."""
+
+import asyncio
+from typing import Any
+
+import pytest
+
+from rag.core.interfaces.embeddings import LLMProvider
+from rag.infrastructure.llm_providers.coalescing_provider import CoalescingLLMProvider
+from rag.infrastructure.singleflight import SingleFlight
+
+
+async def test_concurrent_calls_share_one_run() -> None:
+    flight = SingleFlight()
+    calls = 0
+
+    async def work() -> str:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return "result"
+
+    results = await asyncio.gather(*(flight.do("key", work) for _ in range(5)))
+
+    assert results == ["result"] * 5
+    assert calls == 1
+    assert flight.coalesced == 4
+    assert flight.in_flight == 0
+
+
+async def test_results_are_not_kept_after_completion() -> None:
+    flight = SingleFlight()
+    calls = 0
+
+    async def work() -> int:
+        nonlocal calls
+        calls += 1
+        return calls
+
+    assert await flight.do("key", work) == 1
+    assert await flight.do("key", work) == 2
+
+
+async def test_errors_reach_every_waiter() -> None:
+    flight = SingleFlight()
+
+    async def fail() -> None:
+        await asyncio.sleep(0.01)
+        raise ValueError("upstream down")
+
+    results = await asyncio.gather(
+        *(flight.do("key", fail) for _ in range(3)), return_exceptions=True
+    )
+
+    assert all(isinstance(result, ValueError) for result in results)
+
+
+async def test_cancelled_caller_does_not_cancel_the_others() -> None:
+    flight = SingleFlight()
+    release = asyncio.Event()
+
+    async def work() -> str:
+        await release.wait()
+        return "done"
+
+    first = asyncio.ensure_future(flight.do("key", work))
+    second = asyncio.ensure_future(flight.do("key", work))
+    await asyncio.sleep(0)
+    first.cancel()
+    release.set()
+
+    assert await second == "done"
+    with pytest.raises(asyncio.CancelledError):
+        await first
+
+
+class EchoProvider(LLMProvider):
+    default_model = "model"
+
+    def __init__(self) -> None:
+        self.calls = 0
+
+    async def generate(self, prompt: str, *args: Any, **kwargs: Any) -> str:
+        self.calls += 1
+        await asyncio.sleep(0.01)
+        return prompt
+
+    @property
+    def available_models(self) -> list[str]:
+        return [self.default_model]
+
+
+async def test_coalescing_provider_accepts_unhashable_kwargs() -> None:
+    provider = EchoProvider()
+    coalescing = CoalescingLLMProvider(provider)
+
+    results = await asyncio.gather(
+        *(coalescing.generate("prompt", format={"type": "object"}, stop=["\n"]) for _ in range(3))
+    )
+    await coalescing.generate("prompt", format={"type": "array"})
+
+    assert results == ["prompt"] * 3
+    assert provider.calls == 2
@@ -0,0 +1,136 @@
+"""Index snapshots: export, then bulk-import into a new collection version without re-embedding."""
+
+import json
+import uuid
+from collections.abc import AsyncIterator
+from pathlib import Path
+from typing import Any
+
+import chromadb
+import numpy as np
+import pytest
+from chromadb.api import ClientAPI
+
+from rag.core.models.documents import DocumentChunk
+from rag.infrastructure.vector_stores.chroma_store import ChromaVectorStore
+from rag.infrastructure.vector_stores.collection_alias import CollectionAlias
+from rag.infrastructure.vector_stores.snapshot import (
+    MANIFEST_FILE,
+    export_snapshot,
+    import_snapshot,
+    read_manifest,
+)
+
+MODEL = "test-embed"
+DIMENSION = 8
+
+Source = tuple[ChromaVectorStore, list[DocumentChunk], np.ndarray]
+
+
+def make_store(client: ClientAPI, tmp_path: Path, shards: int = 1) -> ChromaVectorStore:
+    name = f"snap_{uuid.uuid4().hex[:8]}"
+    return ChromaVectorStore(
+        name,
+        client=client,
+        alias=CollectionAlias(name, tmp_path / f"{name}.alias.json"),
+        shards=shards,
+    )
+
+
+@pytest.fixture
+async def source(tmp_path: Path) -> AsyncIterator[Source]:
+    store = make_store(chromadb.EphemeralClient(), tmp_path, shards=2)
+    chunks = [
+        DocumentChunk(
+            chunk_id=f"doc{i % 3}_{i}",
+            doc_id=f"doc{i % 3}",
+            content=f"chunk {i}",
+            page_num=i,
+            section="Dosing",
+        )
+        for i in range(25)
+    ]
+    vectors = np.random.default_rng(0).normal(size=(len(chunks), DIMENSION)).astype(np.float32)
+    await store.add_chunks(chunks, vectors, doc_name="guidelines")
+    yield store, chunks, vectors
+    store.close()
+
+
+def all_records(store: ChromaVectorStore) -> dict[str, tuple[str, dict[str, Any], np.ndarray]]:
+    records = {}
+    for collection in store.collections:
+        page = collection.get(include=["documents", "metadatas", "embeddings"])
+        for chunk_id, document, metadata, embedding in zip(
+            page["ids"], page["documents"], page["metadatas"], page["embeddings"], strict=True
+        ):
+            records[chunk_id] = (document, metadata, np.asarray(embedding, dtype=np.float32))
+    return records
+
+
+async def test_export_then_import_round_trips_every_chunk(tmp_path: Path, source: Source) -> None:
+    store, chunks, vectors = source
+    manifest = export_snapshot(store, tmp_path / "snapshot", MODEL, page_size=7)
+    assert (manifest["count"], manifest["dimension"], manifest["embedding_model"]) == (
+        25,
+        DIMENSION,
+        MODEL,
+    )
+
+    target = make_store(chromadb.EphemeralClient(), tmp_path)
+    result = await import_snapshot(target, tmp_path / "snapshot", MODEL, DIMENSION, batch_size=10)
+
+    assert (result["chunks"], result["documents"]) == (25, 3)
+    assert target.collection_name == f"{target.alias.alias}__v1"
+    exported, imported = all_records(store), all_records(target)
+    assert exported.keys() == imported.keys() == {chunk.chunk_id for chunk in chunks}
+    for chunk_id, (document, metadata, embedding) in exported.items():
+        assert imported[chunk_id][0] == document
+        assert imported[chunk_id][1] == metadata
+        np.testing.assert_array_equal(imported[chunk_id][2], embedding)
+    target.close()
+
+
+async def test_import_rejects_a_different_embedding_model(tmp_path: Path, source: Source) -> None:
+    store, _, _ = source
+    export_snapshot(store, tmp_path / "snapshot", MODEL)
+    target = make_store(chromadb.EphemeralClient(), tmp_path)
+
+    with pytest.raises(ValueError, match="embedded with"):
+        await import_snapshot(target, tmp_path / "snapshot", "other-model", DIMENSION)
+    with pytest.raises(ValueError, match="dimension"):
+        await import_snapshot(target, tmp_path / "snapshot", MODEL, DIMENSION * 2)
+    assert target.collection_name == target.alias.alias
+    target.close()
+
+
+async def test_truncated_snapshot_is_discarded_and_live_version_kept(
+    tmp_path: Path, source: Source
+) -> None:
+    store, _, _ = source
+    manifest = export_snapshot(store, tmp_path / "snapshot", MODEL)
+    records_file = tmp_path / "snapshot" / manifest["records_file"]
+    if manifest["records_format"] != "jsonl":
+        pytest.skip("truncation check edits the JSON-lines records file")
+    records_file.write_text("".join(records_file.read_text().splitlines(keepends=True)[:10]))
+
+    client = chromadb.EphemeralClient()
+    target = make_store(client, tmp_path)
+    with pytest.raises(ValueError, match="manifest says"):
+        await import_snapshot(target, tmp_path / "snapshot", MODEL, DIMENSION)
+
+    assert target.collection_name == target.alias.alias
+    assert not [
+        c for c in client.list_collections() if c.name.startswith(f"{target.alias.alias}__v")
+    ]
+    target.close()
+
+
+def test_directory_without_manifest_is_incomplete(tmp_path: Path) -> None:
+    (tmp_path / "snapshot").mkdir()
+
+    with pytest.raises(ValueError, match="incomplete"):
+        read_manifest(tmp_path / "snapshot")
+
+    (tmp_path / "snapshot" / MANIFEST_FILE).write_text(json.dumps({"format_version": 99}))
+    with pytest.raises(ValueError, match="format version"):
+        read_manifest(tmp_path / "snapshot")